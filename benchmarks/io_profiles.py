@@ -0,0 +1,71 @@
+"""Report the read throughput of a LIF file under several I/O profiles.
+
+Every tile of one image is read with each profile, after evicting the file
+from the page cache (``POSIX_FADV_DONTNEED``), so the numbers reflect the
+filesystem rather than memory. Run it on the mount you convert from::
+
+    python benchmarks/io_profiles.py /mnt/nfs/plate.lif --image 0
+"""
+
+import argparse
+import os
+import time
+
+import liffile
+
+from fractal_lif_converters.common._loaders import LifIOProfile, _load_lif_array
+
+PROFILES = {
+    "default": LifIOProfile(),
+    "sequential": LifIOProfile(fadvise="sequential"),
+    "willneed-64MiB": LifIOProfile(fadvise="willneed", readahead=64 * 1024**2),
+    "blocks-1MiB": LifIOProfile(block_size=1024**2),
+    "blocks-8MiB": LifIOProfile(block_size=8 * 1024**2),
+    "blocks-8MiB-willneed": LifIOProfile(
+        block_size=8 * 1024**2, fadvise="willneed", readahead=64 * 1024**2
+    ),
+}
+
+
+def _evict(path: str) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def benchmark(path: str, image_id: int, profile: LifIOProfile) -> float:
+    """Read every tile of one image and return the throughput in MB/s."""
+    with liffile.LifFile(path, squeeze=False) as lf:
+        sizes = lf.images[image_id].sizes
+    _evict(path)
+    nbytes = 0
+    start = time.perf_counter()
+    for m in range(sizes.get("M", 1)):
+        nbytes += _load_lif_array(path, image_id, m, io_profile=profile).nbytes
+    return nbytes / 1e6 / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Command-line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="Local (or network-mounted) LIF file.")
+    parser.add_argument("--image", type=int, default=0, help="Image index.")
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILES), action="append", default=None
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name in args.profile or list(PROFILES):
+        rates = [
+            benchmark(args.path, args.image, PROFILES[name]) for _ in range(args.repeat)
+        ]
+        print(f"{name:>22}: {max(rates):8.1f} MB/s (best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare the tile-table serialization of a ``TiledImage`` with the default one.
+
+Builds the ``TiledImage`` of every image of a LIF plate (as the plate init
+task does) and reports, per format, the JSON size handed to the compute task
+and the time to validate and deserialize it there::
+
+    python benchmarks/tile_table.py /data/plate.lif
+"""
+
+import argparse
+import time
+
+from ome_zarr_converters_tools import ConverterOptions, ImageInPlate
+from ome_zarr_converters_tools.fractal import tiled_image_from_json_str
+
+from fractal_lif_converters import LifPlateAcquisitionModel
+from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._tile_table import (
+    decode_tiled_image,
+    encode_tiled_image,
+)
+from fractal_lif_converters.lif_plate._parser import parse_lif_plate_metadata
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Command-line entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="LIF plate file.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tiled_images = parse_lif_plate_metadata(
+        acquisition_model=LifPlateAcquisitionModel(path=args.path),
+        converter_options=ConverterOptions(),
+    )
+    print(f"{'image':<32} {'tiles':>6} {'format':<8} {'bytes':>12} {'load ms':>9}")
+    for tiled_image in tiled_images:
+        default = tiled_image.model_dump_json()
+        table = encode_tiled_image(tiled_image)
+        timings = {
+            "default": _best_of(
+                args.repeat,
+                lambda s=default: tiled_image_from_json_str(
+                    s, ImageInPlate, LifMosaicLoader
+                ),
+            ),
+            "table": _best_of(
+                args.repeat, lambda s=table: decode_tiled_image(s, ImageInPlate)
+            ),
+        }
+        for name, json_str in (("default", default), ("table", table)):
+            print(
+                f"{tiled_image.path:<32} {len(tiled_image.regions):>6} {name:<8} "
+                f"{len(json_str.encode()):>12} {timings[name] * 1e3:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,61 @@
 """Converter from the Lif files (Leica Microscope) to OME-Zarr format."""
 
+import importlib
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any
 
 try:
     __version__ = version("fractal_lif_converters")
 except PackageNotFoundError:
     __version__ = "uninstalled"
 
-from fractal_lif_converters.lif_image import LifImageAcquisitionModel, convert_lif_image
-from fractal_lif_converters.lif_plate import LifPlateAcquisitionModel, convert_lif_plate
+if TYPE_CHECKING:
+    from fractal_lif_converters.common._runner import LifLocalRunner
+    from fractal_lif_converters.lif_image import (
+        LifImageAcquisitionModel,
+        convert_lif_image,
+        plan_lif_image,
+    )
+    from fractal_lif_converters.lif_plate import (
+        LifPlateAcquisitionModel,
+        convert_lif_plate,
+        plan_lif_plate,
+    )
+
+# The public API is imported on first access, so that compute tasks (which
+# import ``fractal_lif_converters.common...``) do not pay for the init tasks,
+# parsers and runners.
+_LAZY_IMPORTS = {
+    "LifImageAcquisitionModel": "fractal_lif_converters.lif_image",
+    "LifLocalRunner": "fractal_lif_converters.common._runner",
+    "LifPlateAcquisitionModel": "fractal_lif_converters.lif_plate",
+    "convert_lif_image": "fractal_lif_converters.lif_image",
+    "convert_lif_plate": "fractal_lif_converters.lif_plate",
+    "plan_lif_image": "fractal_lif_converters.lif_image",
+    "plan_lif_plate": "fractal_lif_converters.lif_plate",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
+
 
 __all__ = [
     "LifImageAcquisitionModel",
+    "LifLocalRunner",
     "LifPlateAcquisitionModel",
     "__version__",
     "convert_lif_image",
     "convert_lif_plate",
+    "plan_lif_image",
+    "plan_lif_plate",
 ]
@@ -0,0 +1,276 @@
+"""Build and query a Parquet catalog of LIF archives.
+
+Each image of each LIF file becomes one catalog row (path, scan, well,
+position, dims, dtype, pixel sizes, tile count, byte size, image type), found
+with the same discovery logic as the plate and image parsers. Files are
+cataloged in parallel and written as a Parquet dataset, which can be queried
+with SQL without opening the LIF files again::
+
+    lif-catalog /archive --output /archive/catalog --workers 16
+
+The init tasks accept a ``LifCatalogSelection`` to convert the acquisitions
+matching a query, e.g. ``tile_count > 100 AND size_c = 3 AND size_z > 50``.
+"""
+
+import argparse
+import logging
+import multiprocessing
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Literal
+
+import fsspec
+import liffile
+import polars as pl
+
+from fractal_lif_converters.common._options import LifCatalogSelection
+from fractal_lif_converters.common._remote import is_remote_path, open_lif_source
+from fractal_lif_converters.common._tile_builders import ImageType
+from fractal_lif_converters.lif_image._parser import (
+    _base_scan_names,
+    _simple_parse_lif_infos,
+)
+from fractal_lif_converters.lif_plate._parser import (
+    _parse_lif_plate_infos,
+    _pixel_size_um,
+)
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SCHEMA = {
+    "path": pl.String,
+    "image_id": pl.Int64,
+    "name": pl.String,
+    "plate_scan": pl.String,
+    "row": pl.String,
+    "column": pl.String,
+    "well": pl.String,
+    "image_scan": pl.String,
+    "position": pl.String,
+    "image_type": pl.String,
+    "dims": pl.String,
+    "size_m": pl.Int64,
+    "size_t": pl.Int64,
+    "size_c": pl.Int64,
+    "size_z": pl.Int64,
+    "size_y": pl.Int64,
+    "size_x": pl.Int64,
+    "dtype": pl.String,
+    "pixel_size_x": pl.Float64,
+    "pixel_size_y": pl.Float64,
+    "pixel_size_z": pl.Float64,
+    "tile_count": pl.Int64,
+    "nbytes": pl.Int64,
+    "file_size": pl.Int64,
+}
+"""Columns of the catalog. ``plate_scan`` / ``image_scan`` are the scan names
+to pass as ``tile_scan_name`` in plate / image mode (``None`` when the image
+is not discovered in that mode); pixel sizes are in micrometres."""
+
+_PART_GLOB = "part-*.parquet"
+
+
+def _catalog_records(path: str) -> list[dict[str, Any]]:
+    """Extract one record per image discovered in the LIF file at ``path``."""
+    fs, fs_path = fsspec.core.url_to_fs(path)
+    file_size = int(fs.info(fs_path)["size"])
+    with liffile.LifFile(open_lif_source(path), squeeze=False) as lif_file:
+        plate_infos = {}
+        try:
+            plates = _parse_lif_plate_infos(lif_file, None, 0)
+        except ValueError:
+            plates = {}
+        for infos in plates.values():
+            plate_infos.update({info.image_id: info for info in infos})
+
+        image_infos = {}
+        base_scan_names, _ = _base_scan_names(lif_file)
+        for base in sorted(base_scan_names):
+            scans, _ = _simple_parse_lif_infos(lif_file, base)
+            for infos in scans.values():
+                image_infos.update({info.image_id: (base, info) for info in infos})
+
+        records = []
+        for image_id, lif_image in enumerate(lif_file.images):
+            plate = plate_infos.get(image_id)
+            image_scan, image = image_infos.get(image_id, (None, None))
+            if plate is None and image is None:
+                continue
+            sizes = dict(lif_image.sizes)
+            position = plate.position_name if plate is not None else None
+            if position is None and image is not None:
+                position = image.position_name
+            records.append(
+                {
+                    "path": path,
+                    "image_id": image_id,
+                    "name": lif_image.path,
+                    "plate_scan": plate.scan_name if plate else None,
+                    "row": plate.row if plate else None,
+                    "column": plate.column if plate else None,
+                    "well": f"{plate.row}{plate.column}" if plate else None,
+                    "image_scan": image_scan,
+                    "position": position,
+                    "image_type": ImageType.from_lif_image(lif_image).value,
+                    "dims": "".join(lif_image.dims),
+                    **{f"size_{d.lower()}": sizes.get(d, 1) for d in "MTCZYX"},
+                    "dtype": str(lif_image.dtype),
+                    "pixel_size_x": _pixel_size_um(lif_image, "X"),
+                    "pixel_size_y": _pixel_size_um(lif_image, "Y"),
+                    "pixel_size_z": _pixel_size_um(lif_image, "Z"),
+                    "tile_count": sizes.get("M", 1),
+                    "nbytes": int(lif_image.nbytes),
+                    "file_size": file_size,
+                }
+            )
+    return records
+
+
+def _safe_catalog_records(path: str) -> tuple[str, list[dict[str, Any]], str | None]:
+    """``_catalog_records`` that reports errors instead of raising.
+
+    Module-level so it can be pickled into a worker process.
+    """
+    try:
+        return path, _catalog_records(path), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
+
+def _expand_sources(sources: Iterable[str]) -> list[str]:
+    """LIF files of ``sources``: files, URLs, or folders searched recursively."""
+    paths: list[str] = []
+    for source in sources:
+        if not is_remote_path(source) and Path(source).is_dir():
+            paths.extend(str(p) for p in sorted(Path(source).rglob("*.lif")))
+        else:
+            paths.append(source)
+    return paths
+
+
+def _write_parts(
+    results: Iterator[tuple[str, list[dict[str, Any]], str | None]],
+    catalog_dir: Path,
+    files_per_part: int,
+) -> None:
+    """Write the records of ``results`` as Parquet parts of ``files_per_part``."""
+    records: list[dict[str, Any]] = []
+    num_files = num_parts = 0
+    for path, file_records, error in results:
+        if error is not None:
+            logger.warning(f"Skipping {path}: {error}")
+        records.extend(file_records)
+        num_files += 1
+        if num_files % files_per_part == 0:
+            _write_part(records, catalog_dir, num_parts)
+            records, num_parts = [], num_parts + 1
+    # An empty last part is still written if it is the only one, so that an
+    # empty catalog stays queryable.
+    if records or num_parts == 0:
+        _write_part(records, catalog_dir, num_parts)
+        num_parts += 1
+    logger.info(f"Cataloged {num_files} LIF files into {num_parts} part(s).")
+
+
+def _write_part(records: list[dict[str, Any]], catalog_dir: Path, index: int) -> None:
+    part = catalog_dir / f"part-{index:05d}.parquet"
+    pl.DataFrame(records, schema=CATALOG_SCHEMA).write_parquet(part)
+
+
+def build_lif_catalog(
+    sources: Iterable[str],
+    catalog_dir: str | Path,
+    *,
+    max_workers: int | None = None,
+    files_per_part: int = 256,
+) -> Path:
+    """Catalog the images of LIF files into a Parquet dataset.
+
+    Existing ``part-*.parquet`` files in ``catalog_dir`` are replaced. Files
+    that cannot be read are logged and left out.
+
+    Args:
+        sources: LIF files, fsspec URLs, or folders searched for ``*.lif``.
+        catalog_dir: Output directory of the dataset.
+        max_workers: Size of the process pool; ``1`` catalogs in-process and
+            ``None`` uses one process per CPU.
+        files_per_part: Source files per Parquet part, bounding the records
+            held in memory.
+
+    Returns:
+        The catalog directory.
+    """
+    paths = _expand_sources(sources)
+    catalog_dir = Path(catalog_dir)
+    catalog_dir.mkdir(parents=True, exist_ok=True)
+    for old in catalog_dir.glob(_PART_GLOB):
+        old.unlink()
+
+    if max_workers == 1:
+        _write_parts(map(_safe_catalog_records, paths), catalog_dir, files_per_part)
+    else:
+        # Spawned, not forked, like the other local pools of this package.
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = executor.map(_safe_catalog_records, paths, chunksize=4)
+            _write_parts(results, catalog_dir, files_per_part)
+    return catalog_dir
+
+
+def read_lif_catalog(catalog_dir: str | Path) -> pl.LazyFrame:
+    """Lazily scan a catalog written by ``build_lif_catalog``."""
+    parts = sorted(Path(catalog_dir).glob(_PART_GLOB))
+    if not parts:
+        raise FileNotFoundError(f"No LIF catalog found in {catalog_dir}.")
+    return pl.scan_parquet(parts)
+
+
+def query_lif_catalog(catalog_dir: str | Path, where: str | None) -> pl.DataFrame:
+    """Return the catalog rows matching the SQL ``WHERE`` condition ``where``."""
+    query = "SELECT * FROM catalog"
+    if where:
+        query += f" WHERE {where}"
+    with pl.SQLContext(catalog=read_lif_catalog(catalog_dir)) as context:
+        return context.execute(query, eager=True)
+
+
+def select_catalog_scans(
+    selection: LifCatalogSelection, mode: Literal["plate", "image"]
+) -> list[tuple[str, str]]:
+    """The ``(path, scan)`` pairs with an image matching ``selection``.
+
+    Args:
+        selection: Catalog and query to select from.
+        mode: Conversion mode; only images discovered in that mode count.
+
+    Returns:
+        Sorted, unique ``(path, tile_scan_name)`` pairs.
+    """
+    matches = query_lif_catalog(selection.catalog_dir, selection.where)
+    scans = (
+        matches.select("path", pl.col(f"{mode}_scan").alias("scan"))
+        .drop_nulls()
+        .unique()
+        .sort("path", "scan")
+    )
+    return list(scans.iter_rows())
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point of the catalog builder."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "sources", nargs="+", help="LIF files, URLs, or folders to search."
+    )
+    parser.add_argument("--output", required=True, help="Catalog directory.")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    build_lif_catalog(args.sources, args.output, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
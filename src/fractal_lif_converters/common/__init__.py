@@ -1,17 +1,68 @@
 """Common utilities for fractal LIF converters."""
 
-from fractal_lif_converters.common.acquisitions import (
-    STANDARD_ROWS_NAMES,
-    BaseAcquisitionModel,
-    get_attributes_from_condition_table,
-    parse_acquisitions,
-)
-from fractal_lif_converters.common.image_in_plate_compute_task import (
-    image_in_plate_compute_task,
-)
-from fractal_lif_converters.common.single_image_compute_task import (
-    single_image_compute_task,
-)
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fractal_lif_converters.common.acquisitions import (
+        STANDARD_ROWS_NAMES,
+        BaseAcquisitionModel,
+        get_attributes_from_condition_table,
+        parse_acquisitions,
+    )
+    from fractal_lif_converters.common.image_in_plate_compute_task import (
+        image_in_plate_compute_task,
+    )
+    from fractal_lif_converters.common.single_image_compute_task import (
+        single_image_compute_task,
+    )
+
+# Import on access: acquisition parsing is only needed by the init tasks, and
+# a compute task executable should not import the other compute task.
+_LAZY_IMPORTS = {
+    "STANDARD_ROWS_NAMES": "fractal_lif_converters.common.acquisitions",
+    "BaseAcquisitionModel": "fractal_lif_converters.common.acquisitions",
+    "get_attributes_from_condition_table": (
+        "fractal_lif_converters.common.acquisitions"
+    ),
+    "parse_acquisitions": "fractal_lif_converters.common.acquisitions",
+    "image_in_plate_compute_task": (
+        "fractal_lif_converters.common.image_in_plate_compute_task"
+    ),
+    "single_image_compute_task": (
+        "fractal_lif_converters.common.single_image_compute_task"
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing a compute-task module binds it on this package under the
+        # name of its task function; keep the function, as the eager import did.
+        if isinstance(value, types.ModuleType) and _LAZY_IMPORTS.get(name) == (
+            value.__name__
+        ):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
 
 __all__ = [
     "STANDARD_ROWS_NAMES",
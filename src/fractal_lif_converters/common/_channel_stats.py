@@ -0,0 +1,117 @@
+"""Streaming per-channel statistics accumulated while tiles are loaded."""
+
+import threading
+
+import numpy as np
+from pydantic import BaseModel
+
+# Integer dtypes small enough for an exact one-bin-per-value histogram.
+_HISTOGRAM_DTYPES = ("uint8", "int8", "uint16", "int16")
+
+
+class ChannelStatistics(BaseModel):
+    """Intensity statistics of one output channel."""
+
+    min: float
+    max: float
+    start: float
+    """Lower display-window bound (low percentile)."""
+    end: float
+    """Upper display-window bound (high percentile)."""
+
+
+def format_channel_stats(stats: list[ChannelStatistics] | None) -> str:
+    """One-line summary of per-channel statistics, for task logs."""
+    if not stats:
+        return "no channel statistics (image resumed or empty)"
+    return "; ".join(
+        f"c{c}: min={s.min:g} max={s.max:g} window=[{s.start:g}, {s.end:g}]"
+        for c, s in enumerate(stats)
+    )
+
+
+class ChannelStatsAccumulator:
+    """Accumulate per-channel min/max and histograms from loaded tiles.
+
+    Tiles are fed as canonical ``(T?, C, Z, Y, X)`` arrays right after they
+    are loaded, so display ranges are known once writing finishes without
+    reading the OME-Zarr back. 8/16-bit integer data use an exact histogram;
+    other dtypes only track min/max, which then also bound the window.
+
+    ``update`` is thread-safe (Dask writers load tiles concurrently).
+    """
+
+    def __init__(
+        self,
+        num_channels: int,
+        dtype: str,
+        percentiles: tuple[float, float] = (0.1, 99.9),
+    ) -> None:
+        self.num_channels = num_channels
+        self.dtype = np.dtype(dtype)
+        self.percentiles = percentiles
+        self._lock = threading.Lock()
+        self._min = np.full(num_channels, np.inf)
+        self._max = np.full(num_channels, -np.inf)
+        self._offset = 0
+        self._hist: np.ndarray | None = None
+        if self.dtype.name in _HISTOGRAM_DTYPES:
+            info = np.iinfo(self.dtype)
+            self._offset = -int(info.min)
+            self._hist = np.zeros((num_channels, int(info.max) + self._offset + 1))
+
+    def update(self, data: np.ndarray) -> None:
+        """Add one loaded tile in canonical ``(T?, C, Z, Y, X)`` order."""
+        channel_axis = data.ndim - 4
+        if data.shape[channel_axis] != self.num_channels:
+            raise ValueError(
+                f"Expected {self.num_channels} channel(s), got "
+                f"{data.shape[channel_axis]}."
+            )
+        mins = np.empty(self.num_channels)
+        maxs = np.empty(self.num_channels)
+        counts = []
+        for c in range(self.num_channels):
+            # A view: tiles may be slices of a larger canvas.
+            channel = data[(slice(None),) * channel_axis + (c,)]
+            mins[c] = channel.min()
+            maxs[c] = channel.max()
+            if self._hist is not None:
+                count = np.zeros(self._hist.shape[1], dtype=np.int64)
+                # Plane by plane, so non-contiguous views are only copied
+                # one Y/X plane at a time.
+                for plane in channel.reshape(-1, *channel.shape[-2:]):
+                    values = plane.ravel()
+                    if self._offset:
+                        values = values.astype(np.int32) + self._offset
+                    count += np.bincount(values, minlength=count.size)
+                counts.append(count)
+        with self._lock:
+            np.minimum(self._min, mins, out=self._min)
+            np.maximum(self._max, maxs, out=self._max)
+            if self._hist is not None:
+                for c, count in enumerate(counts):
+                    self._hist[c] += count
+
+    def _percentile(self, c: int, q: float) -> float:
+        assert self._hist is not None
+        cumulative = np.cumsum(self._hist[c])
+        idx = int(np.searchsorted(cumulative, q / 100 * cumulative[-1]))
+        return float(idx - self._offset)
+
+    def finalize(self) -> list[ChannelStatistics] | None:
+        """Return per-channel statistics, or ``None`` if nothing was loaded."""
+        if not np.isfinite(self._min).all():
+            return None
+        low, high = self.percentiles
+        stats = []
+        for c in range(self.num_channels):
+            ch_min, ch_max = float(self._min[c]), float(self._max[c])
+            if self._hist is not None:
+                start, end = self._percentile(c, low), self._percentile(c, high)
+            else:
+                start, end = ch_min, ch_max
+            stats.append(
+                ChannelStatistics(min=ch_min, max=ch_max, start=start, end=end)
+            )
+        return stats
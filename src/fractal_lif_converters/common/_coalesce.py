@@ -0,0 +1,287 @@
+"""Coalesced reads of LIF tiles stored next to each other in the file.
+
+Multi-position acquisitions store every position as its own ``LifImage``,
+and mosaics store all positions in one memory block; either way the tiles of
+an image usually follow each other in the file. Loading them one by one costs
+one open and at least one read per tile, which dominates on high-latency
+storage. With ``LifIOProfile.coalesce_gap`` set, ``CoalescedReads`` plans the
+reads of all tiles of an image up front: the byte spans of the selected
+planes are sorted by offset and neighbours at most ``coalesce_gap`` bytes
+apart are merged into runs of at most ``coalesce_max_bytes``. The first tile
+loaded from a run reads the whole run with one request; the other tiles are
+sliced from it, and the run is released once all its tiles are loaded.
+"""
+
+import logging
+import math
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future
+from typing import Any, NamedTuple
+
+import numpy as np
+from ome_zarr_converters_tools.core import TileSlice
+
+from fractal_lif_converters.common._loaders import (
+    LifMosaicLoader,
+    _as_5d,
+    _fill_planes,
+    _open_lif_file,
+    _pread_into,
+)
+from fractal_lif_converters.common._remote import open_lif_source
+
+logger = logging.getLogger(__name__)
+
+
+class _TileLayout(NamedTuple):
+    """Where the planes of one tile are stored in the file."""
+
+    offset: int
+    """File offset of plane ``(T, C, Z) = (0, 0, 0)`` of the tile."""
+    strides: dict[str, int]
+    """Byte strides of the ``T``, ``C`` and ``Z`` axes present in the image."""
+    sizes: dict[str, int]
+    dtype: np.dtype
+    span: tuple[int, int]
+    """Half-open file byte range holding every selected plane."""
+
+
+def _tile_layout(lif_image: Any, loader: LifMosaicLoader) -> _TileLayout | None:
+    """Locate the selected planes of ``loader``, or ``None`` if not plain.
+
+    Only Y/X-framed images stored contiguously in the LIF file are planned;
+    so are tiles whose selected planes are not scattered over more than twice
+    their size, the same limit as ``LifIOProfile`` block reads.
+    """
+    block = lif_image.memory_block
+    dims = list(lif_image.dims)
+    dtype = np.dtype(lif_image.dtype)
+    if (
+        tuple(lif_image.frames.frame_dims) != ("Y", "X")
+        or block.frames
+        or block.offset <= 0
+        or block.size != math.prod(lif_image.shape) * dtype.itemsize
+    ):
+        return None
+    strides: dict[str, int] = {}
+    stride = dtype.itemsize
+    for dim, size in zip(reversed(dims), reversed(lif_image.shape), strict=True):
+        strides[dim] = stride
+        stride *= size
+    sizes = dict(lif_image.sizes)
+    offset = block.offset + loader.m * strides.get("M", 0)
+    plane_bytes = sizes["Y"] * sizes["X"] * dtype.itemsize
+
+    first = last = offset
+    axes = dict(zip(("T", "C", "Z"), loader.selection.indices(sizes), strict=True))
+    selected = math.prod(len(indices) for indices in axes.values())
+    for dim, indices in axes.items():
+        if dim in strides:
+            first += min(indices) * strides[dim]
+            last += max(indices) * strides[dim]
+    span = (first, last + plane_bytes)
+    if span[1] - span[0] > 2 * selected * plane_bytes:
+        return None
+    return _TileLayout(
+        offset=offset,
+        strides={d: s for d, s in strides.items() if d in axes},
+        sizes=sizes,
+        dtype=dtype,
+        span=span,
+    )
+
+
+def plan_coalesced_reads(
+    spans: Sequence[tuple[int, int]], *, max_gap: int, max_bytes: int
+) -> list[tuple[int, int, list[int]]]:
+    """Merge byte spans into runs of sequential reads.
+
+    Args:
+        spans: Half-open ``(start, stop)`` byte ranges to read.
+        max_gap: Largest number of unrequested bytes read between two spans
+            of the same run.
+        max_bytes: Largest run; a span longer than this is a run of its own.
+
+    Returns:
+        ``(start, stop, members)`` of every run, by increasing offset, with
+        the indices of the spans it covers.
+    """
+    runs: list[tuple[int, int, list[int]]] = []
+    for index in sorted(range(len(spans)), key=lambda i: spans[i]):
+        start, stop = spans[index]
+        if runs:
+            run_start, run_stop, members = runs[-1]
+            merged_stop = max(run_stop, stop)
+            if start - run_stop <= max_gap and merged_stop - run_start <= max_bytes:
+                runs[-1] = (run_start, merged_stop, [*members, index])
+                continue
+        runs.append((start, stop, [index]))
+    return runs
+
+
+class _Run:
+    """One coalesced read; ``pending`` counts its tiles not loaded yet.
+
+    ``bytes`` resolves to the read bytes once the first thread needing them
+    has read them.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        span: tuple[int, int],
+        pending: int,
+        block_size: int | None,
+    ) -> None:
+        self.file_path = file_path
+        self.start, self.stop = span
+        self.pending = pending
+        self.block_size = block_size
+        self.bytes: Future[np.ndarray] | None = None
+
+
+def _read_run(run: _Run) -> np.ndarray:
+    """Read the bytes of ``run`` with one open and one sequential read."""
+    buffer = np.empty(run.stop - run.start, dtype=np.uint8)
+    source = open_lif_source(run.file_path)
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            _pread_into(
+                fh,
+                memoryview(buffer),
+                run.start,
+                run.block_size or len(buffer),
+            )
+        return buffer
+    try:
+        # One range request for all the blocks of the run not cached yet.
+        source.seek(run.start)
+        view = memoryview(buffer)
+        pos = 0
+        while pos < len(buffer):
+            nbytes = source.readinto(view[pos:])
+            if not nbytes:
+                raise EOFError(f"Unexpected end of file at offset {run.start + pos}.")
+            pos += nbytes
+    finally:
+        source.close()
+    return buffer
+
+
+class CoalescedReads:
+    """Read the tiles of a set of ``LifMosaicLoader`` in coalesced runs.
+
+    Loaders are planned with their own ``io_profile``; loaders without
+    ``coalesce_gap`` or whose tile is not plainly stored keep reading on
+    their own. Thread-safe: a run is read once, whichever thread needs it
+    first, while other threads read other runs.
+    """
+
+    def __init__(self, loaders: Sequence[LifMosaicLoader]) -> None:
+        self._lock = threading.Lock()
+        self._tiles: dict[int, tuple[_TileLayout, _Run]] = {}
+        groups: dict[tuple, list[tuple[LifMosaicLoader, _TileLayout]]] = {}
+        by_file: dict[str, list[LifMosaicLoader]] = {}
+        for loader in loaders:
+            profile = loader.io_profile
+            if profile is not None and profile.coalesce_gap is not None:
+                by_file.setdefault(loader.file_path, []).append(loader)
+        for file_path, file_loaders in by_file.items():
+            with _open_lif_file(file_path) as lf:
+                for loader in file_loaders:
+                    layout = _tile_layout(lf.images[loader.image_id], loader)
+                    if layout is None:
+                        continue
+                    profile = loader.io_profile
+                    key = (
+                        file_path,
+                        profile.coalesce_gap,
+                        profile.coalesce_max_bytes,
+                        profile.block_size,
+                    )
+                    groups.setdefault(key, []).append((loader, layout))
+
+        num_runs = 0
+        for (file_path, gap, max_bytes, block_size), tiles in groups.items():
+            planned = plan_coalesced_reads(
+                [layout.span for _, layout in tiles], max_gap=gap, max_bytes=max_bytes
+            )
+            for start, stop, members in planned:
+                run = _Run(file_path, (start, stop), len(members), block_size)
+                for index in members:
+                    loader, layout = tiles[index]
+                    self._tiles[id(loader)] = (layout, run)
+            num_runs += len(planned)
+        if self._tiles:
+            logger.info(f"Reading {len(self._tiles)} tiles in {num_runs} runs.")
+
+    def __contains__(self, loader: LifMosaicLoader) -> bool:
+        return id(loader) in self._tiles
+
+    def _acquire(self, run: _Run) -> np.ndarray:
+        # The lock only guards the bookkeeping; the read happens outside it,
+        # and threads needing the same run wait for its future.
+        with self._lock:
+            future = run.bytes
+            reader = future is None
+            if reader:
+                future = run.bytes = Future()
+        if reader:
+            try:
+                future.set_result(_read_run(run))
+            except BaseException as exc:
+                future.set_exception(exc)
+        buffer = future.result()
+        with self._lock:
+            run.pending -= 1
+            # Keep the bytes until every tile of the run has been loaded.
+            if run.pending == 0:
+                run.bytes = None
+        return buffer
+
+    def load(
+        self, loader: LifMosaicLoader, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Load the selected planes of ``loader``, as ``loader.load_data``."""
+        layout, run = self._tiles[id(loader)]
+        buffer = self._acquire(run)
+        selection = loader.selection
+        shape_5d = selection.shape_5d(layout.sizes)
+        if out is None:
+            out = np.empty(shape_5d, dtype=layout.dtype)
+        window = selection.yx_slices(layout.sizes)
+        frame_shape = (layout.sizes["Y"], layout.sizes["X"])
+        plane_bytes = math.prod(frame_shape) * layout.dtype.itemsize
+        base = layout.offset - run.start
+
+        def _plane(t: int, c: int, z: int) -> np.ndarray:
+            indices = {"T": t, "C": c, "Z": z}
+            offset = base + sum(indices[d] * s for d, s in layout.strides.items())
+            frame = buffer[offset : offset + plane_bytes].view(layout.dtype)
+            return frame.reshape(frame_shape)[window]
+
+        return _fill_planes(_as_5d(out, shape_5d), selection, layout.sizes, _plane)
+
+
+def attach_coalesced_reads(regions: Sequence[TileSlice]) -> CoalescedReads | None:
+    """Route the LIF loaders of ``regions`` through one ``CoalescedReads``.
+
+    Returns:
+        The planner, or ``None`` when no loader asks for coalesced reads.
+    """
+    loaders = [
+        region.image_loader
+        for region in regions
+        if isinstance(region.image_loader, LifMosaicLoader)
+    ]
+    if not any(
+        loader.io_profile is not None and loader.io_profile.coalesce_gap is not None
+        for loader in loaders
+    ):
+        return None
+    reads = CoalescedReads(loaders)
+    for loader in loaders:
+        if loader in reads:
+            loader.read_through(reads)
+    return reads
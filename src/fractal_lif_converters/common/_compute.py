@@ -0,0 +1,865 @@
+"""LIF compute pipeline: load the ``TiledImage`` and write it as OME-Zarr.
+
+Mirrors ``ome_zarr_converters_tools.generic_compute_task`` and
+``write_tiled_image_as_zarr``, with LIF-specific hooks around tile loading:
+streaming channel statistics instead of a second read of the written image
+to set the display windows, pyramid levels built while level 0 is written,
+and per-tile progress markers so interrupted conversions can be resumed.
+The library helpers it reuses come through ``_converters_tools``.
+"""
+
+import logging
+from functools import partial
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+import zarr
+from ngio import (
+    OmeZarrContainer,
+    Roi,
+    create_empty_ome_zarr,
+    open_ome_zarr_container,
+)
+from ngio.tables import RoiTable
+from ome_zarr_converters_tools import (
+    ConverterOptions,
+    ConvertParallelInitArgs,
+    ImageListUpdateDict,
+    OverwriteMode,
+    TiledImage,
+)
+from ome_zarr_converters_tools.core import TileFOVGroup, TileSlice
+from ome_zarr_converters_tools.fractal import remove_json
+from ome_zarr_converters_tools.models import (
+    AutoTiling,
+    InplaceTiling,
+    OmeZarrOptions,
+    SnapToGridTiling,
+    TilingStrategy,
+    WriterMode,
+    join_url_paths,
+)
+from ome_zarr_converters_tools.pipelines import (
+    apply_registration_pipeline,
+    build_default_registration_pipeline,
+)
+
+from fractal_lif_converters.common._channel_stats import (
+    ChannelStatistics,
+    ChannelStatsAccumulator,
+)
+from fractal_lif_converters.common._converters_tools import (
+    attribute_to_condition_table,
+    build_channels_meta,
+    build_image_list_update,
+    compute_chunk_size,
+    region_to_pixel_coordinates,
+    write_to_zarr,
+)
+from fractal_lif_converters.common._init_args import (
+    LifAxisShard,
+    LifConvertInitArgs,
+)
+from fractal_lif_converters.common._loaders import LifMosaicLoader, find_empty_tiles
+from fractal_lif_converters.common._options import (
+    LifAxisSharding,
+    LifPipelineOptions,
+    ProjectionMode,
+    default_pipeline_options,
+)
+from fractal_lif_converters.common._pyramid import Box, streaming_pyramid
+from fractal_lif_converters.common._resume import (
+    ConversionFingerprint,
+    ConversionMarkers,
+    MarkerState,
+    conversion_fingerprint,
+)
+from fractal_lif_converters.common._tile_table import (
+    decode_tiled_image,
+    read_json_dump,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from fractal_lif_converters.common._projections import ZProjections
+
+logger = logging.getLogger(__name__)
+
+
+def _open_group_mode(overwrite_mode: OverwriteMode) -> str:
+    if overwrite_mode == OverwriteMode.NO_OVERWRITE:
+        return "w-"
+    if overwrite_mode == OverwriteMode.OVERWRITE:
+        return "w"
+    return "a"
+
+
+def _new_stats(tiled_image: TiledImage) -> ChannelStatsAccumulator:
+    c_axis = tiled_image.axes.index("c")
+    return ChannelStatsAccumulator(
+        num_channels=tiled_image.shape()[c_axis], dtype=tiled_image.data_type
+    )
+
+
+def _attach_loaders(
+    regions: list[TileSlice],
+    stats: ChannelStatsAccumulator,
+    done: set[int] | None = None,
+) -> ChannelStatsAccumulator:
+    """Record every LIF tile loaded from ``regions`` into ``stats``.
+
+    Tiles are also read through coalesced reads when their I/O profile asks
+    for them; tiles in ``done`` are not loaded, so they are left out of the
+    read plan.
+    """
+    coalesce = False
+    for region in regions:
+        loader = region.image_loader
+        if isinstance(loader, LifMosaicLoader):
+            loader.record_stats(stats)
+            profile = loader.io_profile
+            coalesce |= profile is not None and profile.coalesce_gap is not None
+    if coalesce:
+        from fractal_lif_converters.common._coalesce import attach_coalesced_reads
+
+        attach_coalesced_reads(
+            [r for i, r in enumerate(regions) if i not in (done or ())]
+        )
+    return stats
+
+
+def _assemble_canvas(group: TileFOVGroup | TiledImage, resource: Any) -> np.ndarray:
+    """Load a FOV group (or a whole image) into one preallocated canvas.
+
+    LIF tiles are read straight into their slice of the canvas, at the
+    positions computed from the stage coordinates, instead of into a
+    per-tile array that is then copied over. Later tiles overwrite earlier
+    ones where they overlap, as in ``TileFOVGroup.load_data``.
+    """
+    canvas = np.zeros(group.shape(), dtype=np.dtype(group.data_type))
+    slices = group._prepare_slice_loading(resource=resource)
+    for region, (slicing, load) in zip(group.regions, slices, strict=True):
+        view = canvas[slicing]
+        if isinstance(region.image_loader, LifMosaicLoader) and view.ndim in (4, 5):
+            region.image_loader.load_data(resource=resource, out=view)
+        else:
+            view[...] = load()
+    return canvas
+
+
+def _without_empty_tiles(tiled_image: TiledImage) -> TiledImage:
+    """A copy of ``tiled_image`` without the tiles classified as empty.
+
+    Only LIF tiles with an ``empty_check`` are sampled; the skipped tiles are
+    never read and their region keeps the fill value.
+    """
+    loaders = [
+        region.image_loader
+        for region in tiled_image.regions
+        if isinstance(region.image_loader, LifMosaicLoader)
+    ]
+    if not any(loader.empty_check is not None for loader in loaders):
+        return tiled_image
+    empty = iter(find_empty_tiles(loaders))
+    regions = [
+        region
+        for region in tiled_image.regions
+        if not (isinstance(region.image_loader, LifMosaicLoader) and next(empty))
+    ]
+    skipped = len(tiled_image.regions) - len(regions)
+    logger.info(
+        f"Skipping {skipped} of {len(tiled_image.regions)} tiles classified as empty."
+    )
+    return tiled_image.model_copy(update={"regions": regions})
+
+
+def _t_start(region: TileSlice) -> int:
+    t_slice = region.roi.get("t")
+    return int(t_slice.start or 0) if t_slice is not None else 0
+
+
+def _split_timepoints(tiled_image: TiledImage) -> bool:
+    """Split LIF regions spanning several timepoints into one per timepoint.
+
+    Each new region reads a single timepoint, and regions are reordered
+    timepoint-major, so a time-lapse is written one timepoint at a time with
+    at most one ``(C, Z, Y, X)`` volume per tile in memory.
+
+    Returns:
+        Whether any region was split.
+    """
+    if "t" not in tiled_image.axes:
+        return False
+    split = False
+    by_t: dict[int, list[TileSlice]] = {}
+    for region in tiled_image.regions:
+        loader = region.image_loader
+        t_slice = region.roi.get("t")
+        length = int(t_slice.length or 1) if t_slice is not None else 1
+        if not isinstance(loader, LifMosaicLoader) or length <= 1:
+            by_t.setdefault(_t_start(region), []).append(region)
+            continue
+        split = True
+        selection = loader.selection
+        first = selection.t_range[0] if selection.t_range else 0
+        for k in range(length):
+            t = first + k * selection.t_step
+            t_selection = selection.model_copy(
+                update={"t_range": (t, t + 1), "t_step": 1}
+            )
+            slices = [
+                s.model_copy(update={"start": (s.start or 0) + k, "length": 1})
+                if s.axis_name == "t"
+                else s
+                for s in region.roi.slices
+            ]
+            by_t.setdefault(_t_start(region) + k, []).append(
+                TileSlice(
+                    roi=region.roi.model_copy(update={"slices": slices}),
+                    image_loader=loader.model_copy(update={"selection": t_selection}),
+                )
+            )
+    tiled_image.regions = [region for t in sorted(by_t) for region in by_t[t]]
+    return split
+
+
+def _roi_box(roi: Roi, axes: list[str]) -> Box:
+    """The level-0 box of a ROI in pixel coordinates."""
+    box = []
+    for axis in axes:
+        roi_slice = roi.get(axis)
+        start = int(roi_slice.start or 0)
+        box.append((start, start + int(roi_slice.length or 1)))
+    return tuple(box)
+
+
+def _write_with_progress(
+    *,
+    ome_zarr: OmeZarrContainer,
+    tiled_image: TiledImage,
+    markers: ConversionMarkers | None,
+    done: set[int],
+    resource: Any,
+    unit: Literal["tile", "fov", "timepoint"],
+    pyramid: bool = True,
+    fixed_axis: int | None = None,
+    projections: "ZProjections | None" = None,
+) -> bool:
+    """Write tiles (or groups of them) one by one, recording each in ``markers``.
+
+    ``unit`` is a single tile, a FOV group at one timepoint, or the whole
+    image at one timepoint. Tiles whose index is in ``done`` were written by
+    an interrupted earlier run and are skipped.
+
+    With ``pyramid``, the coarser levels are built from each unit as it is
+    written (see ``StreamingPyramid``); ``fixed_axis`` is passed on to
+    ``streaming_pyramid``. So are the Z ``projections``, when they can be.
+
+    Returns:
+        Whether the coarser levels were written.
+    """
+    regions = tiled_image.regions
+    units: list[tuple[list[int], Roi, Callable[[], np.ndarray]]] = []
+    if unit != "tile":
+        # Keys keep first-seen order, as group_by_fov does.
+        groups: dict[tuple, list[int]] = {}
+        for idx, region in enumerate(regions):
+            name = region.roi.name if unit == "fov" else None
+            groups.setdefault((name, _t_start(region)), []).append(idx)
+        for (name, _), indices in groups.items():
+            group = TileFOVGroup(
+                fov_name=name or tiled_image.path,
+                regions=[regions[idx] for idx in indices],
+                axes=tiled_image.axes,
+                pixel_size=tiled_image.pixel_size,
+                data_type=tiled_image.data_type,
+            )
+            units.append(
+                (indices, group.roi(), partial(_assemble_canvas, group, resource))
+            )
+    else:
+        todo = [idx for idx in range(len(regions)) if idx not in done]
+        logger.info(f"Writing {len(todo)} of {len(regions)} tiles.")
+        for idx in todo:
+            region = regions[idx]
+            load = partial(region.load_data, axes=tiled_image.axes, resource=resource)
+            units.append(([idx], region.roi, load))
+
+    boxes = [_roi_box(roi, tiled_image.axes) for _, roi, _ in units]
+    builder = None
+    if pyramid:
+        builder = streaming_pyramid(ome_zarr, boxes, fixed_axis=fixed_axis)
+    if projections is not None and not projections.stream(boxes):
+        projections = None
+    image = ome_zarr.get_image()
+    for index, (indices, roi, load) in enumerate(units):
+        patch = load()
+        image.set_roi(roi=roi, patch=patch)
+        if builder is not None:
+            builder.write(index, patch)
+        if projections is not None:
+            projections.write(index, boxes[index], patch)
+        if markers is not None:
+            markers.mark_tiles(indices)
+    return builder is not None
+
+
+def _write_unit(
+    writer_mode: WriterMode, resumed: bool
+) -> Literal["tile", "fov", "timepoint"]:
+    if resumed:
+        return "tile"
+    if writer_mode in (WriterMode.BY_FOV, WriterMode.BY_FOV_DASK):
+        return "fov"
+    if writer_mode == WriterMode.IN_MEMORY:
+        return "timepoint"
+    return "tile"
+
+
+def write_lif_tiled_image(
+    *,
+    zarr_url: str,
+    tiled_image: TiledImage,
+    converter_options: ConverterOptions,
+    writer_mode: WriterMode,
+    overwrite_mode: OverwriteMode,
+    fingerprint: ConversionFingerprint | None = None,
+    resource: Any | None = None,
+    pipeline: LifPipelineOptions | None = None,
+    projections: list[ProjectionMode] | None = None,
+) -> tuple[OmeZarrContainer, list[ChannelStatistics] | None]:
+    """Write a registered ``TiledImage`` as OME-Zarr.
+
+    Channel windows are set from statistics accumulated while the tiles are
+    loaded, so the written image is never read back.
+
+    With a ``fingerprint``, progress and completion markers are written (see
+    ``_resume``). In ``EXTEND`` mode an image completed with the same
+    fingerprint is kept as is, an interrupted one is resumed tile by tile and
+    one written for a different fingerprint is rewritten.
+
+    With ``pipeline``, tiles are loaded and written by reader and writer
+    processes over shared memory (see ``_pipeline``), one tile at a time
+    whatever the writer mode.
+
+    Time-lapse images are streamed: tiles are split per timepoint and each
+    timepoint is written (by tile, FOV or whole image, following the writer
+    mode) before the next one is read.
+
+    The coarser pyramid levels are built from each tile, FOV group or whole
+    image as it is written (see ``_pyramid``), so level 0 is not read back;
+    with ``pipeline``, in the Dask writer modes and when resuming, they are
+    consolidated from level 0 afterwards.
+
+    The Z ``projections`` are written next to the image in the same pass
+    (see ``_projections``), in the same cases.
+
+    Returns:
+        The written container and the per-channel statistics (``None`` when
+        an existing image was kept or resumed).
+    """
+    markers = ConversionMarkers(zarr_url) if fingerprint is not None else None
+    state = MarkerState.ABSENT
+    if markers is not None and overwrite_mode == OverwriteMode.EXTEND:
+        state = markers.state(fingerprint)
+    mode = _open_group_mode(overwrite_mode)
+    if state is MarkerState.STALE:
+        logger.warning(f"Source or options changed since {zarr_url} was written.")
+        mode = "w"
+
+    zarr_format = 2 if converter_options.omezarr_options.ngff_version == "0.4" else 3
+    tiled_image.regions = region_to_pixel_coordinates(
+        tiled_image.regions,
+        tiled_image.pixel_size,
+    )
+    streamed = _split_timepoints(tiled_image)
+    base_group = zarr.open_group(store=zarr_url, mode=mode, zarr_format=zarr_format)
+    omezarr_options = converter_options.omezarr_options
+    done: set[int] = set()
+    try:
+        # This can only succeed in "extend" mode if the group already exists
+        ome_zarr = open_ome_zarr_container(base_group, cache=True)
+    except Exception:
+        ome_zarr = _create_image(base_group, tiled_image, omezarr_options)
+        if markers is not None:
+            markers.start(fingerprint)
+    else:
+        if state is not MarkerState.PARTIAL:
+            return ome_zarr, None
+        done = markers.done_tiles()
+        logger.info(f"Resuming {zarr_url}: {len(done)} tiles already written.")
+
+    image = ome_zarr.get_image()
+    # Tile indices (and resume markers) refer to the tiles actually written.
+    written = _without_empty_tiles(tiled_image)
+    # Whether the coarser levels were built while writing level 0.
+    built = False
+    projector = None
+    if projections:
+        from fractal_lif_converters.common._projections import ZProjections
+
+        projector = ZProjections(ome_zarr, zarr_url, tiled_image, projections)
+    if pipeline is not None:
+        from fractal_lif_converters.common._pipeline import write_pipelined
+
+        # Loaders are pickled to the reader processes: feed the statistics
+        # from the shared-memory slots here instead.
+        accumulator = _new_stats(tiled_image)
+        write_pipelined(
+            zarr_url=zarr_url,
+            image=image,
+            tiled_image=written,
+            todo=[i for i in range(len(written.regions)) if i not in done],
+            options=pipeline,
+            stats=accumulator,
+            on_written=None if markers is None else lambda i: markers.mark_tiles([i]),
+        )
+    elif (
+        done
+        or streamed
+        or written is not tiled_image
+        or writer_mode in (WriterMode.BY_TILE, WriterMode.BY_FOV)
+    ):
+        # Time-lapse images are always streamed one timepoint at a time, and
+        # images with skipped tiles as well (placed relative to their tiles).
+        accumulator = _attach_loaders(written.regions, _new_stats(tiled_image), done)
+        # The tiles written before an interruption are not streamed again.
+        built = _write_with_progress(
+            ome_zarr=ome_zarr,
+            tiled_image=written,
+            markers=markers,
+            done=done,
+            resource=resource,
+            unit=_write_unit(writer_mode, resumed=bool(done)),
+            pyramid=not done,
+            projections=None if done else projector,
+        )
+    elif writer_mode == WriterMode.IN_MEMORY:
+        accumulator = _attach_loaders(tiled_image.regions, _new_stats(tiled_image))
+        roi = tiled_image.roi()
+        canvas = _assemble_canvas(tiled_image, resource)
+        image.set_roi(roi=roi, patch=canvas)
+        box = _roi_box(roi, tiled_image.axes)
+        builder = streaming_pyramid(ome_zarr, [box])
+        if builder is not None:
+            builder.write(0, canvas)
+            built = True
+        if projector is not None and projector.stream([box]):
+            projector.write(0, box, canvas)
+    else:
+        accumulator = _attach_loaders(tiled_image.regions, _new_stats(tiled_image))
+        write_to_zarr(
+            image=image,
+            tiled_image=tiled_image,
+            resource=resource,
+            writer_mode=writer_mode,
+        )
+    if not built:
+        image.consolidate()
+    # After a resume the accumulator has only seen part of the tiles.
+    stats = None if done else accumulator.finalize()
+    _finalize_image(ome_zarr, tiled_image, stats, omezarr_options)
+    if projector is not None:
+        from fractal_lif_converters.common._projections import projected_tiled_image
+
+        projector.finish(ome_zarr)
+        projected = projected_tiled_image(tiled_image)
+        for container in projector.images.values():
+            _finalize_image(container, projected, None, omezarr_options)
+    if markers is not None:
+        markers.complete(fingerprint)
+    logger.info("Finished writing OME-Zarr Tables and metadata.")
+    return ome_zarr, stats
+
+
+def _create_image(
+    base_group: zarr.Group, tiled_image: TiledImage, omezarr_options: OmeZarrOptions
+) -> OmeZarrContainer:
+    """Create the empty OME-Zarr image of a ``TiledImage`` in pixel coordinates."""
+    return create_empty_ome_zarr(
+        store=base_group,
+        axes_names=tiled_image.axes,
+        shape=tiled_image.shape(),
+        chunks=compute_chunk_size(tiled_image, omezarr_options),
+        pixelsize=tiled_image.pixelsize,
+        z_spacing=tiled_image.z_spacing,
+        time_spacing=tiled_image.t_spacing,
+        levels=omezarr_options.num_levels,
+        channels_meta=build_channels_meta(tiled_image),
+        translation=tiled_image.translation,
+        overwrite=True,
+        ngff_version=omezarr_options.ngff_version,
+        dtype=tiled_image.data_type,
+    )
+
+
+def _finalize_image(
+    ome_zarr: OmeZarrContainer,
+    tiled_image: TiledImage,
+    stats: list[ChannelStatistics] | None,
+    omezarr_options: OmeZarrOptions,
+) -> None:
+    """Set the channel windows and write the tables of a written image."""
+    if stats is not None:
+        ome_zarr.set_channel_windows(
+            starts_ends=[(s.start, s.end) for s in stats],
+            min_max=[(s.min, s.max) for s in stats],
+        )
+    else:
+        ome_zarr.set_channel_windows_with_percentiles()
+    logger.info("OME-Zarr image creation and data writing complete.")
+
+    fov_tiles = tiled_image.group_by_fov()
+    if len(fov_tiles) > 1:
+        rois = [
+            fov_tile.roi().to_world(pixel_size=tiled_image.pixel_size)
+            for fov_tile in fov_tiles
+        ]
+        ome_zarr.add_table(
+            "FOV_ROI_table",
+            RoiTable(rois=rois),
+            backend=omezarr_options.table_backend,
+            overwrite=True,
+        )
+
+    well_roi = ome_zarr.build_image_roi_table()
+    ome_zarr.add_table(
+        "well_ROI_table",
+        well_roi,
+        backend=omezarr_options.table_backend,
+        overwrite=True,
+    )
+    condition_table = attribute_to_condition_table(tiled_image.attributes)
+    if condition_table is not None:
+        ome_zarr.add_table(
+            "condition_table", condition_table, backend="csv", overwrite=True
+        )
+
+
+def write_lif_shard(
+    *,
+    zarr_url: str,
+    tiled_image: TiledImage,
+    shard: LifAxisShard,
+    converter_options: ConverterOptions,
+    fingerprint: ConversionFingerprint,
+    resource: Any | None = None,
+) -> tuple[OmeZarrContainer, list[ChannelStatistics] | None]:
+    """Write one shard of a registered ``TiledImage`` into its existing image.
+
+    The image was created by ``prepare_sharded_image``. Only the frames of
+    the shard are read; they are written (streamed like in
+    ``write_lif_tiled_image``) together with the shard slab of every pyramid
+    level. The task writing the last shard of the image also sets the channel
+    windows and writes the tables; when several finish together, the one
+    claiming ``finalize`` first does.
+
+    Returns:
+        The image container and the per-channel statistics of the shard.
+    """
+    from fractal_lif_converters.common._sharding import (
+        consolidate_slab,
+        merge_channel_stats,
+        restrict_to_shard,
+    )
+
+    tiled_image.regions = region_to_pixel_coordinates(
+        tiled_image.regions,
+        tiled_image.pixel_size,
+    )
+    full_image = tiled_image.model_copy()
+    restrict_to_shard(tiled_image, shard)
+    _split_timepoints(tiled_image)
+    logger.info(
+        f"Writing shard {shard.index + 1}/{shard.count} "
+        f"({shard.axis} {shard.start}:{shard.stop})."
+    )
+    ome_zarr = open_ome_zarr_container(zarr_url, cache=True)
+    written = _without_empty_tiles(tiled_image)
+    accumulator = _attach_loaders(written.regions, _new_stats(full_image))
+    axis = tiled_image.axes.index(shard.axis)
+    built = _write_with_progress(
+        ome_zarr=ome_zarr,
+        tiled_image=written,
+        markers=None,
+        done=set(),
+        resource=resource,
+        unit=_write_unit(converter_options.writer_mode, resumed=False),
+        fixed_axis=axis,
+    )
+    if not built:
+        consolidate_slab(ome_zarr, axis, shard.start, shard.stop)
+    stats = accumulator.finalize()
+    markers = ConversionMarkers(zarr_url)
+    markers.mark_shard(shard.index, stats)
+    done = markers.done_shards()
+    if len(done) == shard.count and markers.claim_finalize():
+        _finalize_image(
+            ome_zarr,
+            full_image,
+            merge_channel_stats(list(done.values())),
+            converter_options.omezarr_options,
+        )
+        markers.complete(fingerprint)
+        logger.info("Finished writing OME-Zarr Tables and metadata.")
+    return ome_zarr, stats
+
+
+def _resolve_tiling(
+    tiled_image: TiledImage, strategy: TilingStrategy
+) -> TilingStrategy:
+    """Keep ROI-cropped tiles in place instead of snapping them to a grid.
+
+    Grid snapping needs equally sized tiles, which boundary tiles cropped to a
+    spatial ROI are not; their origins are already exact stage positions.
+    """
+    if not isinstance(strategy, AutoTiling | SnapToGridTiling):
+        return strategy
+    for region in tiled_image.regions:
+        loader = region.image_loader
+        if isinstance(loader, LifMosaicLoader) and loader.selection.yx_window:
+            logger.info("Tiles are cropped to an ROI; keeping stage positions.")
+            return InplaceTiling()
+    return strategy
+
+
+def load_serialized_tiled_image(
+    parsed_args: ConvertParallelInitArgs, collection_type: type
+) -> TiledImage:
+    """Deserialize the ``TiledImage`` passed by the init task.
+
+    Both tile tables (see ``_tile_table``) and the default ``TiledImage``
+    JSON are accepted.
+    """
+    if parsed_args.tiled_image_json_str is not None:
+        json_str = parsed_args.tiled_image_json_str
+    else:
+        assert parsed_args.tiled_image_json_dump_url is not None
+        json_str = read_json_dump(parsed_args.tiled_image_json_dump_url)
+    return decode_tiled_image(json_str, collection_type)
+
+
+def _register(
+    tiled_image: TiledImage, converter_options: ConverterOptions
+) -> TiledImage:
+    registration_pipeline = build_default_registration_pipeline(
+        alignment_corrections=converter_options.stage_position_corrections,
+        tiling_strategy=_resolve_tiling(tiled_image, converter_options.tiling_strategy),
+    )
+    return apply_registration_pipeline(tiled_image, registration_pipeline)
+
+
+def split_into_shards(
+    tiled_image: TiledImage,
+    converter_options: ConverterOptions,
+    sharding: LifAxisSharding,
+) -> tuple[TiledImage, list[LifAxisShard]]:
+    """Split the image of ``tiled_image`` into shards, without writing it.
+
+    Returns:
+        A registered copy of ``tiled_image`` in pixel coordinates and its
+        shards; no shard when the image fits in one.
+    """
+    from fractal_lif_converters.common._sharding import shard_ranges
+
+    with converter_options.runtime_settings.apply():
+        registered = _register(tiled_image.model_copy(deep=True), converter_options)
+    registered.regions = region_to_pixel_coordinates(
+        registered.regions,
+        registered.pixel_size,
+    )
+    if sharding.axis not in registered.axes:
+        return registered, []
+    axis = registered.axes.index(sharding.axis)
+    chunks = compute_chunk_size(registered, converter_options.omezarr_options)
+    ranges = shard_ranges(registered.shape()[axis], chunks[axis], sharding.size)
+    if len(ranges) <= 1:
+        return registered, []
+    shards = [
+        LifAxisShard(
+            axis=sharding.axis,
+            start=start,
+            stop=stop,
+            index=index,
+            count=len(ranges),
+        )
+        for index, (start, stop) in enumerate(ranges)
+    ]
+    return registered, shards
+
+
+def prepare_sharded_image(
+    *,
+    zarr_url: str,
+    tiled_image: TiledImage,
+    converter_options: ConverterOptions,
+    overwrite_mode: OverwriteMode,
+    sharding: LifAxisSharding,
+) -> list[LifAxisShard]:
+    """Create the empty image of ``tiled_image`` and split it into shards.
+
+    Shards are ``sharding.size`` frames rounded up to whole chunks along the
+    axis. In ``EXTEND`` mode an interrupted sharded conversion is resumed:
+    the image is kept and only the shards not yet written are returned.
+
+    Returns:
+        The shards to convert; empty (and nothing is written) when the image
+        fits in one shard or an existing image is kept, in which case it is
+        converted by a single task as usual.
+    """
+    fingerprint = conversion_fingerprint(tiled_image, converter_options)
+    registered, shards = split_into_shards(tiled_image, converter_options, sharding)
+    if not shards:
+        return []
+    omezarr_options = converter_options.omezarr_options
+
+    markers = ConversionMarkers(zarr_url)
+    state = MarkerState.ABSENT
+    if overwrite_mode == OverwriteMode.EXTEND:
+        state = markers.state(fingerprint)
+    done = {}
+    if state is MarkerState.PARTIAL:
+        done = markers.done_shards()
+    else:
+        mode = "w" if state is MarkerState.STALE else _open_group_mode(overwrite_mode)
+        zarr_format = 2 if omezarr_options.ngff_version == "0.4" else 3
+        base_group = zarr.open_group(store=zarr_url, mode=mode, zarr_format=zarr_format)
+        if mode == "a":
+            try:
+                open_ome_zarr_container(base_group)
+            except Exception:
+                pass
+            else:
+                # Kept as is by the single-task conversion.
+                return []
+        _create_image(base_group, registered, omezarr_options)
+        markers.start(fingerprint)
+    return [shard for shard in shards if shard.index not in done]
+
+
+def shard_parallelization_list(
+    parallelization_list: list[dict],
+    *,
+    zarr_dir: str,
+    shardings: dict[str, LifAxisSharding],
+    collection_type: type,
+    overwrite_mode: OverwriteMode,
+) -> list[dict]:
+    """Replace the items of sharded images by one item per shard.
+
+    Args:
+        parallelization_list: Items built by ``setup_lif_images_for_conversion``.
+        zarr_dir: Base directory of the images.
+        shardings: Sharding options by image path (below ``zarr_dir``).
+        collection_type: Collection type of the serialized ``TiledImage``.
+        overwrite_mode: Overwrite mode of the conversion.
+    """
+    urls = {join_url_paths(zarr_dir, path): s for path, s in shardings.items()}
+    items = []
+    for item in parallelization_list:
+        sharding = urls.get(item["zarr_url"])
+        shards: list[LifAxisShard] = []
+        if sharding is not None:
+            parsed_args = LifConvertInitArgs.model_validate(item["init_args"])
+            shards = prepare_sharded_image(
+                zarr_url=item["zarr_url"],
+                tiled_image=load_serialized_tiled_image(parsed_args, collection_type),
+                converter_options=parsed_args.converter_options,
+                overwrite_mode=overwrite_mode,
+                sharding=sharding,
+            )
+        if not shards:
+            items.append(item)
+            continue
+        logger.info(
+            f"Converting {item['zarr_url']} with {len(shards)} task(s) along "
+            f"{sharding.axis}."
+        )
+        items.extend(
+            {
+                "zarr_url": item["zarr_url"],
+                "init_args": {**item["init_args"], "shard": shard.model_dump()},
+            }
+            for shard in shards
+        )
+    return items
+
+
+def lif_compute_task(
+    *,
+    zarr_url: str,
+    init_args: LifConvertInitArgs | dict,
+    collection_type: type,
+    resource: Any = None,
+    pipeline: LifPipelineOptions | None = None,
+) -> tuple[ImageListUpdateDict, list[ChannelStatistics] | None]:
+    """Convert one ``TiledImage`` of LIF tiles to OME-Zarr.
+
+    Args:
+        zarr_url: URL to the OME-Zarr image.
+        init_args: Arguments from the initialization task.
+        collection_type: Collection type of the serialized ``TiledImage``.
+        resource: Optional resource passed to the image loaders.
+        pipeline: Write with reader and writer processes over shared memory;
+            defaults to ``default_pipeline_options()``.
+
+    Returns:
+        The Fractal image-list update entries for the converted image (and
+        its Z projections) and the per-channel statistics gathered while
+        loading the tiles (of the shard only, for a sharded image).
+    """
+    logger.info(f"Starting conversion for Zarr URL: {zarr_url}")
+    parsed_args = LifConvertInitArgs.model_validate(init_args)
+    tiled_image = load_serialized_tiled_image(parsed_args, collection_type)
+
+    converter_options = parsed_args.converter_options
+    # Fingerprint the tile set as serialized by the init task, before
+    # registration rewrites the regions.
+    fingerprint = conversion_fingerprint(tiled_image, converter_options)
+    with converter_options.runtime_settings.apply():
+        tiled_image = _register(tiled_image, converter_options)
+        if parsed_args.shard is not None:
+            ome_zarr, stats = write_lif_shard(
+                zarr_url=zarr_url,
+                tiled_image=tiled_image,
+                shard=parsed_args.shard,
+                converter_options=converter_options,
+                fingerprint=fingerprint,
+                resource=resource,
+            )
+        else:
+            ome_zarr, stats = write_lif_tiled_image(
+                zarr_url=zarr_url,
+                tiled_image=tiled_image,
+                converter_options=converter_options,
+                writer_mode=converter_options.writer_mode,
+                overwrite_mode=parsed_args.overwrite_mode,
+                fingerprint=fingerprint,
+                resource=resource,
+                pipeline=pipeline or default_pipeline_options(),
+                projections=parsed_args.projections,
+            )
+    # The JSON dump of a sharded image is shared by all its shards.
+    if parsed_args.tiled_image_json_dump_url is not None and parsed_args.shard is None:
+        remove_json(parsed_args.tiled_image_json_dump_url)
+    logger.info("Conversion complete")
+    update = build_image_list_update(
+        zarr_url=zarr_url,
+        ome_zarr=ome_zarr,
+        collection=tiled_image.collection,
+        attributes=tiled_image.attributes,
+    )
+    if parsed_args.projections:
+        from fractal_lif_converters.common._projections import projection_path
+    for mode in parsed_args.projections or ():
+        projection_url = projection_path(zarr_url, mode)
+        (entry,) = build_image_list_update(
+            zarr_url=projection_url,
+            ome_zarr=open_ome_zarr_container(projection_url),
+            collection=tiled_image.collection,
+            attributes=tiled_image.attributes,
+        )["image_list_updates"]
+        entry["attributes"]["projection"] = mode
+        update["image_list_updates"].append(entry)
+    return update, stats
@@ -0,0 +1,41 @@
+"""Private parts of ``ome-zarr-converters-tools`` and ``ngio`` used by LIF.
+
+The LIF compute pipeline (``_compute``) follows the library's
+``generic_compute_task`` and ``write_tiled_image_as_zarr`` step by step, and
+reuses helpers they do not export; the pyramid and sharding writers reuse
+ngio's zoom helpers. Every import from a private module of either library
+goes through here, so an upstream change breaks one module only;
+``pyproject.toml`` pins both to the releases these were checked against.
+Compare this module with the libraries before raising a pin.
+"""
+
+from ngio.common._zoom import dask_zoom, numpy_zoom
+from ome_zarr_converters_tools.fractal._compute_task import (
+    _build_image_list_update as build_image_list_update,
+)
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+from ome_zarr_converters_tools.pipelines._to_zarr import write_to_zarr
+from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
+    _attribute_to_condition_table as attribute_to_condition_table,
+)
+from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
+    _compute_chunk_size as compute_chunk_size,
+)
+from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
+    _region_to_pixel_coordinates as region_to_pixel_coordinates,
+)
+from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
+    build_channels_meta,
+)
+
+__all__ = [
+    "ImageLoaderInterface",
+    "attribute_to_condition_table",
+    "build_channels_meta",
+    "build_image_list_update",
+    "compute_chunk_size",
+    "dask_zoom",
+    "numpy_zoom",
+    "region_to_pixel_coordinates",
+    "write_to_zarr",
+]
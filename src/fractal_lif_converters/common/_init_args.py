@@ -0,0 +1,28 @@
+"""Arguments the init tasks pass on to each LIF compute task."""
+
+from typing import Literal
+
+from ome_zarr_converters_tools import ConvertParallelInitArgs
+from pydantic import BaseModel
+
+from fractal_lif_converters.common._options import ProjectionMode
+
+
+class LifAxisShard(BaseModel):
+    """Half-open range ``[start, stop)`` of an output image along one axis."""
+
+    axis: Literal["t", "z"]
+    start: int
+    stop: int
+    index: int
+    count: int
+    """Number of shards of the image."""
+
+
+class LifConvertInitArgs(ConvertParallelInitArgs):
+    """Compute-task arguments, optionally restricted to one shard of the image."""
+
+    shard: LifAxisShard | None = None
+    """Range of the image converted by this task, for sharded images."""
+    projections: list[ProjectionMode] | None = None
+    """Z projections to write next to the image (see ``_projections``)."""
@@ -1,18 +1,31 @@
 """LIF image loaders implementing the ImageLoaderInterface."""
 
-from typing import Any
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal
 
 import liffile
 import numpy as np
-from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+from pydantic import BaseModel, Field, PrivateAttr
+
+from fractal_lif_converters.common._channel_stats import ChannelStatsAccumulator
+from fractal_lif_converters.common._converters_tools import ImageLoaderInterface
+from fractal_lif_converters.common._remote import open_lif_source
+
+if TYPE_CHECKING:
+    from fractal_lif_converters.common._coalesce import CoalescedReads
 
 # Canonical dimension order produced by this loader (excluding T which is
 # squeezed when T=1, or kept first when T>1).
 _CANONICAL = ("T", "C", "Z", "Y", "X")
 
 
-def _to_canonical_shape(arr: np.ndarray, dims: tuple) -> np.ndarray:
-    """Reshape arr from liffile native dims to (T?,C,Z,Y,X), squeezing T if 1."""
+def _canonical_view(arr: np.ndarray, dims: tuple) -> np.ndarray:
+    """Return a (T,C,Z,Y,X) view of arr, inserting singleton axes as needed."""
     current = list(dims)
     for i, dim in enumerate(_CANONICAL):
         if dim not in current:
@@ -21,48 +34,654 @@ def _to_canonical_shape(arr: np.ndarray, dims: tuple) -> np.ndarray:
     if current != list(_CANONICAL):
         perm = [current.index(d) for d in _CANONICAL]
         arr = np.transpose(arr, perm)
-    # arr is now (T, C, Z, Y, X); squeeze T when T=1
-    if arr.shape[0] == 1:
-        arr = arr[0]
     return arr
 
 
-def _load_lif_array(file_path: str, image_id: int, m: int) -> np.ndarray:
-    # Re-opening per call is intentional: profiling shows LifFile lifecycle
-    # is ~3% of wall time vs ~4% for asarray. Caching handles would also
-    # need per-thread state (LifFile is not thread-safe) for marginal gain.
-    with liffile.LifFile(file_path, squeeze=False) as lf:
-        lif_image = lf.images[image_id]
-        dims = list(lif_image.dims)
-        if "M" in dims:
-            # frames-API output order: iterated dims (original order) +
-            # fixed dims + frame dims (Y, X, optional S). M is the only
-            # fixed dim here, so its singleton axis sits just before the
-            # frame dims.
-            arr = lif_image.frames(M=m).asarray()
-            frame_dim_count = sum(1 for d in dims if d in ("Y", "X", "S"))
-            arr = np.squeeze(arr, axis=arr.ndim - frame_dim_count - 1)
-            dims.remove("M")
+def _as_5d(out: np.ndarray, shape_5d: tuple[int, ...]) -> np.ndarray:
+    """Return a (T,C,Z,Y,X) view of a caller-provided output buffer."""
+    if out.ndim == 4:
+        out = out[np.newaxis]
+    if out.shape != shape_5d:
+        raise ValueError(
+            f"Output buffer has shape {out.shape}, expected {shape_5d} "
+            "(T may be omitted when T=1)."
+        )
+    return out
+
+
+def _squeeze_t(arr: np.ndarray) -> np.ndarray:
+    return arr[0] if arr.shape[0] == 1 else arr
+
+
+def _blocked_copy(src: np.ndarray, dst: np.ndarray) -> None:
+    """Copy a (T,C,Z,Y,X) array one Y/X plane at a time.
+
+    Planes are the contiguous unit in LIF memory blocks, so copying plane by
+    plane keeps both reads and writes sequential even when ``src`` is a
+    transposed view.
+    """
+    for idx in np.ndindex(*src.shape[:3]):
+        np.copyto(dst[idx], src[idx])
+
+
+def _to_canonical_shape(
+    arr: np.ndarray, dims: tuple, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Reshape arr from liffile native dims to (T?,C,Z,Y,X), squeezing T if 1.
+
+    The result is always C-contiguous in canonical order: a view when ``arr``
+    already is, otherwise a plane-blocked copy into ``out`` (allocated when not
+    provided).
+    """
+    view = _canonical_view(arr, dims)
+    if out is None:
+        if view.flags.c_contiguous:
+            return _squeeze_t(view)
+        out = np.empty(view.shape, dtype=view.dtype)
+    out_5d = _as_5d(out, view.shape)
+    _blocked_copy(view, out_5d)
+    return _squeeze_t(out_5d)
+
+
+class _StagingPool(threading.local):
+    """Per-thread reusable native-order staging buffer.
+
+    Only used on the fallback path where frames cannot be read straight into
+    the canonical output. Consecutive tiles of a mosaic share shape and dtype,
+    so they reuse one buffer instead of allocating a new one per tile.
+    Buffers larger than ``max_bytes`` are allocated per call and not kept, so
+    an idle thread holds at most ``max_bytes`` of staging memory.
+    """
+
+    max_bytes = 64 * 1024**2
+
+    def __init__(self) -> None:
+        self.buffer: np.ndarray | None = None
+
+    def get(self, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        buffer = self.buffer
+        if buffer is not None and buffer.shape == shape and buffer.dtype == dtype:
+            return buffer
+        buffer = np.empty(shape, dtype=dtype)
+        self.buffer = buffer if buffer.nbytes <= self.max_bytes else None
+        return buffer
+
+
+_staging_pool = _StagingPool()
+
+
+class LifReadSelection(BaseModel):
+    """Subset of planes read from a LIF image; ``None`` keeps the whole axis.
+
+    Ranges are half-open ``(start, stop)`` pairs of already validated indices
+    (see ``LifAcquisitionOptions.read_selection``). ``xy_step``,
+    ``z_projection`` and ``t_step`` decimate the data for preview conversions.
+    ``yx_window`` (``y_start, y_stop, x_start, x_stop``) crops every frame to
+    a spatial ROI.
+    """
+
+    channels: list[int] | None = None
+    z_range: tuple[int, int] | None = None
+    t_range: tuple[int, int] | None = None
+    t_step: int = 1
+    xy_step: int = 1
+    z_projection: Literal["max"] | None = None
+    yx_window: tuple[int, int, int, int] | None = None
+
+    def indices(
+        self, sizes: dict[str, int]
+    ) -> tuple[Sequence[int], Sequence[int], Sequence[int]]:
+        """Return the selected ``(T, C, Z)`` indices for an image of ``sizes``.
+
+        With ``z_projection`` the Z indices are the planes being projected.
+        """
+        t_start, t_stop = self.t_range or (0, sizes.get("T", 1))
+        t_idx = range(t_start, t_stop, self.t_step)
+        c_idx = self.channels if self.channels is not None else range(sizes.get("C", 1))
+        z_idx = range(*self.z_range) if self.z_range else range(sizes.get("Z", 1))
+        return t_idx, c_idx, z_idx
+
+    def yx_slices(self, sizes: dict[str, int]) -> tuple[slice, slice]:
+        """Return the Y and X slices read from every frame."""
+        y_start, y_stop, x_start, x_stop = self.yx_window or (
+            0,
+            sizes.get("Y", 1),
+            0,
+            sizes.get("X", 1),
+        )
+        return (
+            slice(y_start, y_stop, self.xy_step),
+            slice(x_start, x_stop, self.xy_step),
+        )
+
+    def shape_5d(self, sizes: dict[str, int]) -> tuple[int, int, int, int, int]:
+        """Return the canonical ``(T, C, Z, Y, X)`` shape after selection."""
+        t_idx, c_idx, z_idx = self.indices(sizes)
+        y_slice, x_slice = self.yx_slices(sizes)
+        return (
+            len(t_idx),
+            len(c_idx),
+            1 if self.z_projection else len(z_idx),
+            len(range(y_slice.start, y_slice.stop, y_slice.step)),
+            len(range(x_slice.start, x_slice.stop, x_slice.step)),
+        )
+
+    def is_decimated(self) -> bool:
+        """Whether frames are subsampled or cropped in Y/X, or projected in Z."""
+        return (
+            self.xy_step > 1
+            or self.z_projection is not None
+            or self.yx_window is not None
+        )
+
+    def is_full(self) -> bool:
+        """Whether every plane of the image is selected."""
+        return (
+            self.channels is None
+            and self.z_range is None
+            and self.t_range is None
+            and self.t_step == 1
+            and not self.is_decimated()
+        )
+
+
+class LifIOProfile(BaseModel):
+    """How the memory block of a tile is read from disk.
+
+    The defaults leave reads to ``liffile`` (one read per frame). On network
+    filesystems (NFS, Lustre, GPFS) fewer, larger and aligned reads plus
+    ``posix_fadvise`` hints are usually much faster.
+    """
+
+    block_size: int | None = Field(default=None, ge=4096, title="Block Size")
+    """
+    Read a tile's byte span in aligned requests of this many bytes into a
+    staging buffer. ``None`` keeps ``liffile``'s per-frame reads.
+    """
+    readahead: int = Field(default=0, ge=0, title="Readahead")
+    """
+    Bytes past the end of the tile included in the ``fadvise`` hint, so the
+    kernel prefetches the next tile while this one is being written.
+    """
+    fadvise: Literal["none", "sequential", "willneed"] = Field(
+        default="none", title="Fadvise"
+    )
+    """
+    ``posix_fadvise`` advice for the tile's byte span (ignored where the
+    platform does not support it).
+    """
+    coalesce_gap: int | None = Field(default=None, ge=0, title="Coalesce Gap")
+    """
+    Read tiles stored at most this many bytes apart in the file with one
+    request, then slice them apart (see ``CoalescedReads``). ``None`` reads
+    every tile on its own.
+    """
+    coalesce_max_bytes: int = Field(
+        default=64 * 1024**2, ge=4096, title="Coalesce Max Bytes"
+    )
+    """
+    Largest coalesced read; a tile larger than this is read on its own.
+    """
+
+    def is_default(self) -> bool:
+        """Whether the profile leaves the reads of a single tile to ``liffile``."""
+        return self.block_size is None and self.fadvise == "none"
+
+
+class LifEmptyTileCheck(BaseModel):
+    """Classify tiles as empty (e.g. blank glass) from a strided sample.
+
+    A tile is empty when at most ``max_fraction`` of the sampled pixels of
+    its selected planes are above ``threshold``.
+    """
+
+    threshold: float = Field(title="Threshold")
+    """
+    Intensity at or below which a pixel counts as background.
+    """
+    sample_step: int = Field(default=16, ge=1, title="Sample Step")
+    """
+    Sample every k-th pixel along Y and X of every selected plane.
+    """
+    max_fraction: float = Field(default=0.0, ge=0, lt=1, title="Max Fraction")
+    """
+    Fraction of the sampled pixels allowed above ``threshold`` in an empty
+    tile, to tolerate hot pixels and debris.
+    """
+
+
+def _mapped_image(lif_image: Any) -> np.ndarray | None:
+    """Memory-map a LIF image in place, or ``None`` when that is not possible.
+
+    Only plain Y/X-framed images stored in the LIF file itself (not XLIF/LOF
+    frames) are mapped, so strided views touch only the rows they need.
+    """
+    block = lif_image.memory_block
+    frame_dims = tuple(lif_image.frames.frame_dims)
+    if frame_dims != ("Y", "X") or block.frames or block.offset <= 0:
+        return None
+    try:
+        lif_image.parent.filehandle.fileno()
+    except (AttributeError, OSError):
+        # Remote streams cannot be mapped.
+        return None
+    return lif_image.asarray(out="memmap")
+
+
+def _plane_reader(
+    lif_image: Any, m: int, window: tuple[slice, slice]
+) -> Callable[[int, int, int], np.ndarray]:
+    """Return ``plane(t, c, z)`` reading the ``window`` of a frame of tile ``m``.
+
+    Frames are read through a memory map when possible so that rows outside
+    the window are never paged in; otherwise each frame is read into a
+    pooled staging buffer and windowed from there.
+    """
+    dims = list(lif_image.dims)
+    mapped = _mapped_image(lif_image)
+    present = [d for d in ("T", "C", "Z") if d in dims]
+    fixed = {"M": m} if "M" in dims else {}
+
+    def _plane(t: int, c: int, z: int) -> np.ndarray:
+        indices = dict(zip(("T", "C", "Z"), (t, c, z), strict=True))
+        indices = {d: indices[d] for d in present} | fixed
+        if mapped is not None:
+            key = tuple(indices.get(d, slice(None)) for d in dims)
+            return mapped[key][window]
+        frame_shape = tuple(lif_image.frames.frame_shape)
+        staging = _staging_pool.get(frame_shape, lif_image.dtype)
+        lif_image.frame(out=staging, **indices)
+        return staging[window]
+
+    return _plane
+
+
+def _read_decimated(
+    lif_image: Any, m: int, selection: LifReadSelection, out_5d: np.ndarray
+) -> np.ndarray:
+    """Read subsampled or cropped (and optionally Z-projected) frames."""
+    sizes = dict(lif_image.sizes)
+    plane = _plane_reader(lif_image, m, selection.yx_slices(sizes))
+    return _fill_planes(out_5d, selection, sizes, plane)
+
+
+def _is_empty_tile(
+    lif_image: Any, m: int, selection: LifReadSelection, check: LifEmptyTileCheck
+) -> bool:
+    """Whether the strided sample of the selected planes of a tile is empty.
+
+    Planes are sampled through a memory map when possible, so only the
+    sampled rows are read from disk; otherwise each frame is read whole.
+    Stops at the first plane showing enough foreground.
+    """
+    sizes = dict(lif_image.sizes)
+    y_slice, x_slice = selection.yx_slices(sizes)
+    step = check.sample_step * selection.xy_step
+    window = (
+        slice(y_slice.start, y_slice.stop, step),
+        slice(x_slice.start, x_slice.stop, step),
+    )
+    planes = list(itertools.product(*selection.indices(sizes)))
+    samples = len(range(y_slice.start, y_slice.stop, step)) * len(
+        range(x_slice.start, x_slice.stop, step)
+    )
+    allowed = check.max_fraction * samples * len(planes)
+    plane_reader = _plane_reader(lif_image, m, window)
+    above = 0
+    for plane in planes:
+        sample = plane_reader(*plane)
+        above += np.count_nonzero(sample > check.threshold)
+        if above > allowed:
+            return False
+    return True
+
+
+def _fill_planes(
+    out_5d: np.ndarray,
+    selection: LifReadSelection,
+    sizes: dict[str, int],
+    plane: Callable[[int, int, int], np.ndarray],
+) -> np.ndarray:
+    """Copy (or Z-project) the selected planes into ``out_5d``.
+
+    ``plane(t, c, z)`` returns the already cropped and subsampled frame at
+    the given image indices.
+    """
+    t_idx, c_idx, z_idx = selection.indices(sizes)
+    for (ti, t), (ci, c) in itertools.product(enumerate(t_idx), enumerate(c_idx)):
+        if selection.z_projection == "max":
+            dst = out_5d[ti, ci, 0]
+            for i, z in enumerate(z_idx):
+                if i == 0:
+                    np.copyto(dst, plane(t, c, z))
+                else:
+                    np.maximum(dst, plane(t, c, z), out=dst)
+            continue
+        for zi, z in enumerate(z_idx):
+            np.copyto(out_5d[ti, ci, zi], plane(t, c, z))
+    return _squeeze_t(out_5d)
+
+
+_FADVISE = {
+    "sequential": getattr(os, "POSIX_FADV_SEQUENTIAL", None),
+    "willneed": getattr(os, "POSIX_FADV_WILLNEED", None),
+}
+
+
+def _pread_into(fh: BinaryIO, buffer: memoryview, offset: int, block_size: int) -> None:
+    """Fill ``buffer`` from file offset ``offset`` in block-aligned reads.
+
+    Uses ``os.preadv`` (or ``os.pread``) where available, which leaves the
+    position of ``fh`` alone; elsewhere (Windows) seeks ``fh`` and reads into
+    the buffer.
+    """
+    fd = fh.fileno() if hasattr(os, "pread") else None
+    pos = 0
+    while pos < len(buffer):
+        # The first read ends on a block boundary; the following ones are
+        # whole, aligned blocks.
+        size = block_size - (offset + pos) % block_size
+        chunk = buffer[pos : pos + size]
+        if fd is None:
+            fh.seek(offset + pos)
+            nbytes = fh.readinto(chunk)
+        elif hasattr(os, "preadv"):
+            nbytes = os.preadv(fd, [chunk], offset + pos)
+        else:
+            data = os.pread(fd, len(chunk), offset + pos)
+            chunk[: len(data)] = data
+            nbytes = len(data)
+        if not nbytes:
+            raise EOFError(f"Unexpected end of file at offset {offset + pos}.")
+        pos += nbytes
+
+
+def _read_profiled(
+    lif_image: Any,
+    m: int,
+    selection: LifReadSelection,
+    out_5d: np.ndarray,
+    profile: LifIOProfile,
+) -> np.ndarray | None:
+    """Read the selected planes of one tile following ``profile``.
+
+    Returns ``None`` (and reads nothing) when the tile is not one contiguous
+    span of a mappable local file; the caller then falls back to
+    ``liffile``'s reads.
+    """
+    mapped = _mapped_image(lif_image)
+    if mapped is None:
+        return None
+    dims = list(lif_image.dims)
+    tile = mapped[dims.index("M") * (slice(None),) + (m,)] if "M" in dims else mapped
+    tile_dims = [d for d in dims if d != "M"]
+    if any(stride <= 0 for stride in tile.strides):
+        return None
+    start = tile.ctypes.data
+    span = sum((n - 1) * s for n, s in zip(tile.shape, tile.strides, strict=True))
+    span += tile.itemsize
+    if span > 2 * tile.nbytes:
+        # M is not the outermost axis: the tile is scattered over the block.
+        return None
+    offset = mapped.offset + (start - mapped.ctypes.data)
+    fh = lif_image.parent.filehandle
+
+    advice = _FADVISE.get(profile.fadvise)
+    if advice is not None and hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fh.fileno(), offset, span + profile.readahead, advice)
+    if profile.block_size is not None:
+        staging = _staging_pool.get((span,), np.dtype(np.uint8))
+        _pread_into(fh, memoryview(staging), offset, profile.block_size)
+        tile = np.ndarray(
+            tile.shape, dtype=tile.dtype, buffer=staging, strides=tile.strides
+        )
+
+    view = _canonical_view(tile, tuple(tile_dims))
+    for dst, src in zip(
+        itertools.product(*(range(n) for n in out_5d.shape[:3])),
+        itertools.product(*selection.indices(dict(lif_image.sizes))),
+        strict=True,
+    ):
+        np.copyto(out_5d[dst], view[src])
+    return _squeeze_t(out_5d)
+
+
+def _read_lif_image(
+    lif_image: Any,
+    m: int,
+    selection: LifReadSelection | None = None,
+    out: np.ndarray | None = None,
+    io_profile: LifIOProfile | None = None,
+) -> np.ndarray:
+    """Read one mosaic position of an open ``LifImage`` in canonical order.
+
+    Only the planes in ``selection`` are read from disk; decimated and cropped
+    selections additionally read only the Y/X rows they keep. A non-default
+    ``io_profile`` reads the tile's byte span with large aligned requests
+    and/or ``fadvise`` hints instead.
+    """
+    selection = selection or LifReadSelection()
+    dims = list(lif_image.dims)
+    sizes = dict(lif_image.sizes)
+    shape_5d = selection.shape_5d(sizes)
+    selected = dict(zip(("T", "C", "Z"), selection.indices(sizes), strict=True))
+    frames = lif_image.frames
+
+    if selection.is_decimated():
+        if out is None:
+            out = np.empty(shape_5d, dtype=lif_image.dtype)
+        return _read_decimated(lif_image, m, selection, _as_5d(out, shape_5d))
+
+    if tuple(frames.frame_dims) != ("Y", "X"):
+        # Unusual frame layouts (RGB samples, stride-aligned rows, ...): read
+        # in native order into a pooled staging buffer, then reorder.
+        if "M" in dims or not selection.is_full():
+            # frames-API output order: unspecified dims (original order) +
+            # specified dims (in order given) + frame dims. M is a fixed
+            # index, so its singleton axis is squeezed afterwards.
+            frame_selection: dict[str, Any] = {
+                d: selected[d] for d in ("T", "C", "Z") if d in dims
+            }
+            if "M" in dims:
+                frame_selection["M"] = m
+            native = frames(**frame_selection)
+            staging = _staging_pool.get(native.shape, native.dtype)
+            arr = native.asarray(out=staging)
+            frame_dims = list(native.frame_dims)
+            dims = [d for d in dims if d not in frame_selection]
+            dims = [d for d in dims if d not in frame_dims]
+            dims += list(frame_selection) + frame_dims
+            if "M" in dims:
+                arr = np.squeeze(arr, axis=dims.index("M"))
+                dims.remove("M")
         else:
-            arr = lif_image.asarray()
-    return _to_canonical_shape(arr, tuple(dims))
+            staging = _staging_pool.get(lif_image.shape, lif_image.dtype)
+            arr = lif_image.asarray(out=staging)
+        if out is None:
+            out = np.empty(shape_5d, dtype=arr.dtype)
+        return _to_canonical_shape(arr, tuple(dims), out=out)
+
+    if out is None:
+        out = np.empty(shape_5d, dtype=lif_image.dtype)
+    out_5d = _as_5d(out, shape_5d)
+
+    if io_profile is not None and not io_profile.is_default():
+        result = _read_profiled(lif_image, m, selection, out_5d, io_profile)
+        if result is not None:
+            return result
+
+    native_order = [d for d in _CANONICAL if d in dims]
+    if (
+        dims == native_order
+        and selection.is_full()
+        and out_5d.flags.c_contiguous
+        and not lif_image.memory_block.frames
+    ):
+        # Stored order is already canonical: one sequential read of the whole
+        # memory block straight into the destination.
+        lif_image.asarray(out=out_5d.reshape(lif_image.shape))
+        return _squeeze_t(out_5d)
+
+    # Read every selected Y/X frame directly into its canonical destination
+    # plane; unselected planes are never touched on disk.
+    present = [d for d in ("T", "C", "Z") if d in dims]
+    fixed = {"M": m} if "M" in dims else {}
+    for dst, src in zip(
+        itertools.product(*(range(n) for n in shape_5d[:3])),
+        itertools.product(*selected.values()),
+        strict=True,
+    ):
+        indices = dict(zip(("T", "C", "Z"), src, strict=True))
+        indices = {d: indices[d] for d in present}
+        lif_image.frame(out=out_5d[dst], **indices, **fixed)
+    return _squeeze_t(out_5d)
+
+
+class _LifFileCache(threading.local):
+    """Per-thread LRU cache of open ``LifFile`` handles.
+
+    Disabled by default: a Fractal compute task converts one image per
+    process, where re-opening costs ~3% of wall time. Long-lived workers that
+    convert many images from the same files (``LifLocalRunner``) enable it
+    with ``enable_lif_file_cache``. Handles are per thread because
+    ``LifFile`` is not thread-safe, and are re-opened when the file's size or
+    mtime changes.
+    """
+
+    max_size = 0
+
+    def __init__(self) -> None:
+        self.files: OrderedDict[str, tuple[tuple[int, int], Any]] = OrderedDict()
+
+    def get(self, file_path: str) -> Any:
+        stat = os.stat(file_path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self.files.pop(file_path, None)
+        if cached is not None and cached[0] == key:
+            self.files[file_path] = cached
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        lif_file = liffile.LifFile(file_path, squeeze=False)
+        self.files[file_path] = (key, lif_file)
+        while len(self.files) > self.max_size:
+            _, (_, evicted) = self.files.popitem(last=False)
+            evicted.close()
+        return lif_file
+
+
+_lif_file_cache = _LifFileCache()
+
+
+def enable_lif_file_cache(max_size: int = 4) -> None:
+    """Keep up to ``max_size`` ``LifFile`` handles open per thread."""
+    _LifFileCache.max_size = max_size
+
+
+@contextmanager
+def _open_lif_file(file_path: str) -> Iterator[Any]:
+    source = open_lif_source(file_path)
+    if _LifFileCache.max_size > 0 and isinstance(source, str):
+        # Keyed on the local path, so ``file://`` URLs share the handle.
+        yield _lif_file_cache.get(source)
+        return
+    try:
+        with liffile.LifFile(source, squeeze=False) as lf:
+            yield lf
+    finally:
+        if not isinstance(source, str):
+            source.close()
+
+
+def _load_lif_array(
+    file_path: str,
+    image_id: int,
+    m: int,
+    selection: LifReadSelection | None = None,
+    out: np.ndarray | None = None,
+    io_profile: LifIOProfile | None = None,
+) -> np.ndarray:
+    with _open_lif_file(file_path) as lf:
+        return _read_lif_image(
+            lf.images[image_id],
+            m,
+            selection=selection,
+            out=out,
+            io_profile=io_profile,
+        )
 
 
 def _peek_lif_dtype(file_path: str, image_id: int, m: int) -> str:
-    with liffile.LifFile(file_path, squeeze=False) as lf:
+    with _open_lif_file(file_path) as lf:
         return str(lf.images[image_id].dtype)
 
 
+def find_empty_tiles(loaders: Sequence["LifMosaicLoader"]) -> list[bool]:
+    """Classify each loader's tile with its ``empty_check``.
+
+    Loaders without ``empty_check`` are never empty. Each file is opened once.
+    """
+    empty = [False] * len(loaders)
+    by_file: dict[str, list[int]] = {}
+    for idx, loader in enumerate(loaders):
+        if loader.empty_check is not None:
+            by_file.setdefault(loader.file_path, []).append(idx)
+    for file_path, indices in by_file.items():
+        with _open_lif_file(file_path) as lf:
+            for idx in indices:
+                loader = loaders[idx]
+                empty[idx] = _is_empty_tile(
+                    lf.images[loader.image_id],
+                    loader.m,
+                    loader.selection,
+                    loader.empty_check,
+                )
+    return empty
+
+
 class LifMosaicLoader(ImageLoaderInterface):
     """Loader for a single mosaic position within a LIF image."""
 
     file_path: str
     image_id: int
     m: int
+    selection: LifReadSelection = Field(default_factory=LifReadSelection)
+    io_profile: LifIOProfile | None = None
+    empty_check: LifEmptyTileCheck | None = None
+    _stats: ChannelStatsAccumulator | None = PrivateAttr(default=None)
+    _reads: "CoalescedReads | None" = PrivateAttr(default=None)
+
+    def record_stats(self, stats: ChannelStatsAccumulator | None) -> None:
+        """Feed every array returned by ``load_data`` into ``stats``."""
+        self._stats = stats
+
+    def read_through(self, reads: "CoalescedReads | None") -> None:
+        """Load the data from the coalesced reads planned by ``reads``."""
+        self._reads = reads
 
-    def load_data(self, resource: Any = None) -> np.ndarray:
-        """Load the mosaic-position image data as a NumPy array."""
-        return _load_lif_array(self.file_path, self.image_id, self.m)
+    def load_data(
+        self, resource: Any = None, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Load the mosaic-position image data as a NumPy array.
+
+        The result is C-contiguous in ``(T?, C, Z, Y, X)`` order. When ``out``
+        is given, frames are read directly into it and it is returned. Only
+        the channels and Z/T planes in ``selection`` are read.
+        """
+        if self._reads is not None:
+            data = self._reads.load(self, out=out)
+        else:
+            data = _load_lif_array(
+                self.file_path,
+                self.image_id,
+                self.m,
+                selection=self.selection,
+                out=out,
+                io_profile=self.io_profile,
+            )
+        if self._stats is not None:
+            self._stats.update(data)
+        return data
 
     def find_data_type(self, resource: Any = None) -> str:
         """Find the dtype of the image data without loading the full stack."""
@@ -1,7 +1,136 @@
-"""LIF-specific acquisition options."""
+"""LIF-specific acquisition and conversion options."""
 
-from ome_zarr_converters_tools import AcquisitionOptions
-from pydantic import Field
+import os
+from typing import Any, Literal
+
+from ome_zarr_converters_tools import (
+    AcquisitionDetails,
+    AcquisitionOptions,
+    ChannelInfo,
+)
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from fractal_lif_converters.common._loaders import (
+    LifEmptyTileCheck,
+    LifIOProfile,
+    LifReadSelection,
+)
+
+ProjectionMode = Literal["max", "mean", "sum"]
+"""Reduction of the Z stack written as a projection image."""
+
+
+class IndexRange(BaseModel):
+    """Half-open index range ``[start, stop)`` along one image axis."""
+
+    start: int = Field(default=0, ge=0, title="Start")
+    """
+    First index to keep (inclusive, zero-based).
+    """
+    stop: int | None = Field(default=None, ge=1, title="Stop")
+    """
+    Index after the last one to keep (exclusive). ``None`` keeps all indices
+    up to the end of the axis.
+    """
+
+    def resolve(self, size: int, dim: str) -> tuple[int, int] | None:
+        """Clamp the range to an axis of ``size``; ``None`` if it is the full axis.
+
+        Raises:
+            ValueError: If the range selects no index.
+        """
+        stop = size if self.stop is None else min(self.stop, size)
+        if self.start >= stop:
+            raise ValueError(
+                f"{dim} range [{self.start}, {self.stop}) selects no planes "
+                f"of an image with {dim} size {size}."
+            )
+        if self.start == 0 and stop == size:
+            return None
+        return self.start, stop
+
+
+class LifPreviewOptions(BaseModel):
+    """Decimated quick-look conversion, e.g. for QC of whole plates.
+
+    Only the kept rows, planes and timepoints are read from the LIF file;
+    pixel sizes and time spacing are scaled to match.
+    """
+
+    xy_step: int = Field(default=4, ge=1, title="XY Step")
+    """
+    Keep every k-th pixel along Y and X.
+    """
+    z_mode: Literal["middle", "max"] = Field(default="middle", title="Z Mode")
+    """
+    ``middle`` keeps only the central plane of the (selected) Z stack; ``max``
+    max-projects all selected planes.
+    """
+    t_step: int = Field(default=1, ge=1, title="T Step")
+    """
+    Keep every k-th (selected) timepoint.
+    """
+
+
+class LifSpatialRoi(BaseModel):
+    """Rectangular region of a scan, in micrometres.
+
+    Coordinates are in the frame of the LIF tile (stage) positions, before
+    any stage-orientation correction, so they can be read off the
+    ``FOV_ROI_table`` of a full conversion with identity corrections.
+    """
+
+    x: float = Field(title="X")
+    """
+    Left edge of the region.
+    """
+    y: float = Field(title="Y")
+    """
+    Top edge of the region.
+    """
+    width: float = Field(gt=0, title="Width")
+    """
+    Extent of the region along X.
+    """
+    height: float = Field(gt=0, title="Height")
+    """
+    Extent of the region along Y.
+    """
+
+
+class LifGridSnapping(BaseModel):
+    """Snap mosaic tile positions to the regular grid they were acquired on.
+
+    The row/column lattice and its step are inferred from all stage
+    positions of the mosaic, and every tile is placed at its lattice node,
+    rounded to whole pixels. Stage jitter then no longer yields fractional
+    tile offsets.
+    """
+
+    max_residual: float = Field(default=10.0, gt=0, title="Max Residual")
+    """
+    Largest distance, in pixels, between a stage position and its grid
+    placement. Mosaics further off a regular grid keep their stage positions.
+    """
+
+
+class LifAxisSharding(BaseModel):
+    """Split one deep image along T or Z over several compute tasks.
+
+    Each task reads only the timepoints (or planes) of its range and writes
+    them as a disjoint slab of the same output image. Ranges are rounded up
+    to whole chunks along the axis, so no two tasks write the same chunk.
+    """
+
+    axis: Literal["t", "z"] = Field(default="t", title="Axis")
+    """
+    Axis to split the image along.
+    """
+    size: int = Field(ge=1, title="Size")
+    """
+    Timepoints (or Z planes) converted per compute task, rounded up to a
+    multiple of the chunk size along ``axis``.
+    """
 
 
 class LifAcquisitionOptions(AcquisitionOptions):
@@ -12,3 +141,198 @@ class LifAcquisitionOptions(AcquisitionOptions):
     Scale factor (m/px) overriding ``lif_image.scale_n[10]``. Set when stage
     coordinates need a non-default unit conversion.
     """
+    channel_indices: list[int] | None = Field(default=None, title="Channel Indices")
+    """
+    Zero-based indices of the channels to convert, in output order. Unselected
+    channels are never read from disk. ``None`` converts all channels.
+    """
+    z_range: IndexRange | None = Field(default=None, title="Z Range")
+    """
+    Z planes to convert. Planes outside the range are never read from disk.
+    ``None`` converts the full stack.
+    """
+    t_range: IndexRange | None = Field(default=None, title="T Range")
+    """
+    Timepoints to convert. Timepoints outside the range are never read from
+    disk. ``None`` converts all timepoints.
+    """
+    roi: LifSpatialRoi | None = Field(default=None, title="ROI")
+    """
+    Only convert this region. Mosaic tiles outside it are dropped and
+    boundary tiles are cropped, so only the region is read from disk.
+    ``None`` converts the whole scan.
+    """
+    grid: LifGridSnapping | None = Field(default=None, title="Grid Snapping")
+    """
+    Snap the tiles of regular mosaics to integer pixel positions on their
+    inferred grid. ``None`` places tiles at their stage positions.
+    """
+    io_profile: LifIOProfile | None = Field(default=None, title="I/O Profile")
+    """
+    Block size, readahead and ``fadvise`` hints used when reading tiles, for
+    network filesystems. ``None`` leaves reads to ``liffile``.
+    """
+    skip_empty: LifEmptyTileCheck | None = Field(default=None, title="Skip Empty Tiles")
+    """
+    Sample every tile before it is read and skip the ones classified as
+    empty, leaving their region at the fill value. ``None`` writes every
+    tile.
+    """
+    sharding: LifAxisSharding | None = Field(default=None, title="Sharding")
+    """
+    Convert each image longer than one shard along T (or Z) with several
+    compute tasks. ``None`` converts each image with a single task.
+    """
+    projections: list[ProjectionMode] | None = Field(default=None, title="Projections")
+    """
+    Also write the maximum, mean or sum over Z of each image as an image of
+    its own, next to it in its well or collection, from the planes read for
+    the conversion. ``None`` writes no projection.
+    """
+
+    @field_validator("channel_indices")
+    @classmethod
+    def _check_channel_indices(cls, value: list[int] | None) -> list[int] | None:
+        if value is not None and len(set(value)) != len(value):
+            raise ValueError(f"Duplicate channel indices in {value}.")
+        return value
+
+    @model_validator(mode="after")
+    def _check_projections(self) -> "LifAcquisitionOptions":
+        if self.projections and self.sharding is not None:
+            raise ValueError("'projections' cannot be combined with 'sharding'.")
+        return self
+
+    def update_acquisition_details(
+        self, acquisition_details: AcquisitionDetails
+    ) -> AcquisitionDetails:
+        """Update the details with these options.
+
+        Without explicit ``channels``, the channels kept by ``channel_indices``
+        are labelled by their index in the LIF image, e.g. ``channel_2``.
+        """
+        details = super().update_acquisition_details(acquisition_details)
+        if details.channels is None and self.channel_indices is not None:
+            details.channels = [
+                ChannelInfo(channel_label=f"channel_{c}") for c in self.channel_indices
+            ]
+        return details
+
+    def read_selection(
+        self, sizes: dict[str, Any], preview: LifPreviewOptions | None = None
+    ) -> LifReadSelection:
+        """Resolve the channel/Z/T selection against a LIF image's sizes.
+
+        When ``preview`` is given, its decimation is applied on top of the
+        channel/Z/T selection.
+
+        Raises:
+            ValueError: If a channel index or range falls outside the image.
+        """
+        channels = None
+        if self.channel_indices is not None:
+            size_c = sizes.get("C", 1)
+            invalid = [c for c in self.channel_indices if not 0 <= c < size_c]
+            if invalid or not self.channel_indices:
+                raise ValueError(
+                    f"Invalid channel indices {self.channel_indices} for an "
+                    f"image with {size_c} channel(s)."
+                )
+            if self.channel_indices != list(range(size_c)):
+                channels = list(self.channel_indices)
+        z_range = None
+        if self.z_range is not None:
+            z_range = self.z_range.resolve(sizes.get("Z", 1), "Z")
+        t_range = None
+        if self.t_range is not None:
+            t_range = self.t_range.resolve(sizes.get("T", 1), "T")
+        selection = LifReadSelection(
+            channels=channels, z_range=z_range, t_range=t_range
+        )
+        if preview is None:
+            return selection
+
+        z_start, z_stop = z_range or (0, sizes.get("Z", 1))
+        if preview.z_mode == "middle":
+            z_mid = z_start + (z_stop - z_start) // 2
+            selection.z_range = (z_mid, z_mid + 1)
+        elif z_stop - z_start > 1:
+            selection.z_projection = "max"
+        selection.xy_step = preview.xy_step
+        selection.t_step = preview.t_step
+        return selection
+
+
+class LifCatalogSelection(BaseModel):
+    """Select acquisitions from a LIF catalog instead of listing them.
+
+    The catalog is a Parquet dataset written by
+    ``fractal_lif_converters.catalog.build_lif_catalog``; selecting from it
+    does not open any LIF file. Every (file, scan) pair with at least one
+    matching image becomes one acquisition.
+    """
+
+    catalog_dir: str = Field(title="Catalog Directory")
+    """
+    Directory of the Parquet catalog dataset.
+    """
+    where: str | None = Field(default=None, title="Where")
+    """
+    SQL ``WHERE`` condition on the catalog columns, e.g.
+    ``tile_count > 100 AND size_c = 3 AND size_z > 50``. ``None`` selects
+    every image of the catalog.
+    """
+    advanced: LifAcquisitionOptions = Field(
+        default_factory=LifAcquisitionOptions, title="Advanced"
+    )
+    """
+    Advanced acquisition options applied to every selected acquisition.
+    """
+
+
+class LifPipelineOptions(BaseModel):
+    """Process counts and memory bound of the pipelined compute mode."""
+
+    readers: int = Field(default=2, ge=1, title="Readers")
+    """
+    Processes loading tiles from the LIF file.
+    """
+    writers: int = Field(default=2, ge=1, title="Writers")
+    """
+    Processes encoding and writing tiles to the OME-Zarr image.
+    """
+    slots: int | None = Field(default=None, ge=1, title="Slots")
+    """
+    Shared-memory tile buffers (default: ``readers + writers``). Memory in
+    flight is bounded by ``slots`` times the largest tile.
+    """
+
+    def num_slots(self) -> int:
+        """The number of shared-memory slots to allocate."""
+        return self.slots or self.readers + self.writers
+
+
+_default_pipeline_options: LifPipelineOptions | None = None
+
+
+def enable_pipelined_writes(options: LifPipelineOptions | None) -> None:
+    """Use the pipelined mode for every image converted by this process."""
+    global _default_pipeline_options
+    _default_pipeline_options = options
+
+
+def default_pipeline_options() -> LifPipelineOptions | None:
+    """The process-wide pipeline options, falling back to the environment."""
+    if _default_pipeline_options is not None:
+        return _default_pipeline_options
+    readers = os.environ.get("FRACTAL_LIF_PIPELINE_READERS")
+    writers = os.environ.get("FRACTAL_LIF_PIPELINE_WRITERS")
+    if readers is None and writers is None:
+        return None
+    options = LifPipelineOptions()
+    return options.model_copy(
+        update={
+            "readers": int(readers or options.readers),
+            "writers": int(writers or options.writers),
+        }
+    )
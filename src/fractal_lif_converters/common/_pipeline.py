@@ -0,0 +1,235 @@
+"""Pipelined tile conversion: reader and writer processes over shared memory.
+
+With compression enabled, encoding chunks is CPU-bound while reading LIF
+tiles is I/O-bound. In the pipelined mode reader processes load tiles with
+``LifMosaicLoader`` straight into slots of one ``SharedMemory`` segment, and
+writer processes encode and write them from the same slots, so tile data is
+never pickled. The number of slots bounds the memory in flight.
+
+Tiles sharing a zarr chunk are written in tile order (a chunk write is a
+read-modify-write, and overlapping tiles must land in the same order as a
+sequential conversion); other tiles are written as soon as they are loaded.
+Channel statistics are accumulated by the coordinating process from the
+loaded slots.
+
+The pools are created on first use and reused by later images of the same
+process. Enable the mode with ``enable_pipelined_writes`` (in ``_options``,
+so that compute tasks import this module only when the mode is on), through
+``LifLocalRunner(pipeline=...)``, or with the ``FRACTAL_LIF_PIPELINE_READERS``
+and ``FRACTAL_LIF_PIPELINE_WRITERS`` environment variables.
+"""
+
+import itertools
+import logging
+import multiprocessing
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+from ngio import Image, Roi, open_ome_zarr_container
+from ome_zarr_converters_tools import TiledImage
+
+from fractal_lif_converters.common._channel_stats import ChannelStatsAccumulator
+from fractal_lif_converters.common._loaders import (
+    LifMosaicLoader,
+    enable_lif_file_cache,
+)
+from fractal_lif_converters.common._options import LifPipelineOptions
+
+logger = logging.getLogger(__name__)
+
+
+# --- Worker processes --------------------------------------------------------
+
+_segment: shared_memory.SharedMemory | None = None
+_images: dict[str, Image] = {}
+
+
+def _attach(name: str) -> memoryview:
+    """Attach to the shared-memory segment ``name``, reusing the last one."""
+    global _segment
+    if _segment is None or _segment.name != name:
+        if _segment is not None:
+            _segment.close()
+        # Spawned workers share the parent's resource tracker, where
+        # registering the segment again is a no-op; only the parent unlinks it.
+        _segment = shared_memory.SharedMemory(name=name)
+    assert _segment.buf is not None
+    return _segment.buf
+
+
+def _slot_array(
+    name: str, offset: int, shape: tuple[int, ...], dtype: str
+) -> np.ndarray:
+    buffer = _attach(name)
+    return np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+
+
+def _read_tile(
+    loader: LifMosaicLoader,
+    name: str,
+    offset: int,
+    shape: tuple[int, ...],
+    dtype: str,
+) -> None:
+    loader.load_data(out=_slot_array(name, offset, shape, dtype))
+
+
+def _write_tile(
+    zarr_url: str,
+    roi: Roi,
+    name: str,
+    offset: int,
+    shape: tuple[int, ...],
+    dtype: str,
+) -> None:
+    image = _images.get(zarr_url)
+    if image is None:
+        _images.clear()
+        image = open_ome_zarr_container(zarr_url).get_image()
+        _images[zarr_url] = image
+    image.set_roi(roi=roi, patch=_slot_array(name, offset, shape, dtype))
+
+
+# --- Coordinator ---------------------------------------------------------------
+
+_pools: dict[str, tuple[LifPipelineOptions, ProcessPoolExecutor]] = {}
+
+
+def _pool(kind: str, options: LifPipelineOptions, **kwargs: Any) -> ProcessPoolExecutor:
+    """Return the reused ``kind`` pool, re-created when ``options`` change."""
+    cached = _pools.get(kind)
+    if cached is not None and cached[0] == options:
+        return cached[1]
+    if cached is not None:
+        cached[1].shutdown()
+    # Spawned, not forked: the parent already runs zarr's threads.
+    executor = ProcessPoolExecutor(
+        max_workers=getattr(options, kind),
+        mp_context=multiprocessing.get_context("spawn"),
+        **kwargs,
+    )
+    _pools[kind] = (options, executor)
+    return executor
+
+
+def _patch_shape(roi: Roi, image: Image) -> tuple[int, ...]:
+    """Shape of the patch ``set_roi`` expects for a pixel-space ``roi``."""
+    lengths = {s.axis_name: s.length for s in roi.slices}
+    return tuple(
+        int(lengths.get(axis, size) or size)
+        for axis, size in zip(image.axes, image.shape, strict=True)
+    )
+
+
+def _chunk_keys(roi: Roi, image: Image) -> list[tuple[int, ...]]:
+    """Level-0 chunks touched by a pixel-space ``roi``."""
+    slices = {s.axis_name: s for s in roi.slices}
+    ranges = []
+    for axis, size, chunk in zip(image.axes, image.shape, image.chunks, strict=True):
+        roi_slice = slices.get(axis)
+        start = int(roi_slice.start or 0) if roi_slice is not None else 0
+        stop = start + int(roi_slice.length or size) if roi_slice else size
+        stop = max(min(stop, size), start + 1)
+        ranges.append(range(start // chunk, (stop - 1) // chunk + 1))
+    return list(itertools.product(*ranges))
+
+
+def write_pipelined(
+    *,
+    zarr_url: str,
+    image: Image,
+    tiled_image: TiledImage,
+    todo: list[int],
+    options: LifPipelineOptions,
+    stats: ChannelStatsAccumulator | None,
+    on_written: Callable[[int], None] | None = None,
+) -> None:
+    """Write the regions ``todo`` of ``tiled_image`` with reader/writer pools.
+
+    Args:
+        zarr_url: URL of the OME-Zarr image the writers open.
+        image: The (already created) level-0 image.
+        tiled_image: Registered ``TiledImage`` in pixel coordinates.
+        todo: Indices of the regions to write, in write order.
+        options: Process counts and slot bound.
+        stats: Accumulator fed with every loaded tile.
+        on_written: Called with each region index once it is written.
+    """
+    if not todo:
+        return
+    regions = tiled_image.regions
+    dtype = str(np.dtype(tiled_image.data_type))
+    shapes = {idx: _patch_shape(regions[idx].roi, image) for idx in todo}
+    slot_bytes = (
+        max(int(np.prod(s)) for s in shapes.values()) * np.dtype(dtype).itemsize
+    )
+    num_slots = min(options.num_slots(), len(todo))
+
+    # Each tile waits for the previous tile writing to any of its chunks.
+    last_writer: dict[tuple[int, ...], int] = {}
+    deps: dict[int, set[int]] = {}
+    for idx in todo:
+        keys = _chunk_keys(regions[idx].roi, image)
+        deps[idx] = {last_writer[k] for k in keys if k in last_writer}
+        last_writer.update(dict.fromkeys(keys, idx))
+
+    readers = _pool("readers", options, initializer=enable_lif_file_cache)
+    writers = _pool("writers", options)
+    segment = shared_memory.SharedMemory(create=True, size=num_slots * slot_bytes)
+    logger.info(
+        f"Writing {len(todo)} tiles with {options.readers} reader(s), "
+        f"{options.writers} writer(s) and {num_slots} slot(s) of "
+        f"{slot_bytes / 1024**2:.1f} MiB."
+    )
+    free = deque(range(num_slots))
+    pending = deque(todo)
+    slot_of: dict[int, int] = {}
+    loaded: list[int] = []
+    written: set[int] = set()
+    reads: dict[Future, int] = {}
+    writes: dict[Future, int] = {}
+
+    def _args(idx: int) -> tuple:
+        return segment.name, slot_of[idx] * slot_bytes, shapes[idx], dtype
+
+    try:
+        while pending or reads or writes or loaded:
+            while pending and free:
+                idx = pending.popleft()
+                slot_of[idx] = free.popleft()
+                loader = regions[idx].image_loader
+                reads[readers.submit(_read_tile, loader, *_args(idx))] = idx
+            for idx in [i for i in loaded if deps[i] <= written]:
+                loaded.remove(idx)
+                roi = regions[idx].roi
+                writes[writers.submit(_write_tile, zarr_url, roi, *_args(idx))] = idx
+            done, _ = wait([*reads, *writes], return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+                if future in reads:
+                    idx = reads.pop(future)
+                    if stats is not None:
+                        _, offset, shape, _ = _args(idx)
+                        stats.update(
+                            np.ndarray(shape, dtype, buffer=segment.buf, offset=offset)
+                        )
+                    loaded.append(idx)
+                else:
+                    idx = writes.pop(future)
+                    written.add(idx)
+                    free.append(slot_of.pop(idx))
+                    if on_written is not None:
+                        on_written(idx)
+    except BaseException:
+        for future in itertools.chain(reads, writes):
+            future.cancel()
+        # Let running jobs finish before the segment goes away.
+        wait([*reads, *writes])
+        raise
+    finally:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,254 @@
+"""Dry-run planning: estimate the cost of a conversion without writing it.
+
+``plan_conversion`` runs on the ``TiledImage`` objects produced by the init
+tasks (discovery and tile building only) and estimates, per compute task,
+the bytes read from the LIF files, the bytes written to OME-Zarr (including
+Z projections), the peak memory and the wall time; sharded images are
+planned as one task per shard, as the init tasks emit them. The wall time is
+derived from a read throughput measured on a few tiles of the plan itself
+(``calibrate_read_throughput``), so it reflects the local storage; it
+assumes conversions are read-bound.
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+import numpy as np
+from ome_zarr_converters_tools import ConverterOptions, TiledImage
+from pydantic import BaseModel
+
+from fractal_lif_converters.common._compute import split_into_shards
+from fractal_lif_converters.common._init_args import LifAxisShard
+from fractal_lif_converters.common._loaders import LifMosaicLoader, _open_lif_file
+from fractal_lif_converters.common._options import LifAxisSharding, ProjectionMode
+from fractal_lif_converters.common._projections import projection_dtype
+from fractal_lif_converters.common._runner import estimate_task_memory
+from fractal_lif_converters.common._sharding import restrict_to_shard
+from fractal_lif_converters.common._tile_builders import _shape_5d
+
+logger = logging.getLogger(__name__)
+
+# XY downsampling factor between two pyramid levels.
+_PYRAMID_XY_FACTOR = 2
+
+
+class LifImagePlan(BaseModel):
+    """Cost estimate of one compute task (one output image, or one shard)."""
+
+    path: str
+    """Path of the image below ``zarr_dir``."""
+    shard: LifAxisShard | None = None
+    """Range of the image converted by the task, for sharded images."""
+    num_tiles: int
+    shape: tuple[int, ...]
+    dtype: str
+    bytes_read: int
+    """Bytes read from the LIF file(s)."""
+    bytes_written: int
+    """Uncompressed bytes of all pyramid levels, Z projections included (an
+    upper bound when compression is enabled)."""
+    peak_memory: int
+    """Estimated peak memory of the task, see ``estimate_task_memory``."""
+    seconds: float
+    """Estimated wall time at the calibrated read throughput."""
+
+
+class LifConversionPlan(BaseModel):
+    """Cost estimate of a whole conversion; nothing has been written."""
+
+    images: list[LifImagePlan]
+    read_throughput: float
+    """Read throughput (bytes/s) the wall-time estimates are based on."""
+
+    @property
+    def num_tasks(self) -> int:
+        """Number of compute tasks the conversion produces."""
+        return len(self.images)
+
+    @property
+    def bytes_read(self) -> int:
+        """Total bytes read from the LIF files."""
+        return sum(image.bytes_read for image in self.images)
+
+    @property
+    def bytes_written(self) -> int:
+        """Total uncompressed bytes written."""
+        return sum(image.bytes_written for image in self.images)
+
+    @property
+    def peak_memory(self) -> int:
+        """Largest per-task peak memory."""
+        return max((image.peak_memory for image in self.images), default=0)
+
+    @property
+    def seconds(self) -> float:
+        """Estimated wall time when the tasks run one after the other."""
+        return sum(image.seconds for image in self.images)
+
+    def summary(self) -> str:
+        """Human-readable report of the plan."""
+        gib = 1024**3
+        lines = [
+            f"{self.num_tasks} compute task(s), "
+            f"{sum(image.num_tiles for image in self.images)} tile(s)",
+            f"read {self.bytes_read / gib:.2f} GiB, "
+            f"write up to {self.bytes_written / gib:.2f} GiB (uncompressed)",
+            f"peak memory per task up to {self.peak_memory / 1024**2:.0f} MiB",
+            f"wall time ~{self.seconds:.0f} s sequential at "
+            f"{self.read_throughput / 1024**2:.1f} MiB/s",
+        ]
+        return "\n".join(lines)
+
+
+def _tile_bytes(tiled_image: TiledImage) -> list[int]:
+    """Bytes read from disk for each region of ``tiled_image``.
+
+    Planes are read whole, except for decimated or cropped selections, which
+    read only the kept rows (full-width, as pages or frames are).
+    """
+    by_file: dict[str, list[tuple[int, LifMosaicLoader]]] = defaultdict(list)
+    sizes = [0] * len(tiled_image.regions)
+    for idx, region in enumerate(tiled_image.regions):
+        loader = region.image_loader
+        if not isinstance(loader, LifMosaicLoader):
+            raise TypeError(f"Cannot plan a region loaded by {type(loader)}.")
+        by_file[loader.file_path].append((idx, loader))
+    for file_path, loaders in by_file.items():
+        with _open_lif_file(file_path) as lif_file:
+            for idx, loader in loaders:
+                lif_image = lif_file.images[loader.image_id]
+                selection = loader.selection
+                image_sizes = dict(lif_image.sizes)
+                t_idx, c_idx, z_idx = selection.indices(image_sizes)
+                _, _, _, shape_y, shape_x = _shape_5d(lif_image, selection)
+                if selection.is_decimated():
+                    shape_x = image_sizes.get("X", 1)
+                planes = len(t_idx) * len(c_idx) * len(z_idx)
+                sizes[idx] = planes * shape_y * shape_x * lif_image.dtype.itemsize
+    return sizes
+
+
+def calibrate_read_throughput(
+    tiled_images: list[TiledImage], max_tiles: int = 4
+) -> float:
+    """Measure the read throughput (bytes/s) on the first tiles of a plan.
+
+    Raises:
+        ValueError: If there is no tile to read.
+    """
+    loaders = [
+        region.image_loader
+        for tiled_image in tiled_images
+        for region in tiled_image.regions
+    ][:max_tiles]
+    if not loaders:
+        raise ValueError("Cannot calibrate the read throughput without tiles.")
+    nbytes = 0
+    start = time.perf_counter()
+    for loader in loaders:
+        nbytes += loader.load_data().nbytes
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    throughput = nbytes / elapsed
+    logger.info(
+        f"Calibrated read throughput: {throughput / 1024**2:.1f} MiB/s "
+        f"over {len(loaders)} tile(s)."
+    )
+    return throughput
+
+
+def _projection_bytes(
+    tiled_image: TiledImage, image_bytes: int, modes: list[ProjectionMode]
+) -> int:
+    """Uncompressed bytes of level 0 of the Z projections of an image."""
+    if not modes or "z" not in tiled_image.axes:
+        return 0
+    dtype = np.dtype(tiled_image.data_type)
+    plane_bytes = image_bytes // tiled_image.shape()[tiled_image.axes.index("z")]
+    return sum(
+        plane_bytes * projection_dtype(mode, dtype).itemsize // dtype.itemsize
+        for mode in modes
+    )
+
+
+def plan_conversion(
+    tiled_images: list[TiledImage],
+    converter_options: ConverterOptions,
+    read_throughput: float | None = None,
+    shardings: dict[str, LifAxisSharding] | None = None,
+    projections: dict[str, list[ProjectionMode]] | None = None,
+) -> LifConversionPlan:
+    """Estimate the cost of converting ``tiled_images``.
+
+    Args:
+        tiled_images: Images as returned by the init-task parsing.
+        converter_options: Converter options of the conversion.
+        read_throughput: Read throughput in bytes/s; measured with
+            ``calibrate_read_throughput`` when ``None``.
+        shardings: Sharding options by image path; each shard of a sharded
+            image is planned as a task of its own.
+        projections: Z projections written with each image, by image path.
+    """
+    if read_throughput is None:
+        read_throughput = (
+            calibrate_read_throughput(tiled_images) if tiled_images else 1.0
+        )
+    shardings = shardings or {}
+    projections = projections or {}
+    num_levels = converter_options.omezarr_options.num_levels
+    pyramid = sum(_PYRAMID_XY_FACTOR ** (-2 * level) for level in range(num_levels))
+    images = []
+    for tiled_image in tiled_images:
+        peak, image_bytes = estimate_task_memory(
+            tiled_image, converter_options.writer_mode
+        )
+        dtype = str(np.dtype(tiled_image.data_type))
+        sharding = shardings.get(tiled_image.path)
+        shards: list[LifAxisShard] = []
+        if sharding is not None:
+            registered, shards = split_into_shards(
+                tiled_image, converter_options, sharding
+            )
+        for shard in shards:
+            # Shards are streamed like whole images: same peak, less data.
+            axis = registered.axes.index(shard.axis)
+            extent = registered.shape()[axis]
+            shard_image = registered.model_copy(deep=True)
+            restrict_to_shard(shard_image, shard)
+            bytes_read = sum(_tile_bytes(shard_image))
+            images.append(
+                LifImagePlan(
+                    path=tiled_image.path,
+                    shard=shard,
+                    num_tiles=len(shard_image.regions),
+                    shape=tuple(
+                        shard.stop - shard.start if i == axis else size
+                        for i, size in enumerate(registered.shape())
+                    ),
+                    dtype=dtype,
+                    bytes_read=bytes_read,
+                    bytes_written=int(
+                        image_bytes * (shard.stop - shard.start) / extent * pyramid
+                    ),
+                    peak_memory=peak,
+                    seconds=bytes_read / read_throughput,
+                )
+            )
+        if shards:
+            continue
+        bytes_read = sum(_tile_bytes(tiled_image))
+        modes = projections.get(tiled_image.path, [])
+        bytes_written = image_bytes + _projection_bytes(tiled_image, image_bytes, modes)
+        images.append(
+            LifImagePlan(
+                path=tiled_image.path,
+                num_tiles=len(tiled_image.regions),
+                shape=tuple(tiled_image.shape()),
+                dtype=dtype,
+                bytes_read=bytes_read,
+                bytes_written=int(bytes_written * pyramid),
+                peak_memory=peak,
+                seconds=bytes_read / read_throughput,
+            )
+        )
+    return LifConversionPlan(images=images, read_throughput=read_throughput)
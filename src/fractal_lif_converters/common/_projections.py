@@ -0,0 +1,237 @@
+"""Z projections written next to the converted image, without another read.
+
+With ``LifAcquisitionOptions.projections``, the compute task also writes the
+maximum, mean or sum over Z of an image as images of their own: next to it in
+its well (``0`` -> ``0max``, as well paths must be alphanumeric) or in its
+collection (``image.zarr`` -> ``image_max.zarr``). The init task registers
+them in the wells and passes the modes on in ``LifConvertInitArgs.projections``;
+the mode of each is recorded in the ``projection`` attribute of its image list
+entry.
+
+Every tile, FOV group or whole image written spans the whole Z stack, so its
+projection is final where it is written; writing the projections in the same
+order as level 0 resolves tile overlaps the same way. Their pyramids are
+streamed like that of the image (see ``_pyramid``). When level 0 is not
+written patch by patch (pipelined and Dask writer modes, resumed
+conversions), the projections are computed from the written image instead.
+"""
+
+import logging
+from collections.abc import Callable, Sequence
+
+import dask.array as da
+import numpy as np
+from ngio import OmeZarrContainer
+from ngio.hcs import open_ome_zarr_plate
+from ome_zarr_converters_tools import (
+    ConverterOptions,
+    ImageInPlate,
+    TiledImage,
+    join_url_paths,
+)
+
+from fractal_lif_converters.common._options import ProjectionMode
+from fractal_lif_converters.common._pyramid import (
+    Box,
+    StreamingPyramid,
+    streaming_pyramid,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def projection_path(path: str, mode: ProjectionMode) -> str:
+    """The path (or URL) of the ``mode`` projection of the image at ``path``.
+
+    Images in a well get the mode appended without a separator, keeping the
+    alphanumeric well paths required by OME-NGFF.
+    """
+    if path.endswith(".zarr"):
+        return f"{path[:-5]}_{mode}.zarr"
+    return f"{path}{mode}"
+
+
+def projection_dtype(mode: ProjectionMode, dtype: np.dtype) -> np.dtype:
+    """Data type of a projection; sums of integers are widened."""
+    dtype = np.dtype(dtype)
+    if mode == "sum" and dtype.kind in "iu":
+        return np.promote_types(dtype, np.uint32)
+    return dtype
+
+
+def project(data, axis: int, mode: ProjectionMode):
+    """Project a NumPy or Dask array over ``axis``, keeping it as a singleton.
+
+    Means of integer data are rounded to the nearest integer.
+    """
+    if mode == "max":
+        return data.max(axis=axis, keepdims=True)
+    if mode == "sum":
+        dtype = projection_dtype(mode, data.dtype)
+        return data.sum(axis=axis, keepdims=True, dtype=dtype)
+    mean = data.mean(axis=axis, keepdims=True)
+    if data.dtype.kind in "iu":
+        mean = mean.round()
+    return mean.astype(data.dtype)
+
+
+def collect_projections(
+    parse_function: Callable[..., list[TiledImage]],
+    projections: dict[str, list[ProjectionMode]],
+) -> Callable[..., list[TiledImage]]:
+    """Wrap an acquisition parser to record the projections of each image path.
+
+    Images without a Z axis get no projection.
+    """
+
+    def _parse(*, acquisition_model, converter_options: ConverterOptions):
+        tiled_images = parse_function(
+            acquisition_model=acquisition_model, converter_options=converter_options
+        )
+        modes = list(dict.fromkeys(acquisition_model.advanced.projections or ()))
+        for image in tiled_images if modes else ():
+            if "z" in image.axes:
+                projections[image.path] = modes
+            else:
+                logger.warning(f"{image.path} has no Z axis; it is not projected.")
+        return tiled_images
+
+    return _parse
+
+
+def projection_parallelization_list(
+    parallelization_list: list[dict],
+    *,
+    zarr_dir: str,
+    tiled_images: list[TiledImage],
+    projections: dict[str, list[ProjectionMode]],
+) -> list[dict]:
+    """Pass the projections of each image on to its compute task.
+
+    The projections of images in a plate are added to the well of the image,
+    so compute tasks of the same well do not update its metadata concurrently.
+    """
+    for image in tiled_images:
+        collection = image.collection
+        modes = projections.get(image.path)
+        if not modes or not isinstance(collection, ImageInPlate):
+            continue
+        plate = open_ome_zarr_plate(
+            join_url_paths(zarr_dir, collection.plate_path()), cache=True
+        )
+        existing = plate.images_paths()
+        for mode in modes:
+            path_in_well = projection_path(collection.path_in_well(), mode)
+            if join_url_paths(collection.well_path(), path_in_well) in existing:
+                continue
+            plate.add_image(
+                row=collection.row,
+                column=collection.column,
+                image_path=path_in_well,
+                acquisition_id=collection.acquisition,
+                acquisition_name=str(collection.acquisition),
+            )
+    urls = {join_url_paths(zarr_dir, path): m for path, m in projections.items()}
+    return [
+        {
+            **item,
+            "init_args": {**item["init_args"], "projections": urls[item["zarr_url"]]},
+        }
+        if item["zarr_url"] in urls
+        else item
+        for item in parallelization_list
+    ]
+
+
+def projected_tiled_image(tiled_image: TiledImage) -> TiledImage:
+    """``tiled_image`` (in pixel coordinates) with every region on one Z plane."""
+    regions = []
+    for region in tiled_image.regions:
+        slices = [
+            s.model_copy(update={"start": 0, "length": 1}) if s.axis_name == "z" else s
+            for s in region.roi.slices
+        ]
+        roi = region.roi.model_copy(update={"slices": slices})
+        regions.append(region.model_copy(update={"roi": roi}))
+    return tiled_image.model_copy(update={"regions": regions})
+
+
+class ZProjections:
+    """The Z projection images of one image being written.
+
+    Args:
+        ome_zarr: Container of the image.
+        zarr_url: URL of the image.
+        tiled_image: The image, in pixel coordinates.
+        modes: Projections to write.
+    """
+
+    def __init__(
+        self,
+        ome_zarr: OmeZarrContainer,
+        zarr_url: str,
+        tiled_image: TiledImage,
+        modes: Sequence[ProjectionMode],
+    ) -> None:
+        self._axis = tiled_image.axes.index("z")
+        self._depth = tiled_image.shape()[self._axis]
+        shape = list(ome_zarr.get_image().shape)
+        shape[self._axis] = 1
+        dtype = np.dtype(tiled_image.data_type)
+        self.images = {
+            mode: ome_zarr.derive_image(
+                store=projection_path(zarr_url, mode),
+                shape=shape,
+                dtype=str(projection_dtype(mode, dtype)),
+                overwrite=True,
+            )
+            for mode in modes
+        }
+        self._pyramids: dict[ProjectionMode, StreamingPyramid | None] = {}
+        self._streamed = False
+
+    def stream(self, boxes: Sequence[Box]) -> bool:
+        """Prepare to project the patches of level 0 as they are written.
+
+        Args:
+            boxes: Level-0 boxes of the patches, in the order they are written.
+
+        Returns:
+            Whether they can be streamed: every patch spans the whole stack.
+        """
+        if any(box[self._axis] != (0, self._depth) for box in boxes):
+            return False
+        boxes = [self._flatten(box) for box in boxes]
+        self._pyramids = {
+            mode: streaming_pyramid(container, boxes)
+            for mode, container in self.images.items()
+        }
+        self._streamed = True
+        return True
+
+    def _flatten(self, box: Box) -> Box:
+        return tuple((0, 1) if i == self._axis else r for i, r in enumerate(box))
+
+    def write(self, index: int, box: Box, patch: np.ndarray) -> None:
+        """Project patch ``index`` of level 0 and write it to every image."""
+        region = tuple(slice(lo, hi) for lo, hi in self._flatten(box))
+        for mode, container in self.images.items():
+            projection = project(patch, self._axis, mode)
+            container.get_image().zarr_array[region] = projection
+            pyramid = self._pyramids[mode]
+            if pyramid is not None:
+                pyramid.write(index, projection)
+
+    def finish(self, written: OmeZarrContainer) -> None:
+        """Write what was not streamed, projecting ``written`` if need be."""
+        source = None
+        if not self._streamed:
+            logger.info("Projecting the written image.")
+            source = da.from_zarr(written.get_image().zarr_array)
+        for mode, container in self.images.items():
+            image = container.get_image()
+            if source is not None:
+                projection = project(source, self._axis, mode)
+                da.store(projection, image.zarr_array, lock=False)
+            if self._pyramids.get(mode) is None:
+                image.consolidate()
@@ -0,0 +1,257 @@
+"""Single-pass pyramid: build the coarser levels while level 0 is written.
+
+``Image.consolidate`` derives every pyramid level after level 0 has been
+written, reading it back from the store. ``StreamingPyramid`` builds them
+from the patches (tiles, FOV groups or whole timepoints) as they are written
+instead, so the source data goes through the store once.
+
+Each level is the linear zoom of the previous one by an integer factor, as
+in ``consolidate``; on blocks aligned to the factor the zoom is local (an
+output pixel depends only on its block), so a patch gives the final value of
+every coarse pixel it covers alone. Coarse pixels straddling several patches
+(overlaps and seams between tiles) are accumulated in ``_Pending`` buffers of
+level-0 pixels, filled in write order by every patch touching them, and
+downsampled once the last of those patches is written. Only these seams are
+kept in memory.
+
+The levels are the same as those of ``consolidate`` when every level shape is
+an exact multiple of the next one; otherwise trailing pixels are trimmed
+rather than the whole level being resampled to the floored shape.
+"""
+
+import logging
+import math
+from collections.abc import Sequence
+from itertools import pairwise
+
+import numpy as np
+import zarr
+from ngio import OmeZarrContainer
+
+from fractal_lif_converters.common._converters_tools import numpy_zoom
+
+logger = logging.getLogger(__name__)
+
+Box = tuple[tuple[int, int], ...]
+"""Half-open ``(start, stop)`` range along every axis of an image."""
+
+
+def level_factors(shapes: Sequence[tuple[int, ...]]) -> list[tuple[int, ...]] | None:
+    """Integer downsampling factors between consecutive pyramid levels.
+
+    Returns:
+        One factor per axis for every level after the first, or ``None`` when
+        a level is not an integer downsampling of the previous one.
+    """
+    factors = []
+    for source, target in pairwise(shapes):
+        step = tuple(max(1, round(s / t)) for s, t in zip(source, target, strict=True))
+        if any(s // f != t for s, f, t in zip(source, step, target, strict=True)):
+            return None
+        factors.append(step)
+    return factors
+
+
+def downsample(array: np.ndarray, factors: tuple[int, ...]) -> np.ndarray:
+    """Linear zoom of ``array`` by integer ``factors``, trimming the excess.
+
+    ``array`` must start on a multiple of ``factors`` in the level it comes
+    from for the result to match the consolidated level.
+    """
+    target = tuple(s // f for s, f in zip(array.shape, factors, strict=True))
+    array = array[tuple(slice(0, t * f) for t, f in zip(target, factors, strict=True))]
+    if all(f == 1 for f in factors) or 0 in target:
+        return array
+    return numpy_zoom(array, target_shape=target, order="linear")
+
+
+def _intersect(a: Box, b: Box) -> Box | None:
+    box = tuple(
+        (max(lo_a, lo_b), min(hi_a, hi_b))
+        for (lo_a, hi_a), (lo_b, hi_b) in zip(a, b, strict=True)
+    )
+    return None if any(lo >= hi for lo, hi in box) else box
+
+
+def _overlapping_pairs(boxes: Sequence[Box | None]) -> list[tuple[int, int]]:
+    """Index pairs of intersecting boxes, swept along the last axis."""
+    order = sorted(
+        (i for i, box in enumerate(boxes) if box is not None),
+        key=lambda i: boxes[i][-1][0],
+    )
+    pairs = []
+    active: list[int] = []
+    for i in order:
+        box = boxes[i]
+        active = [j for j in active if boxes[j][-1][1] > box[-1][0]]
+        pairs.extend(
+            (min(i, j), max(i, j)) for j in active if _intersect(box, boxes[j])
+        )
+        active.append(i)
+    return pairs
+
+
+def _slices(box: Box, origin: Sequence[int] | None = None) -> tuple[slice, ...]:
+    origin = origin or (0,) * len(box)
+    return tuple(slice(lo - o, hi - o) for (lo, hi), o in zip(box, origin, strict=True))
+
+
+class _Pending:
+    """Coarse blocks of one level touched by several patches.
+
+    ``data`` holds the level-0 pixels of ``box`` (in coarse-block units) as
+    written so far; ``remaining`` counts the patches still to be written.
+    """
+
+    def __init__(self, box: Box, scale: tuple[int, ...], remaining: int) -> None:
+        self.box = box
+        self.pixels = tuple(
+            (lo * s, hi * s) for (lo, hi), s in zip(box, scale, strict=True)
+        )
+        self.remaining = remaining
+        self.data: np.ndarray | None = None
+
+
+class StreamingPyramid:
+    """Write the coarser levels of an image from the patches of level 0.
+
+    Args:
+        levels: Zarr arrays of the pyramid, from level 0.
+        factors: Downsampling factors between consecutive levels, see
+            ``level_factors``.
+        boxes: Level-0 boxes of the patches, in the order they are written.
+    """
+
+    def __init__(
+        self,
+        levels: Sequence[zarr.Array],
+        factors: Sequence[tuple[int, ...]],
+        boxes: Sequence[Box],
+    ) -> None:
+        self._levels = list(levels)
+        self._factors = list(factors)
+        self._boxes = list(boxes)
+        self._scales = [
+            tuple(math.prod(f) for f in zip(*self._factors[:k], strict=True))
+            for k in range(1, len(self._levels))
+        ]
+        self._coarsest = self._scales[-1]
+        # Per level: the pending buffers every patch contributes to.
+        self._pending: list[dict[int, list[_Pending]]] = []
+        num_pending = 0
+        for level, scale in zip(self._levels[1:], self._scales, strict=True):
+            blocks = [self._block_box(box, scale, level.shape) for box in boxes]
+            by_patch: dict[int, list[_Pending]] = {}
+            neighbours: dict[int, set[int]] = {}
+            pairs = _overlapping_pairs(blocks)
+            for i, j in pairs:
+                neighbours.setdefault(i, {i}).add(j)
+                neighbours.setdefault(j, {j}).add(i)
+            for i, j in pairs:
+                shared = _intersect(blocks[i], blocks[j])
+                touching = [
+                    m for m in sorted(neighbours[i]) if _intersect(blocks[m], shared)
+                ]
+                pending = _Pending(shared, scale, remaining=len(touching))
+                for m in touching:
+                    by_patch.setdefault(m, []).append(pending)
+            self._pending.append(by_patch)
+            num_pending += len(pairs)
+        logger.info(
+            f"Building {len(self._scales)} pyramid levels while writing "
+            f"{len(boxes)} patches ({num_pending} shared seams)."
+        )
+
+    @staticmethod
+    def _block_box(
+        box: Box, scale: tuple[int, ...], shape: tuple[int, ...]
+    ) -> Box | None:
+        """The coarse blocks of a level touched by a level-0 ``box``."""
+        blocks = tuple(
+            (lo // s, min(-(-hi // s), size))
+            for (lo, hi), s, size in zip(box, scale, shape, strict=True)
+        )
+        return None if any(lo >= hi for lo, hi in blocks) else blocks
+
+    def _cascade(self, array: np.ndarray, origin: Sequence[int], levels: int):
+        """Yield ``(level, origin, array)`` of ``array`` downsampled level by level."""
+        for level, factors in enumerate(self._factors[:levels], start=1):
+            array = downsample(array, factors)
+            origin = tuple(o // f for o, f in zip(origin, factors, strict=True))
+            yield level, origin, array
+
+    def write(self, index: int, patch: np.ndarray) -> None:
+        """Write the coarse pixels of patch ``index``, already written to level 0."""
+        box = self._boxes[index]
+        base_shape = self._levels[0].shape
+        # Pad the patch to blocks of the coarsest level, so every level of the
+        # cascade starts on a block boundary.
+        padded_box = tuple(
+            (lo // s * s, min(-(-hi // s) * s, size))
+            for (lo, hi), s, size in zip(box, self._coarsest, base_shape, strict=True)
+        )
+        padded = patch
+        if padded_box != box:
+            padded = np.zeros(
+                tuple(hi - lo for lo, hi in padded_box), dtype=patch.dtype
+            )
+            padded[_slices(box, [lo for lo, _ in padded_box])] = patch
+        origin = [lo for lo, _ in padded_box]
+        for level, level_origin, array in self._cascade(
+            padded, origin, len(self._factors)
+        ):
+            target = self._levels[level]
+            blocks = self._block_box(box, self._scales[level - 1], target.shape)
+            if blocks is not None:
+                target[_slices(blocks)] = array[_slices(blocks, level_origin)]
+
+        for level, by_patch in enumerate(self._pending, start=1):
+            for pending in by_patch.pop(index, ()):
+                self._accumulate(level, pending, box, patch)
+
+    def _accumulate(
+        self, level: int, pending: _Pending, box: Box, patch: np.ndarray
+    ) -> None:
+        """Copy ``patch`` into ``pending``, and write it out once complete."""
+        if pending.data is None:
+            pending.data = np.zeros(
+                tuple(hi - lo for lo, hi in pending.pixels), dtype=patch.dtype
+            )
+        overlap = _intersect(box, pending.pixels)
+        if overlap is not None:
+            origin = [lo for lo, _ in pending.pixels]
+            pending.data[_slices(overlap, origin)] = patch[
+                _slices(overlap, [lo for lo, _ in box])
+            ]
+        pending.remaining -= 1
+        if pending.remaining:
+            return
+        *_, (_, _, array) = self._cascade(pending.data, [0] * len(box), level)
+        self._levels[level][_slices(pending.box)] = array
+        pending.data = None
+
+
+def streaming_pyramid(
+    ome_zarr: OmeZarrContainer, boxes: Sequence[Box], fixed_axis: int | None = None
+) -> StreamingPyramid | None:
+    """A ``StreamingPyramid`` for the image of ``ome_zarr``, if it can be built.
+
+    Args:
+        ome_zarr: Container of the image being written.
+        boxes: Level-0 boxes of the patches, in the order they are written.
+        fixed_axis: An axis the patches are split along by another task; the
+            pyramid is not streamed if it is downsampled.
+
+    Returns:
+        ``None`` when the image has a single level or its levels are not
+        integer downsamplings of each other; they must then be consolidated.
+    """
+    levels = [ome_zarr.get_image(path=path).zarr_array for path in ome_zarr.level_paths]
+    if len(levels) < 2:
+        return None
+    factors = level_factors([level.shape for level in levels])
+    if factors is None or (
+        fixed_axis is not None and any(f[fixed_axis] != 1 for f in factors)
+    ):
+        return None
+    return StreamingPyramid(levels, factors, boxes)
@@ -0,0 +1,244 @@
+"""Range-request reading of remote LIF files through a local block cache.
+
+LIF files on object storage or HTTP are opened as ``RemoteLifFile``: a
+seekable binary stream that ``liffile`` reads like a local file. Every read is
+served from fixed-size blocks; missing blocks are fetched with one range
+request per contiguous run and kept in a size-bounded on-disk cache, so the
+XML header is fetched once per file and a compute task only downloads the
+blocks of the tiles it converts.
+
+The cache is configured through environment variables:
+
+- ``FRACTAL_LIF_CACHE_DIR``: cache directory (default: a
+  ``fractal-lif-block-cache`` folder in the system temporary directory).
+- ``FRACTAL_LIF_CACHE_MAX_BYTES``: total size of cached blocks (default
+  4 GiB); ``0`` disables the disk cache.
+- ``FRACTAL_LIF_CACHE_BLOCK_BYTES``: block size (default 4 MiB).
+"""
+
+import contextlib
+import functools
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+import fsspec
+from fsspec.utils import get_protocol
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_BYTES = 4 * 1024**3
+_DEFAULT_BLOCK_BYTES = 4 * 1024**2
+_LOCAL_PROTOCOLS = ("file", "local")
+
+
+def is_remote_path(path: str) -> bool:
+    """Whether ``path`` is an fsspec URL of a non-local filesystem."""
+    return get_protocol(path) not in _LOCAL_PROTOCOLS
+
+
+class BlockCache:
+    """Size-bounded on-disk cache of file blocks, evicting least recently used.
+
+    Blocks are stored as one file each and published with an atomic rename,
+    so several processes can share a cache directory.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self) -> list[Path]:
+        return [p for p in self.directory.glob("*/*") if p.suffix != ".tmp"]
+
+    def _path(self, key: str, index: int) -> Path:
+        return self.directory / key / str(index)
+
+    def get(self, key: str, index: int) -> bytes | None:
+        """Return a cached block, marking it as recently used."""
+        path = self._path(key, index)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, index: int, data: bytes) -> None:
+        """Store a block, evicting the least recently used ones if needed."""
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key, index)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{index}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Re-scan: other processes may have added or evicted blocks.
+        entries = []
+        for path in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        # Evict down to 90% so that every put does not trigger a scan.
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            self._size -= size
+
+
+@functools.cache
+def default_block_cache() -> BlockCache | None:
+    """The process-wide block cache configured from the environment."""
+    max_bytes = int(os.environ.get("FRACTAL_LIF_CACHE_MAX_BYTES", _DEFAULT_MAX_BYTES))
+    if max_bytes <= 0:
+        return None
+    directory = os.environ.get(
+        "FRACTAL_LIF_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "fractal-lif-block-cache"),
+    )
+    return BlockCache(directory, max_bytes)
+
+
+def _default_block_size() -> int:
+    return int(os.environ.get("FRACTAL_LIF_CACHE_BLOCK_BYTES", _DEFAULT_BLOCK_BYTES))
+
+
+class RemoteLifFile(io.RawIOBase):
+    """Seekable binary stream over a remote file, read in cached blocks.
+
+    Args:
+        url: fsspec URL of the file.
+        cache: Disk block cache; ``None`` keeps only the last block in memory.
+        block_size: Size of the cached blocks in bytes.
+        storage_options: Extra options for the fsspec filesystem.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        cache: BlockCache | None = None,
+        block_size: int | None = None,
+        storage_options: dict[str, Any] | None = None,
+    ) -> None:
+        super().__init__()
+        self.name = url
+        self.fs, self._path = fsspec.core.url_to_fs(url, **(storage_options or {}))
+        info = self.fs.info(self._path)
+        self.size = int(info["size"])
+        self.block_size = block_size or _default_block_size()
+        self.cache = cache
+        # Content-addressed by URL, size and version tag, so a changed remote
+        # file never reuses stale blocks.
+        version = info.get("ETag") or info.get("etag") or info.get("mtime") or ""
+        self._key = hashlib.sha256(
+            f"{url}|{self.size}|{version}|{self.block_size}".encode()
+        ).hexdigest()[:32]
+        self._pos = 0
+        self._last: tuple[int, bytes] | None = None
+        self.bytes_fetched = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position: {pos}")
+        self._pos = pos
+        return pos
+
+    def _fetch(self, first: int, last: int) -> dict[int, bytes]:
+        """Fetch blocks ``first..last`` (inclusive) with one range request."""
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size)
+        data = self.fs.cat_file(self._path, start=start, end=end)
+        logger.debug(f"Fetched bytes {start}-{end} of {self.name}")
+        self.bytes_fetched += len(data)
+        blocks = {}
+        for index in range(first, last + 1):
+            offset = (index - first) * self.block_size
+            block = data[offset : offset + self.block_size]
+            blocks[index] = block
+            if self.cache is not None:
+                self.cache.put(self._key, index, block)
+        return blocks
+
+    def _blocks(self, first: int, last: int) -> dict[int, bytes]:
+        blocks: dict[int, bytes] = {}
+        missing: list[int] = []
+        for index in range(first, last + 1):
+            block = None
+            if self._last is not None and self._last[0] == index:
+                block = self._last[1]
+            elif self.cache is not None:
+                block = self.cache.get(self._key, index)
+            if block is None:
+                missing.append(index)
+            else:
+                blocks[index] = block
+        # One range request per contiguous run of missing blocks.
+        run_start = 0
+        for i in range(1, len(missing) + 1):
+            if i == len(missing) or missing[i] != missing[i - 1] + 1:
+                blocks.update(self._fetch(missing[run_start], missing[i - 1]))
+                run_start = i
+        return blocks
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        nbytes = min(len(view), max(self.size - self._pos, 0))
+        if nbytes == 0:
+            return 0
+        first = self._pos // self.block_size
+        last = (self._pos + nbytes - 1) // self.block_size
+        blocks = self._blocks(first, last)
+        written = 0
+        for index in range(first, last + 1):
+            block = blocks[index]
+            start = self._pos + written - index * self.block_size
+            chunk = block[start : start + nbytes - written]
+            view[written : written + len(chunk)] = chunk
+            written += len(chunk)
+        self._last = (last, blocks[last])
+        self._pos += written
+        return written
+
+
+def open_lif_source(path: str) -> str | RemoteLifFile:
+    """Return a local path for local files, or a cached remote stream."""
+    if not is_remote_path(path):
+        return fsspec.core.url_to_fs(path)[1] if "://" in path else path
+    return RemoteLifFile(path, cache=default_block_cache())
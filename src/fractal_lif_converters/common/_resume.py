@@ -0,0 +1,227 @@
+"""Completion and progress markers for resumable conversions.
+
+Every image written by the LIF compute task carries a small marker directory
+next to its Zarr metadata::
+
+    <zarr_url>/.lif_conversion/started.json    fingerprint, written on creation
+    <zarr_url>/.lif_conversion/tiles/<index>   one empty file per written tile
+    <zarr_url>/.lif_conversion/shards/<index>  statistics of one written shard
+    <zarr_url>/.lif_conversion/finalize        claimed by the task finalizing
+                                               a sharded image
+    <zarr_url>/.lif_conversion/complete.json   fingerprint, written last
+
+Markers read by concurrent tasks are written to a temporary name and renamed
+into place, so they are never seen half written.
+
+The fingerprint records the source LIF file(s), image ids, a hash of the tile
+set (and converter options) and a cheap content fingerprint of each source
+file, so a re-run in ``EXTEND`` mode can skip finished images and resume
+interrupted ones tile by tile.
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+from enum import Enum
+
+import fsspec
+from ome_zarr_converters_tools import ConverterOptions, TiledImage, join_url_paths
+from pydantic import BaseModel, TypeAdapter
+
+from fractal_lif_converters.common._channel_stats import ChannelStatistics
+
+logger = logging.getLogger(__name__)
+
+MARKER_DIR = ".lif_conversion"
+
+# Bytes hashed at the start and at the end of each source file.
+_SAMPLE_BYTES = 64 * 1024
+
+_SHARD_STATS = TypeAdapter(list[ChannelStatistics] | None)
+
+
+class ConversionFingerprint(BaseModel):
+    """Identity of one converted image: its sources, tiles and options."""
+
+    source_files: dict[str, str]
+    """Source LIF path -> cheap content fingerprint (size + head/tail hash)."""
+    image_ids: list[int]
+    tiles_sha256: str
+    """Hash of the serialized tile set and converter options."""
+
+
+class MarkerState(Enum):
+    """State of an existing image with respect to the current fingerprint."""
+
+    ABSENT = "absent"
+    """No markers at all (not written by this converter, or written before
+    markers existed)."""
+    COMPLETE = "complete"
+    PARTIAL = "partial"
+    """Started with the same fingerprint but never completed."""
+    STALE = "stale"
+    """Markers exist but were written for a different fingerprint."""
+
+
+def _file_fingerprint(path: str) -> str:
+    fs, fs_path = fsspec.core.url_to_fs(path)
+    size = int(fs.size(fs_path))
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with fs.open(fs_path, "rb") as fh:
+        digest.update(fh.read(_SAMPLE_BYTES))
+        if size > _SAMPLE_BYTES:
+            fh.seek(max(size - _SAMPLE_BYTES, _SAMPLE_BYTES))
+            digest.update(fh.read(_SAMPLE_BYTES))
+    return f"{size}:{digest.hexdigest()}"
+
+
+def conversion_fingerprint(
+    tiled_image: TiledImage, converter_options: ConverterOptions
+) -> ConversionFingerprint:
+    """Compute the fingerprint of a (not yet registered) ``TiledImage``."""
+    source_files: dict[str, str] = {}
+    image_ids: set[int] = set()
+    for region in tiled_image.regions:
+        loader = region.image_loader
+        file_path = getattr(loader, "file_path", None)
+        if file_path is not None and file_path not in source_files:
+            source_files[file_path] = _file_fingerprint(file_path)
+        image_id = getattr(loader, "image_id", None)
+        if image_id is not None:
+            image_ids.add(image_id)
+    tiles = hashlib.sha256(tiled_image.model_dump_json().encode())
+    tiles.update(converter_options.model_dump_json().encode())
+    return ConversionFingerprint(
+        source_files=source_files,
+        image_ids=sorted(image_ids),
+        tiles_sha256=tiles.hexdigest(),
+    )
+
+
+class ConversionMarkers:
+    """Read and write the marker files of one image."""
+
+    def __init__(self, zarr_url: str) -> None:
+        self.root = join_url_paths(zarr_url, MARKER_DIR)
+        self.fs, self._root_path = fsspec.core.url_to_fs(self.root)
+
+    def _path(self, *parts: str) -> str:
+        return "/".join((self._root_path, *parts))
+
+    def _read(self, name: str) -> ConversionFingerprint | None:
+        path = self._path(name)
+        if not self.fs.exists(path):
+            return None
+        with self.fs.open(path, "r") as fh:
+            return ConversionFingerprint.model_validate(json.load(fh))
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        parent, name = path.rsplit("/", 1)
+        self.fs.makedirs(parent, exist_ok=True)
+        temporary = f"{parent}/.{name}.{uuid.uuid4().hex}.tmp"
+        with self.fs.open(temporary, "wb") as fh:
+            fh.write(data)
+        self.fs.mv(temporary, path)
+
+    def _write(self, name: str, fingerprint: ConversionFingerprint) -> None:
+        self._write_atomic(self._path(name), fingerprint.model_dump_json().encode())
+
+    def state(self, fingerprint: ConversionFingerprint) -> MarkerState:
+        """Compare the markers on disk with ``fingerprint``."""
+        complete = self._read("complete.json")
+        if complete is not None:
+            return (
+                MarkerState.COMPLETE if complete == fingerprint else MarkerState.STALE
+            )
+        started = self._read("started.json")
+        if started is not None:
+            return MarkerState.PARTIAL if started == fingerprint else MarkerState.STALE
+        return MarkerState.ABSENT
+
+    def start(self, fingerprint: ConversionFingerprint) -> None:
+        """Record that a fresh image with ``fingerprint`` is being written."""
+        if self.fs.exists(self._root_path):
+            self.fs.rm(self._root_path, recursive=True)
+        self._write("started.json", fingerprint)
+        self.fs.makedirs(self._path("tiles"), exist_ok=True)
+
+    def mark_tiles(self, indices: list[int]) -> None:
+        """Record that the tiles at ``indices`` are fully written."""
+        for index in indices:
+            self.fs.touch(self._path("tiles", str(index)))
+
+    def done_tiles(self) -> set[int]:
+        """Return the indices of the tiles already written."""
+        tiles_path = self._path("tiles")
+        if not self.fs.exists(tiles_path):
+            return set()
+        return {int(p.rsplit("/", 1)[-1]) for p in self.fs.ls(tiles_path, detail=False)}
+
+    def mark_shard(self, index: int, stats: list[ChannelStatistics] | None) -> None:
+        """Record that the shard ``index`` (data and pyramid) is fully written."""
+        self._write_atomic(
+            self._path("shards", str(index)), _SHARD_STATS.dump_json(stats)
+        )
+
+    def done_shards(self) -> dict[int, list[ChannelStatistics] | None]:
+        """Return the channel statistics of each shard already written.
+
+        Markers removed meanwhile by the task completing the image are left
+        out.
+        """
+        shards = {}
+        try:
+            paths = self.fs.ls(self._path("shards"), detail=False)
+        except FileNotFoundError:
+            return {}
+        for path in paths:
+            name = path.rsplit("/", 1)[-1]
+            if name.startswith("."):
+                continue
+            try:
+                with self.fs.open(path, "rb") as fh:
+                    shards[int(name)] = _SHARD_STATS.validate_json(fh.read())
+            except FileNotFoundError:
+                continue
+        return shards
+
+    def claim_finalize(self) -> bool:
+        """Claim the finalization of a sharded image.
+
+        Several shard tasks may see every shard written at once; only the
+        first to create the ``finalize`` marker finalizes the image.
+        """
+        try:
+            with self.fs.open(self._path("finalize"), "xb"):
+                pass
+        except FileExistsError:
+            return False
+        return True
+
+    def complete(self, fingerprint: ConversionFingerprint) -> None:
+        """Record that the image (data, pyramid, metadata, tables) is complete."""
+        self._write("complete.json", fingerprint)
+        # ``finalize`` stays, so a late shard task cannot claim it again.
+        for name in ("tiles", "shards"):
+            path = self._path(name)
+            if self.fs.exists(path):
+                self.fs.rm(path, recursive=True)
+
+
+def skip_completed_images(
+    tiled_images: list[TiledImage],
+    *,
+    zarr_dir: str,
+    converter_options: ConverterOptions,
+) -> list[TiledImage]:
+    """Drop the images whose completion marker matches their fingerprint."""
+    remaining = []
+    for tiled_image in tiled_images:
+        zarr_url = join_url_paths(zarr_dir, tiled_image.path)
+        fingerprint = conversion_fingerprint(tiled_image, converter_options)
+        if ConversionMarkers(zarr_url).state(fingerprint) is MarkerState.COMPLETE:
+            logger.info(f"Skipping already converted image: {zarr_url}")
+            continue
+        remaining.append(tiled_image)
+    return remaining
@@ -0,0 +1,234 @@
+"""Local process-pool runner for the LIF Python API.
+
+``LifLocalRunner`` is a drop-in alternative to the generic runners of
+``ome_zarr_converters_tools``: compute tasks are fanned out over a reused
+process pool whose size, and the set of tasks running at any time, are bounded
+by the available cores and memory using a per-image memory estimate.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Literal
+
+import numpy as np
+from ome_zarr_converters_tools import (
+    RunnerType,
+    TiledImage,
+    exec_compound_task,
+)
+from ome_zarr_converters_tools.fractal import ImageListUpdateDict
+from ome_zarr_converters_tools.models import WriterMode
+from pydantic import BaseModel, Field
+
+from fractal_lif_converters.common._compute import load_serialized_tiled_image
+from fractal_lif_converters.common._init_args import LifConvertInitArgs
+from fractal_lif_converters.common._loaders import enable_lif_file_cache
+from fractal_lif_converters.common._options import (
+    LifPipelineOptions,
+    enable_pipelined_writes,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fixed per-task allowance on top of the loaded data (zarr/ngio buffers,
+# pyramid downsampling of one chunk row, Python objects).
+_TASK_OVERHEAD_BYTES = 256 * 1024**2
+
+# Peak memory of a task as a multiple of the largest unit loaded at once
+# (loaded patch plus the encoded chunks being written).
+_PEAK_FACTOR = 2
+
+
+class LifLocalRunner(BaseModel):
+    """Runner executing LIF compute tasks in a local, memory-aware process pool."""
+
+    mode: Literal["LifLocal"] = Field(default="LifLocal", title="Mode")
+    """
+    Runner type.
+    """
+    max_processes: int | None = Field(default=None, gt=0, title="Max Processes")
+    """
+    Upper bound on worker processes (default: number of CPUs).
+    """
+    memory_limit: int | None = Field(default=None, gt=0, title="Memory Limit")
+    """
+    Memory budget in bytes shared by all running tasks (default:
+    ``memory_fraction`` of the currently available memory).
+    """
+    memory_fraction: float = Field(default=0.8, gt=0, le=1, title="Memory Fraction")
+    """
+    Fraction of the available memory used as budget when ``memory_limit`` is
+    not set.
+    """
+    lif_file_cache_size: int = Field(default=4, ge=0, title="Lif File Cache Size")
+    """
+    ``LifFile`` handles kept open per worker thread.
+    """
+    pipeline: LifPipelineOptions | None = Field(default=None, title="Pipeline")
+    """
+    Convert each image with its own reader and writer processes over shared
+    memory (see ``_pipeline``). Each worker then runs ``readers + writers``
+    extra processes.
+    """
+
+
+def _available_memory() -> int | None:
+    try:
+        with open("/proc/meminfo") as fh:
+            for line in fh:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def estimate_task_memory(
+    tiled_image: TiledImage, writer_mode: WriterMode
+) -> tuple[int, int]:
+    """Estimate the peak memory of converting ``tiled_image``.
+
+    Returns:
+        The estimated peak bytes of the compute task and the bytes of the
+        full image (used for throughput reporting).
+    """
+    image_bytes = (
+        int(np.prod(tiled_image.shape())) * np.dtype(tiled_image.data_type).itemsize
+    )
+    if writer_mode in (WriterMode.BY_TILE, WriterMode.BY_TILE_DASK):
+        units = len(tiled_image.regions)
+    elif writer_mode in (WriterMode.BY_FOV, WriterMode.BY_FOV_DASK):
+        units = len(tiled_image.group_by_fov())
+    else:
+        units = 1
+    if "t" in tiled_image.axes:
+        # Time-lapse images are written one timepoint at a time.
+        units *= tiled_image.shape()[tiled_image.axes.index("t")]
+    unit_bytes = -(-image_bytes // max(units, 1))
+    return _PEAK_FACTOR * unit_bytes + _TASK_OVERHEAD_BYTES, image_bytes
+
+
+def _init_worker(lif_file_cache_size: int, pipeline: LifPipelineOptions | None) -> None:
+    enable_lif_file_cache(lif_file_cache_size)
+    enable_pipelined_writes(pipeline)
+
+
+def _run_local(
+    *,
+    compute_task_fn: Callable[..., ImageListUpdateDict],
+    parallelization_list: list[dict],
+    collection_type: type,
+    runner: LifLocalRunner,
+) -> list[ImageListUpdateDict]:
+    if not parallelization_list:
+        return []
+    estimates = []
+    for item in parallelization_list:
+        parsed_args = LifConvertInitArgs.model_validate(item["init_args"])
+        tiled_image = load_serialized_tiled_image(parsed_args, collection_type)
+        writer_mode = parsed_args.converter_options.writer_mode
+        peak, image_bytes = estimate_task_memory(tiled_image, writer_mode)
+        if parsed_args.shard is not None:
+            # Shards are streamed like whole images: same peak, less data.
+            image_bytes //= parsed_args.shard.count
+        estimates.append((peak, image_bytes))
+
+    budget = runner.memory_limit
+    if budget is None:
+        available = _available_memory()
+        if available is not None:
+            budget = int(available * runner.memory_fraction)
+    num_processes = runner.max_processes or os.cpu_count() or 1
+    if budget is not None:
+        largest = max(peak for peak, _ in estimates)
+        num_processes = min(num_processes, max(1, budget // largest))
+    num_processes = min(num_processes, len(parallelization_list))
+    logger.info(
+        f"Converting {len(parallelization_list)} image(s) with {num_processes} "
+        f"process(es), memory budget "
+        f"{'unbounded' if budget is None else f'{budget / 1024**2:.0f} MiB'}."
+    )
+
+    results: list[ImageListUpdateDict | None] = [None] * len(parallelization_list)
+    pending = deque(range(len(parallelization_list)))
+    in_flight: dict[Future, int] = {}
+    reserved = 0
+    finished = 0
+    converted_bytes = 0
+    start = time.perf_counter()
+    # Spawned, not forked: the parent may already run zarr's event-loop and
+    # codec threads, whose locks a forked child would inherit held.
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(runner.lif_file_cache_size, runner.pipeline),
+    ) as executor:
+        try:
+            while pending or in_flight:
+                # Admit tasks while a worker is free and the budget allows;
+                # a single task is always admitted so oversized images run.
+                while pending and len(in_flight) < num_processes:
+                    peak = estimates[pending[0]][0]
+                    if in_flight and budget is not None and reserved + peak > budget:
+                        break
+                    idx = pending.popleft()
+                    reserved += peak
+                    in_flight[
+                        executor.submit(compute_task_fn, **parallelization_list[idx])
+                    ] = idx
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = in_flight.pop(future)
+                    reserved -= estimates[idx][0]
+                    results[idx] = future.result()
+                    finished += 1
+                    converted_bytes += estimates[idx][1]
+                    elapsed = time.perf_counter() - start
+                    logger.info(
+                        f"[{finished}/{len(parallelization_list)}] Converted "
+                        f"{parallelization_list[idx]['zarr_url']} "
+                        f"({converted_bytes / 1024**2 / elapsed:.1f} MiB/s, "
+                        f"{finished / elapsed * 60:.1f} images/min)"
+                    )
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            raise
+    return results  # type: ignore[return-value]
+
+
+def exec_lif_compound_task(
+    *,
+    init_task_fn: Callable[..., dict],
+    compute_task_fn: Callable[..., ImageListUpdateDict],
+    init_task_kwargs: dict,
+    collection_type: type,
+    runner: RunnerType | LifLocalRunner | None = None,
+) -> list[ImageListUpdateDict]:
+    """Run a LIF compound task, using ``LifLocalRunner`` when requested.
+
+    Any other runner is delegated to ``exec_compound_task``.
+    """
+    if not isinstance(runner, LifLocalRunner):
+        return exec_compound_task(
+            init_task_fn=init_task_fn,
+            compute_task_fn=compute_task_fn,
+            init_task_kwargs=init_task_kwargs,
+            runner=runner,
+        )
+    init_output = init_task_fn(**init_task_kwargs)
+    return _run_local(
+        compute_task_fn=compute_task_fn,
+        parallelization_list=init_output["parallelization_list"],
+        collection_type=collection_type,
+        runner=runner,
+    )
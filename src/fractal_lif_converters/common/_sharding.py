@@ -0,0 +1,152 @@
+"""Axis sharding: convert one deep image with several compute tasks.
+
+With ``LifAcquisitionOptions.sharding``, the init task creates the empty image
+once and emits one parallelization item per shard, a chunk-aligned range of
+timepoints (or Z planes) of that image. Each compute task reads only the
+frames of its range, writes them and the matching slab of every pyramid level
+and records its channel statistics (see ``ConversionMarkers.mark_shard``).
+The task writing the last shard sets the channel windows and the tables.
+"""
+
+from collections.abc import Callable
+from itertools import pairwise
+
+import dask.array as da
+from ngio import OmeZarrContainer
+from ome_zarr_converters_tools import (
+    ConverterOptions,
+    TiledImage,
+)
+from ome_zarr_converters_tools.core import TileSlice
+
+from fractal_lif_converters.common._channel_stats import ChannelStatistics
+from fractal_lif_converters.common._converters_tools import dask_zoom
+from fractal_lif_converters.common._init_args import LifAxisShard
+from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._options import LifAxisSharding
+
+
+def shard_ranges(extent: int, chunk: int, size: int) -> list[tuple[int, int]]:
+    """Split ``[0, extent)`` into ranges of ``size`` rounded up to ``chunk``."""
+    step = -(-size // chunk) * chunk
+    return [(start, min(start + step, extent)) for start in range(0, extent, step)]
+
+
+def _axis_extent(region: TileSlice, axis: str) -> tuple[int, int]:
+    roi_slice = region.roi.get(axis)
+    if roi_slice is None:
+        return 0, 1
+    return int(roi_slice.start or 0), int(roi_slice.length or 1)
+
+
+def restrict_to_shard(tiled_image: TiledImage, shard: LifAxisShard) -> None:
+    """Keep the part of each region (in pixel coordinates) inside ``shard``.
+
+    Regions are dropped or cropped along the shard axis, and the read
+    selection of cropped LIF regions is narrowed to match, so only the
+    frames of the shard are read.
+    """
+    regions = []
+    for region in tiled_image.regions:
+        start, length = _axis_extent(region, shard.axis)
+        low, high = max(start, shard.start), min(start + length, shard.stop)
+        if low >= high:
+            continue
+        if (low, high) != (start, start + length):
+            loader = region.image_loader
+            if not isinstance(loader, LifMosaicLoader):
+                raise TypeError(f"Cannot shard a region loaded by {type(loader)}.")
+            selection = loader.selection
+            if shard.axis == "t":
+                first = selection.t_range[0] if selection.t_range else 0
+                step = selection.t_step
+                update = {
+                    "t_range": (
+                        first + (low - start) * step,
+                        first + (high - start - 1) * step + 1,
+                    )
+                }
+            else:
+                first = selection.z_range[0] if selection.z_range else 0
+                update = {"z_range": (first + low - start, first + high - start)}
+            slices = [
+                s.model_copy(update={"start": low, "length": high - low})
+                if s.axis_name == shard.axis
+                else s
+                for s in region.roi.slices
+            ]
+            region = TileSlice(
+                roi=region.roi.model_copy(update={"slices": slices}),
+                image_loader=loader.model_copy(
+                    update={"selection": selection.model_copy(update=update)}
+                ),
+            )
+        regions.append(region)
+    tiled_image.regions = regions
+
+
+def consolidate_slab(
+    ome_zarr: OmeZarrContainer, axis: int, start: int, stop: int
+) -> None:
+    """Build the pyramid levels of ``[start, stop)`` along ``axis`` only.
+
+    Like ``Image.consolidate`` (linear, with Dask), but restricted to one
+    slab, so tasks writing disjoint slabs can consolidate concurrently.
+
+    Raises:
+        ValueError: If the pyramid is downsampled along ``axis``.
+    """
+    arrays = [ome_zarr.get_image(path=path).zarr_array for path in ome_zarr.level_paths]
+    for source, target in pairwise(arrays):
+        if source.shape[axis] != target.shape[axis]:
+            raise ValueError("Cannot shard an axis downsampled in the pyramid.")
+        region = tuple(
+            slice(start, stop) if i == axis else slice(None) for i in range(source.ndim)
+        )
+        target_shape = tuple(
+            stop - start if i == axis else size for i, size in enumerate(target.shape)
+        )
+        zoomed = dask_zoom(
+            da.from_zarr(source)[region], target_shape=target_shape, order="linear"
+        )
+        da.store(zoomed.rechunk(target.chunks), target, regions=region, lock=False)
+
+
+def merge_channel_stats(
+    shard_stats: list[list[ChannelStatistics] | None],
+) -> list[ChannelStatistics] | None:
+    """Combine the statistics of the shards of one image.
+
+    Minima and maxima are exact; the display window is the union of the
+    shard windows.
+    """
+    stats = [s for s in shard_stats if s is not None]
+    if not stats:
+        return None
+    return [
+        ChannelStatistics(
+            min=min(s.min for s in channel),
+            max=max(s.max for s in channel),
+            start=min(s.start for s in channel),
+            end=max(s.end for s in channel),
+        )
+        for channel in zip(*stats, strict=True)
+    ]
+
+
+def collect_axis_sharding(
+    parse_function: Callable[..., list[TiledImage]],
+    shardings: dict[str, LifAxisSharding],
+) -> Callable[..., list[TiledImage]]:
+    """Wrap an acquisition parser to record the sharding of each image path."""
+
+    def _parse(*, acquisition_model, converter_options: ConverterOptions):
+        tiled_images = parse_function(
+            acquisition_model=acquisition_model, converter_options=converter_options
+        )
+        sharding = acquisition_model.advanced.sharding
+        if sharding is not None:
+            shardings.update({image.path: sharding for image in tiled_images})
+        return tiled_images
+
+    return _parse
@@ -4,11 +4,15 @@ Produces flat ``list[Tile]`` per acquisition; downstream
 ``tiles_aggregation_pipeline`` is responsible for grouping into ``TiledImage``.
 """
 
+import itertools
+import logging
+import math
 from collections.abc import Callable
 from enum import Enum
-from typing import Any
+from typing import Any, NamedTuple
 
 import liffile
+import numpy as np
 from ome_zarr_converters_tools import (
     AcquisitionDetails,
     ImageInPlate,
@@ -17,7 +21,15 @@ from ome_zarr_converters_tools import (
 )
 from pydantic import BaseModel
 
-from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._loaders import (
+    LifEmptyTileCheck,
+    LifIOProfile,
+    LifMosaicLoader,
+    LifReadSelection,
+)
+from fractal_lif_converters.common._options import LifGridSnapping, LifSpatialRoi
+
+logger = logging.getLogger(__name__)
 
 
 class ImageType(Enum):
@@ -69,36 +81,243 @@ def _resolve_scale_m(scale_m: float | None) -> float:
     return scale_m if scale_m is not None else 1e-6
 
 
-def _shape_5d(lif_image: Any) -> tuple[int, int, int, int, int]:
-    sizes = lif_image.sizes
-    shape_x = sizes.get("X", 1)
-    shape_y = sizes.get("Y", 1)
-    shape_z = sizes.get("Z", 1)
-    shape_t = sizes.get("T", 1)
-    shape_c = sizes.get("C", 1)
-    return shape_t, shape_c, shape_z, shape_y, shape_x
+def _shape_5d(
+    lif_image: Any, selection: LifReadSelection
+) -> tuple[int, int, int, int, int]:
+    return selection.shape_5d(dict(lif_image.sizes))
+
+
+class _TileGrid:
+    """Uniform-grid spatial index over equally sized tile footprints.
+
+    Each tile is bucketed by the grid cell of its origin, with cells the size
+    of a tile, so a query only visits the cells overlapping the query box
+    (plus one row and column for tiles reaching in from the previous cell).
+    """
+
+    def __init__(
+        self, origins: list[tuple[float, float]], width: float, height: float
+    ) -> None:
+        self.origins = origins
+        self.width = width
+        self.height = height
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for idx, (x, y) in enumerate(origins):
+            self._cells.setdefault(self._cell(x, y), []).append(idx)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.width), math.floor(y / self.height)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """Indices (ascending) of the tiles overlapping ``[x0, x1) x [y0, y1)``."""
+        cx0, cy0 = self._cell(x0 - self.width, y0 - self.height)
+        cx1, cy1 = self._cell(x1, y1)
+        hits = []
+        for cell in itertools.product(range(cx0, cx1 + 1), range(cy0, cy1 + 1)):
+            for idx in self._cells.get(cell, ()):
+                x, y = self.origins[idx]
+                if x < x1 and x + self.width > x0 and y < y1 and y + self.height > y0:
+                    hits.append(idx)
+        return sorted(hits)
+
+
+class _GridFit(NamedTuple):
+    """Regular grid inferred from the tile origins of a mosaic."""
+
+    origins: list[tuple[float, float]]
+    """Tile origins (in micrometres) at their grid nodes, on whole pixels."""
+    step: tuple[int, int]
+    """Grid step along X and Y, in pixels."""
+    shape: tuple[int, int]
+    """Number of grid columns and rows."""
+    max_residual: float
+    """Largest distance between a stage position and its node, in pixels."""
+    rms_residual: float
+
+
+def _fit_axis(coords: np.ndarray, extent: float) -> tuple[np.ndarray, np.ndarray, int]:
+    """Fit 1-D positions (pixels) to a lattice with an integer step.
+
+    Returns:
+        The lattice index and the snapped position of every coordinate, and
+        the step (``0`` for a single row or column).
+    """
+    gaps = np.diff(np.sort(coords))
+    # Jitter is much smaller than the spacing of neighbouring rows/columns.
+    steps = gaps[gaps > extent / 4]
+    if steps.size == 0:
+        index = np.zeros(coords.shape, dtype=np.int64)
+        return index, np.full(coords.shape, np.rint(coords.mean())), 0
+    index = np.rint((coords - coords.min()) / np.median(steps)).astype(np.int64)
+    # Least squares over all tiles: coords ~ origin + step * index.
+    step, origin = np.polyfit(index, coords, 1)
+    step = int(np.rint(step))
+    return index, np.rint(origin) + step * index, step
+
+
+def _fit_grid(
+    origins: list[tuple[float, float]], pixel_um: float, tile_shape: tuple[int, int]
+) -> _GridFit | None:
+    """Infer the regular grid of a mosaic from its tile origins.
+
+    Returns:
+        The fitted grid, or ``None`` when two tiles fall on the same node.
+    """
+    coords = np.asarray(origins, dtype=np.float64) / pixel_um
+    index_x, snapped_x, step_x = _fit_axis(coords[:, 0], tile_shape[0])
+    index_y, snapped_y, step_y = _fit_axis(coords[:, 1], tile_shape[1])
+    nodes = np.stack([index_x, index_y], axis=1)
+    if len(np.unique(nodes, axis=0)) != len(nodes):
+        return None
+    snapped = np.stack([snapped_x, snapped_y], axis=1)
+    residual = np.hypot(*(coords - snapped).T)
+    return _GridFit(
+        origins=[(x * pixel_um, y * pixel_um) for x, y in snapped.tolist()],
+        step=(step_x, step_y),
+        shape=(int(index_x.max()) + 1, int(index_y.max()) + 1),
+        max_residual=float(residual.max()),
+        rms_residual=float(np.sqrt(np.mean(residual**2))),
+    )
+
+
+def _snap_to_grid(
+    origins: list[tuple[float, float]],
+    *,
+    pixel_um: float,
+    tile_shape: tuple[int, int],
+    grid: LifGridSnapping,
+    image_id: int,
+) -> list[tuple[float, float]]:
+    """Snap tile origins to their inferred grid, or keep them if off-grid."""
+    fit = _fit_grid(origins, pixel_um, tile_shape)
+    if fit is None:
+        logger.warning(
+            f"Tiles of image {image_id} are not on a regular grid; "
+            "keeping their stage positions."
+        )
+        return origins
+    if fit.max_residual > grid.max_residual:
+        logger.warning(
+            f"Tiles of image {image_id} are up to {fit.max_residual:.2f} px off "
+            f"their grid (limit {grid.max_residual} px); keeping their stage "
+            "positions."
+        )
+        return origins
+    logger.info(
+        f"Snapped {len(origins)} tiles of image {image_id} to a "
+        f"{fit.shape[0]}x{fit.shape[1]} grid with a {fit.step[0]}x{fit.step[1]} "
+        f"px step; residual max {fit.max_residual:.2f} px, "
+        f"RMS {fit.rms_residual:.2f} px."
+    )
+    return fit.origins
+
+
+def _crop_to_roi(
+    *,
+    roi: LifSpatialRoi,
+    x_um: float,
+    y_um: float,
+    pixel_um: float,
+    sizes: dict[str, int],
+    selection: LifReadSelection,
+) -> tuple[LifReadSelection, float, float] | None:
+    """Crop a tile at ``(x_um, y_um)`` to ``roi``.
+
+    Returns:
+        The tile's selection with its Y/X window and the shifted tile origin,
+        or ``None`` when the tile lies outside the ROI.
+    """
+    size_y, size_x = sizes.get("Y", 1), sizes.get("X", 1)
+    x0 = max(math.floor((roi.x - x_um) / pixel_um), 0)
+    x1 = min(math.ceil((roi.x + roi.width - x_um) / pixel_um), size_x)
+    y0 = max(math.floor((roi.y - y_um) / pixel_um), 0)
+    y1 = min(math.ceil((roi.y + roi.height - y_um) / pixel_um), size_y)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    # Keep preview decimation on the tile's own pixel grid.
+    x0 -= x0 % selection.xy_step
+    y0 -= y0 % selection.xy_step
+    if (y0, y1, x0, x1) == (0, size_y, 0, size_x):
+        return selection, x_um, y_um
+    window = selection.model_copy(update={"yx_window": (y0, y1, x0, x1)})
+    return window, x_um + x0 * pixel_um, y_um + y0 * pixel_um
+
+
+def _resolve_selection(
+    lif_image: Any,
+    read_selection_factory: Callable[[Any], LifReadSelection] | None,
+) -> LifReadSelection:
+    if read_selection_factory is None:
+        return LifReadSelection()
+    return read_selection_factory(lif_image)
 
 
 def _build_mosaic_tiles(
     *,
     lif_image: Any,
-    lif_file: Any,
+    file_path: str,
     image_id: int,
     collection: ImageInPlate | SingleImage,
     acquisition_details: AcquisitionDetails,
     scale_m: float | None,
+    selection: LifReadSelection,
+    io_profile: LifIOProfile | None,
+    roi: LifSpatialRoi | None,
+    empty_check: LifEmptyTileCheck | None = None,
+    grid: LifGridSnapping | None = None,
 ) -> list[Tile]:
-    shape_t, shape_c, shape_z, shape_y, shape_x = _shape_5d(lif_image)
     scale = _resolve_scale_m(scale_m)
+    sizes = dict(lif_image.sizes)
+    origins = [
+        (tile_pos["pos_x"] / scale, tile_pos["pos_y"] / scale)
+        for tile_pos in lif_image.tilescan.tiles
+    ]
+    positions: list[int] = list(range(len(origins)))
+    # Full-resolution pixel size (the details are scaled for previews).
+    pixel_um = acquisition_details.pixelsize / selection.xy_step
+    if grid is not None:
+        origins = _snap_to_grid(
+            origins,
+            pixel_um=pixel_um,
+            tile_shape=(sizes.get("X", 1), sizes.get("Y", 1)),
+            grid=grid,
+            image_id=image_id,
+        )
+    if roi is not None:
+        index = _TileGrid(
+            origins, sizes.get("X", 1) * pixel_um, sizes.get("Y", 1) * pixel_um
+        )
+        positions = index.query(roi.x, roi.y, roi.x + roi.width, roi.y + roi.height)
+        logger.info(
+            f"ROI keeps {len(positions)} of {len(origins)} tiles of image {image_id}."
+        )
 
     tiles: list[Tile] = []
-    for m, tile_pos in enumerate(lif_image.tilescan.tiles):
-        x_um = tile_pos["pos_x"] / scale
-        y_um = tile_pos["pos_y"] / scale
+    for m in positions:
+        x_um, y_um = origins[m]
+        tile_selection = selection
+        if roi is not None:
+            cropped = _crop_to_roi(
+                roi=roi,
+                x_um=x_um,
+                y_um=y_um,
+                pixel_um=pixel_um,
+                sizes=sizes,
+                selection=selection,
+            )
+            if cropped is None:
+                continue
+            tile_selection, x_um, y_um = cropped
+        shape_t, shape_c, shape_z, shape_y, shape_x = _shape_5d(
+            lif_image, tile_selection
+        )
         loader = LifMosaicLoader(
-            file_path=str(lif_file.filepath),
+            file_path=file_path,
             image_id=image_id,
             m=m,
+            selection=tile_selection,
+            io_profile=io_profile,
+            empty_check=empty_check,
         )
         tiles.append(
             Tile(
@@ -125,14 +344,17 @@ def _build_mosaic_tiles(
 def _build_single_tile(
     *,
     lif_image: Any,
-    lif_file: Any,
+    file_path: str,
     image_id: int,
     fov_name: str,
     collection: ImageInPlate | SingleImage,
     acquisition_details: AcquisitionDetails,
     scale_m: float | None,
-) -> Tile:
-    shape_t, shape_c, shape_z, shape_y, shape_x = _shape_5d(lif_image)
+    selection: LifReadSelection,
+    io_profile: LifIOProfile | None,
+    roi: LifSpatialRoi | None,
+    empty_check: LifEmptyTileCheck | None = None,
+) -> Tile | None:
     scale = _resolve_scale_m(scale_m)
 
     ts = lif_image.tilescan
@@ -143,10 +365,27 @@ def _build_single_tile(
     else:
         x_um, y_um = 0.0, 0.0
 
+    if roi is not None:
+        cropped = _crop_to_roi(
+            roi=roi,
+            x_um=x_um,
+            y_um=y_um,
+            pixel_um=acquisition_details.pixelsize / selection.xy_step,
+            sizes=dict(lif_image.sizes),
+            selection=selection,
+        )
+        if cropped is None:
+            return None
+        selection, x_um, y_um = cropped
+    shape_t, shape_c, shape_z, shape_y, shape_x = _shape_5d(lif_image, selection)
+
     loader = LifMosaicLoader(
-        file_path=str(lif_file.filepath),
+        file_path=file_path,
         image_id=image_id,
         m=0,
+        selection=selection,
+        io_profile=io_profile,
+        empty_check=empty_check,
     )
     return Tile(
         fov_name=fov_name,
@@ -185,6 +424,12 @@ def build_plate_acq_tiles(
     acquisition_id: int,
     acquisition_details_factory: Callable[[Any], AcquisitionDetails],
     scale_m: float | None,
+    read_selection_factory: Callable[[Any], LifReadSelection] | None = None,
+    file_path: str | None = None,
+    io_profile: LifIOProfile | None = None,
+    roi: LifSpatialRoi | None = None,
+    grid: LifGridSnapping | None = None,
+    empty_check: LifEmptyTileCheck | None = None,
 ) -> list[Tile]:
     """Build ``Tile`` objects for one plate-mode well/position group.
 
@@ -200,12 +445,26 @@ def build_plate_acq_tiles(
             channel/pixelsize/data-type metadata.
         scale_m: Override for the LIF metres-per-micrometre scale; falls back
             to ``1e-6`` (metres per micrometre) when ``None``.
+        read_selection_factory: Callable producing the ``LifReadSelection``
+            (channels, Z/T ranges) to read for a given ``LifImage``. Reads
+            every plane when ``None``.
+        file_path: Path or fsspec URL the loaders re-open the file from;
+            defaults to ``lif_file.filepath`` (which is local-only).
+        io_profile: How the loaders read each tile from disk; ``None`` leaves
+            reads to ``liffile``.
+        roi: Spatial region to convert; tiles outside it are dropped and
+            boundary tiles cropped. ``None`` keeps every tile whole.
+        grid: Snap mosaic tiles to their inferred regular grid; ``None``
+            places them at their stage positions.
+        empty_check: Classify tiles as empty before they are read, so the
+            compute task skips them; ``None`` writes every tile.
 
     Returns:
         Flat list of tiles for this group.
     """
     if not image_infos:
         return []
+    file_path = file_path or str(lif_file.filepath)
 
     image_type = image_infos[0].image_type
     if image_type is ImageType.MOSAIC:
@@ -224,11 +483,16 @@ def build_plate_acq_tiles(
         )
         return _build_mosaic_tiles(
             lif_image=lif_image,
-            lif_file=lif_file,
+            file_path=file_path,
             image_id=info.image_id,
             collection=collection,
             acquisition_details=acquisition_details_factory(lif_image),
             scale_m=scale_m,
+            selection=_resolve_selection(lif_image, read_selection_factory),
+            io_profile=io_profile,
+            roi=roi,
+            grid=grid,
+            empty_check=empty_check,
         )
 
     multi = len(image_infos) > 1
@@ -241,17 +505,21 @@ def build_plate_acq_tiles(
             column=int(info.column),
             acquisition=acquisition_id,
         )
-        tiles.append(
-            _build_single_tile(
-                lif_image=lif_image,
-                lif_file=lif_file,
-                image_id=info.image_id,
-                fov_name=_single_fov_name(info, idx, multi=multi),
-                collection=collection,
-                acquisition_details=acquisition_details_factory(lif_image),
-                scale_m=scale_m,
-            )
+        tile = _build_single_tile(
+            lif_image=lif_image,
+            file_path=file_path,
+            image_id=info.image_id,
+            fov_name=_single_fov_name(info, idx, multi=multi),
+            collection=collection,
+            acquisition_details=acquisition_details_factory(lif_image),
+            scale_m=scale_m,
+            selection=_resolve_selection(lif_image, read_selection_factory),
+            io_profile=io_profile,
+            roi=roi,
+            empty_check=empty_check,
         )
+        if tile is not None:
+            tiles.append(tile)
     return tiles
 
 
@@ -262,6 +530,12 @@ def build_image_tiles(
     image_path: str,
     acquisition_details_factory: Callable[[Any], AcquisitionDetails],
     scale_m: float | None,
+    read_selection_factory: Callable[[Any], LifReadSelection] | None = None,
+    file_path: str | None = None,
+    io_profile: LifIOProfile | None = None,
+    roi: LifSpatialRoi | None = None,
+    grid: LifGridSnapping | None = None,
+    empty_check: LifEmptyTileCheck | None = None,
 ) -> list[Tile]:
     """Build ``Tile`` objects for a single (non-plate) acquisition group.
 
@@ -275,12 +549,26 @@ def build_image_tiles(
             for a given ``LifImage``.
         scale_m: Override for the LIF metres-per-micrometre scale; falls back
             to ``1e-6`` (metres per micrometre) when ``None``.
+        read_selection_factory: Callable producing the ``LifReadSelection``
+            (channels, Z/T ranges) to read for a given ``LifImage``. Reads
+            every plane when ``None``.
+        file_path: Path or fsspec URL the loaders re-open the file from;
+            defaults to ``lif_file.filepath`` (which is local-only).
+        io_profile: How the loaders read each tile from disk; ``None`` leaves
+            reads to ``liffile``.
+        roi: Spatial region to convert; tiles outside it are dropped and
+            boundary tiles cropped. ``None`` keeps every tile whole.
+        grid: Snap mosaic tiles to their inferred regular grid; ``None``
+            places them at their stage positions.
+        empty_check: Classify tiles as empty before they are read, so the
+            compute task skips them; ``None`` writes every tile.
 
     Returns:
         Flat list of tiles for this group.
     """
     if not image_infos:
         return []
+    file_path = file_path or str(lif_file.filepath)
 
     image_type = image_infos[0].image_type
     collection = SingleImage(image_path=image_path)
@@ -294,26 +582,35 @@ def build_image_tiles(
         lif_image = lif_file.images[info.image_id]
         return _build_mosaic_tiles(
             lif_image=lif_image,
-            lif_file=lif_file,
+            file_path=file_path,
             image_id=info.image_id,
             collection=collection,
             acquisition_details=acquisition_details_factory(lif_image),
             scale_m=scale_m,
+            selection=_resolve_selection(lif_image, read_selection_factory),
+            io_profile=io_profile,
+            roi=roi,
+            grid=grid,
+            empty_check=empty_check,
         )
 
     multi = len(image_infos) > 1
     tiles: list[Tile] = []
     for idx, info in enumerate(image_infos):
         lif_image = lif_file.images[info.image_id]
-        tiles.append(
-            _build_single_tile(
-                lif_image=lif_image,
-                lif_file=lif_file,
-                image_id=info.image_id,
-                fov_name=_single_fov_name(info, idx, multi=multi),
-                collection=collection,
-                acquisition_details=acquisition_details_factory(lif_image),
-                scale_m=scale_m,
-            )
+        tile = _build_single_tile(
+            lif_image=lif_image,
+            file_path=file_path,
+            image_id=info.image_id,
+            fov_name=_single_fov_name(info, idx, multi=multi),
+            collection=collection,
+            acquisition_details=acquisition_details_factory(lif_image),
+            scale_m=scale_m,
+            selection=_resolve_selection(lif_image, read_selection_factory),
+            io_profile=io_profile,
+            roi=roi,
+            empty_check=empty_check,
         )
+        if tile is not None:
+            tiles.append(tile)
     return tiles
@@ -0,0 +1,290 @@
+"""Compact, columnar serialization of a ``TiledImage`` for the compute tasks.
+
+The default serialization repeats, for every tile of a mosaic, its ROI (name,
+four axis slices, stage origin) and its ``LifMosaicLoader`` (file path, image
+id, tile index, read selection, I/O profile). For large mosaics the JSON
+handed to each compute task grows to many MB and validating it tile by tile
+takes seconds. Here each field becomes one column, stored once when it is
+the same for every tile::
+
+    {"lif_tile_table": 1, "image": {...}, "num_tiles": 2500,
+     "columns": {"roi.name": ["FOV_0", ...], "loader.file_path": {"value": ...},
+                 "loader.selection": {"distinct": [{...}], "index": [0, ...]},
+                 "roi.slices.x.start": [0.0, 48.0, ...], ...}}
+
+Decoding validates every distinct loader option (read selection, I/O
+profile, empty-tile check) once and builds the tiles from the columns,
+sharing those objects, instead of parsing and validating the nested JSON of
+every tile; the decoded ``TiledImage`` dumps to the same JSON as the
+original.
+Run ``python benchmarks/tile_table.py`` to compare both formats.
+
+The init tasks set the collection up like the library's
+``setup_images_for_conversion``, but build the parallelization list from the
+tables directly, so the default JSON of an image is never produced.
+"""
+
+import json
+import logging
+import os
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from ngio import Roi, RoiSlice
+from ome_zarr_converters_tools import (
+    ConverterOptions,
+    ConvertParallelInitArgs,
+    OverwriteMode,
+    TiledImage,
+    filesystem_for_url,
+    join_url_paths,
+)
+from ome_zarr_converters_tools.core import TileSlice
+from ome_zarr_converters_tools.fractal import (
+    cleanup_if_exists,
+    dump_json_str,
+    tiled_image_from_json_str,
+)
+from ome_zarr_converters_tools.models import DefaultNgffVersion, NgffVersions
+from ome_zarr_converters_tools.pipelines import setup_ome_zarr_collection
+
+from fractal_lif_converters.common._loaders import (
+    LifEmptyTileCheck,
+    LifIOProfile,
+    LifMosaicLoader,
+    LifReadSelection,
+)
+
+logger = logging.getLogger(__name__)
+
+TILE_TABLE_VERSION = 1
+_PREFIX = '{"lif_tile_table":'
+# Loader fields usually shared by many tiles, stored as lookup columns.
+_SHARED_FIELDS = {
+    "selection": LifReadSelection,
+    "io_profile": LifIOProfile,
+    "empty_check": LifEmptyTileCheck,
+}
+
+
+def _encode_column(values: Sequence[Any], distinct: bool = False) -> Any:
+    """A constant column as ``{"value": v}``, else the values or a lookup."""
+    first = values[0]
+    if all(value == first for value in values):
+        return {"value": first}
+    if not distinct:
+        return list(values)
+    keys: dict[str, int] = {}
+    table: list[Any] = []
+    index = []
+    for value in values:
+        key = json.dumps(value, sort_keys=True)
+        if key not in keys:
+            keys[key] = len(table)
+            table.append(value)
+        index.append(keys[key])
+    return {"distinct": table, "index": index}
+
+
+def _decode_column(column: Any, num_tiles: int, parse=None) -> list[Any]:
+    if isinstance(column, list):
+        return column
+    if "value" in column:
+        value = column["value"] if parse is None else parse(column["value"])
+        return [value] * num_tiles
+    table = column["distinct"]
+    if parse is not None:
+        table = [parse(value) for value in table]
+    return [table[i] for i in column["index"]]
+
+
+def encode_tiled_image(tiled_image: TiledImage) -> str:
+    """Serialize ``tiled_image`` as a tile table.
+
+    Falls back to ``model_dump_json`` for images without tiles, with tiles
+    not loaded by ``LifMosaicLoader`` or whose ROIs span different axes.
+    """
+    regions = tiled_image.regions
+    if not regions or not all(
+        isinstance(region.image_loader, LifMosaicLoader) for region in regions
+    ):
+        return tiled_image.model_dump_json()
+    rois = [region.roi.model_dump(mode="json") for region in regions]
+    axes = [s["axis_name"] for s in rois[0]["slices"]]
+    if any([s["axis_name"] for s in roi["slices"]] != axes for roi in rois):
+        return tiled_image.model_dump_json()
+    loaders = [region.image_loader.model_dump(mode="json") for region in regions]
+
+    columns: dict[str, Any] = {}
+    for key in rois[0]:
+        if key != "slices":
+            columns[f"roi.{key}"] = _encode_column([roi.get(key) for roi in rois])
+    for i, axis in enumerate(axes):
+        for field in ("start", "length"):
+            columns[f"roi.slices.{axis}.{field}"] = _encode_column(
+                [roi["slices"][i][field] for roi in rois]
+            )
+    for key in ("file_path", "image_id", "m"):
+        columns[f"loader.{key}"] = _encode_column([loader[key] for loader in loaders])
+    for key in _SHARED_FIELDS:
+        columns[f"loader.{key}"] = _encode_column(
+            [loader[key] for loader in loaders], distinct=True
+        )
+    header = tiled_image.model_dump(mode="json", exclude={"regions"})
+    # The marker key goes first so tables are recognized from their prefix.
+    return json.dumps(
+        {
+            "lif_tile_table": TILE_TABLE_VERSION,
+            "image": header,
+            "num_tiles": len(regions),
+            "axes": axes,
+            "columns": columns,
+        },
+        separators=(",", ":"),
+    )
+
+
+def is_tile_table(json_str: str) -> bool:
+    """Whether ``json_str`` was written by ``encode_tiled_image`` as a table."""
+    return json_str.startswith(_PREFIX)
+
+
+def decode_tiled_image(json_str: str, collection_type: type) -> TiledImage:
+    """Deserialize a ``TiledImage`` written by ``encode_tiled_image``."""
+    if not is_tile_table(json_str):
+        return tiled_image_from_json_str(
+            json_str=json_str,
+            collection_type=collection_type,
+            image_loader_type=LifMosaicLoader,
+        )
+    table = json.loads(json_str)
+    if table["lif_tile_table"] != TILE_TABLE_VERSION:
+        raise ValueError(f"Unsupported tile table version {table['lif_tile_table']}.")
+    num_tiles = table["num_tiles"]
+    columns = table["columns"]
+
+    def column(name: str, parse=None) -> list[Any]:
+        return _decode_column(columns[name], num_tiles, parse)
+
+    roi_keys = [
+        key.removeprefix("roi.")
+        for key in columns
+        if key.startswith("roi.") and not key.startswith("roi.slices.")
+    ]
+    roi_fields = {key: column(f"roi.{key}") for key in roi_keys}
+    slices = {
+        axis: (column(f"roi.slices.{axis}.start"), column(f"roi.slices.{axis}.length"))
+        for axis in table["axes"]
+    }
+    file_paths = column("loader.file_path")
+    image_ids = column("loader.image_id")
+    ms = column("loader.m")
+    # Validated once per distinct value, and shared by the loaders using it.
+    shared = {
+        key: column(
+            f"loader.{key}",
+            lambda value, model=model: (
+                None if value is None else model.model_validate(value)
+            ),
+        )
+        for key, model in _SHARED_FIELDS.items()
+        if f"loader.{key}" in columns
+    }
+
+    regions = []
+    for i in range(num_tiles):
+        roi = Roi(
+            slices=[
+                RoiSlice(axis_name=axis, start=starts[i], length=lengths[i])
+                for axis, (starts, lengths) in slices.items()
+            ],
+            **{key: values[i] for key, values in roi_fields.items()},
+        )
+        loader = LifMosaicLoader(
+            file_path=file_paths[i],
+            image_id=image_ids[i],
+            m=ms[i],
+            **{key: values[i] for key, values in shared.items()},
+        )
+        regions.append(TileSlice(roi=roi, image_loader=loader))
+    tiled_image = TiledImage[collection_type, LifMosaicLoader].model_validate(
+        table["image"]
+    )
+    tiled_image.regions = regions
+    return tiled_image
+
+
+def read_json_dump(url: str) -> str:
+    """Read a JSON dump, retrying while it is not visible yet.
+
+    Same retries as ``ome_zarr_converters_tools.fractal.tiled_image_from_json``.
+    """
+    num_retries = int(os.getenv("CONVERTERS_TOOLS_NUM_RETRIES", 5))
+    if num_retries < 1:
+        raise ValueError("NUM_RETRIES must be greater than 0")
+    for t in range(num_retries):
+        try:
+            fs = filesystem_for_url(url, error_msg_prefix="Loading JSON")
+            with fs.open(url, "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            logger.error(f"JSON file does not exist: {url}, retrying...")
+            time.sleep(2 ** (t + 1))
+    raise FileNotFoundError(
+        f"JSON file does not exist after {num_retries} retries: {url}"
+    )
+
+
+def setup_lif_images_for_conversion(
+    tiled_images: list[TiledImage],
+    *,
+    zarr_dir: str,
+    collection_type: str,
+    converter_options: ConverterOptions,
+    overwrite_mode: OverwriteMode = OverwriteMode.NO_OVERWRITE,
+    ngff_version: NgffVersions = DefaultNgffVersion,
+) -> list[dict]:
+    """``setup_images_for_conversion`` with images encoded as tile tables.
+
+    Sets the collection up like the library, then builds one item per image
+    from its table. Whether the tables are passed in memory or dumped to
+    temporary JSON files is decided on their total size.
+    """
+    setup_ome_zarr_collection(
+        tiled_images=tiled_images,
+        collection_type=collection_type,
+        zarr_dir=zarr_dir,
+        ngff_version=ngff_version,
+        overwrite_mode=overwrite_mode,
+    )
+    temp_json_options = converter_options.runtime_settings.temp_json_options
+    json_strs = [encode_tiled_image(image) for image in tiled_images]
+    total_bytes = sum(len(json_str.encode()) for json_str in json_strs)
+    in_memory = temp_json_options.use_in_memory(total_bytes)
+    temp_json_url = temp_json_options.format_temp_url(zarr_dir=zarr_dir)
+    if not in_memory:
+        cleanup_if_exists(temp_json_url=temp_json_url)
+
+    parallelization_list = []
+    for image, json_str in zip(tiled_images, json_strs, strict=True):
+        if in_memory:
+            serialized = {"tiled_image_json_str": json_str}
+        else:
+            serialized = {
+                "tiled_image_json_dump_url": dump_json_str(
+                    temp_json_url=temp_json_url, json_str=json_str
+                )
+            }
+        init_args = ConvertParallelInitArgs(
+            **serialized,
+            converter_options=converter_options,
+            overwrite_mode=overwrite_mode,
+        )
+        parallelization_list.append(
+            {
+                "zarr_url": join_url_paths(zarr_dir, image.path),
+                "init_args": init_args.model_dump(exclude=None),
+            }
+        )
+    return parallelization_list
@@ -1,9 +1,8 @@
 """Common utilities for fractal LIF converters."""
 
 import logging
-from typing import Protocol, TypeVar
+from typing import TYPE_CHECKING, Protocol, TypeVar
 
-import polars
 from ome_zarr_converters_tools import (
     AcquisitionOptions,
     AttributeType,
@@ -12,6 +11,9 @@ from ome_zarr_converters_tools import (
 )
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    import polars
+
 logger = logging.getLogger("lif_converters_compute_task")
 
 STANDARD_ROWS_NAMES = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
@@ -46,9 +48,11 @@ class BaseAcquisitionModel(BaseModel):
         name = self.path.rstrip("/").split("/")[-1]
         return name
 
-    def get_condition_table(self) -> polars.DataFrame | None:
+    def get_condition_table(self) -> "polars.DataFrame | None":
         """Get the path to the condition table if it exists."""
         if self.advanced.condition_table_path is not None:
+            import polars
+
             try:
                 return polars.read_csv(self.advanced.condition_table_path)
             except Exception as e:
@@ -119,7 +123,7 @@ def parse_acquisitions(
 
 
 def get_attributes_from_condition_table(
-    condition_table: polars.DataFrame | None,
+    condition_table: "polars.DataFrame | None",
     row: str,
     column: int,
     acquisition: int = 0,
@@ -127,6 +131,8 @@ def get_attributes_from_condition_table(
     """Get the attributes from the condition table."""
     if condition_table is None:
         return {}
+    import polars
+
     columns = condition_table.columns
     columns_lower = [col.lower() for col in columns]
     if "row" not in columns_lower:
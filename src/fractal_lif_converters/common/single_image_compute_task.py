@@ -1,21 +1,21 @@
-# Decision (session 02): Option B — pass LifSingleLoader as image_loader_type so
-# Pydantic instantiates the correct loader subclass when validating the JSON dump.
-# (Option A / DefaultImageLoader would silently drop image_id and call the wrong
-# load_data at compute time.) Accepts the back-import from common to lif.
+# Decision (session 02): Option B — lif_compute_task passes LifMosaicLoader as
+# image_loader_type so Pydantic instantiates the correct loader subclass when
+# validating the JSON dump. (Option A / DefaultImageLoader would silently drop
+# image_id and call the wrong load_data at compute time.)
 """Compute task for single-image LIF acquisitions."""
 
 import logging
 import time
 
 from ome_zarr_converters_tools import (
-    ConvertParallelInitArgs,
     ImageListUpdateDict,
     SingleImage,
-    generic_compute_task,
 )
 from pydantic import validate_call
 
-from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._channel_stats import format_channel_stats
+from fractal_lif_converters.common._compute import lif_compute_task
+from fractal_lif_converters.common._init_args import LifConvertInitArgs
 
 logger = logging.getLogger(__name__)
 
@@ -25,24 +25,25 @@ def single_image_compute_task(
     *,
     # Fractal parameters
     zarr_url: str,
-    init_args: ConvertParallelInitArgs,
+    init_args: LifConvertInitArgs,
 ) -> ImageListUpdateDict:
     """Create a single OME-Zarr image from a single-position LIF acquisition.
 
     Args:
         zarr_url (str): URL to the OME-Zarr file.
-        init_args (ConvertParallelInitArgs): Arguments for the compute task.
+        init_args (LifConvertInitArgs): Arguments for the compute task,
+            optionally restricted to one shard of the image.
     """
     timer = time.time()
-    img_list_update = generic_compute_task(
+    img_list_update, stats = lif_compute_task(
         zarr_url=zarr_url,
         init_args=init_args,
         collection_type=SingleImage,
-        image_loader_type=LifMosaicLoader,
     )
     zarr_output = img_list_update["image_list_updates"][0]["zarr_url"]
     run_time = time.time() - timer
     logger.info(f"Successfully converted: {zarr_output}, in {run_time:.2f}[s]")
+    logger.info(f"Channel statistics of {zarr_output}: {format_channel_stats(stats)}")
     return img_list_update
 
 
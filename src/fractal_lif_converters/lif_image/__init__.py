@@ -1,6 +1,6 @@
 """LIF image-conversion module."""
 
-from fractal_lif_converters.lif_image.api import convert_lif_image
+from fractal_lif_converters.lif_image.api import convert_lif_image, plan_lif_image
 from fractal_lif_converters.lif_image.convert_lif_image_init_task import (
     LifImageAcquisitionModel,
     convert_lif_image_init_task,
@@ -10,4 +10,5 @@ __all__ = [
     "LifImageAcquisitionModel",
     "convert_lif_image",
     "convert_lif_image_init_task",
+    "plan_lif_image",
 ]
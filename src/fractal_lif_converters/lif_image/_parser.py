@@ -16,6 +16,7 @@ from ome_zarr_converters_tools import (
     tiles_aggregation_pipeline,
 )
 
+from fractal_lif_converters.common._remote import open_lif_source
 from fractal_lif_converters.common._string_validation import (
     validate_position_name_type1,
     validate_position_name_type2,
@@ -27,6 +28,8 @@ from fractal_lif_converters.common._tile_builders import (
 )
 
 if TYPE_CHECKING:
+    from fractal_lif_converters.common._loaders import LifReadSelection
+    from fractal_lif_converters.common._options import LifPreviewOptions
     from fractal_lif_converters.lif_image.convert_lif_image_init_task import (
         LifImageAcquisitionModel,
     )
@@ -86,13 +89,14 @@ def _simple_parse_lif_infos(
     return {sanitized: images}, discarded
 
 
-def _wildcard_parse_lif_infos(
-    lif_file: liffile.LifFile,
-) -> tuple[dict[str, list[_ImageInfo]], set[str]]:
-    """Discover all scans (wildcard mode).
+def _base_scan_names(lif_file: liffile.LifFile) -> tuple[set[str], set[str]]:
+    """Collect the (unsanitized) base scan names of every image in the file.
+
+    Recognized position suffixes are stripped; mosaic images keep their full
+    hierarchical name as the scan name.
 
-    Collects base scan names by stripping recognized position suffixes; mosaic
-    images keep their full hierarchical name as the scan name.
+    Returns:
+        The base scan names and the names of the images that fit no layout.
     """
     base_scan_names: set[str] = set()
     discarded: set[str] = set()
@@ -115,7 +119,14 @@ def _wildcard_parse_lif_infos(
             base_scan_names.add(name)
         else:
             discarded.add(name)
+    return base_scan_names, discarded
 
+
+def _wildcard_parse_lif_infos(
+    lif_file: liffile.LifFile,
+) -> tuple[dict[str, list[_ImageInfo]], set[str]]:
+    """Discover all scans (wildcard mode), see ``_base_scan_names``."""
+    base_scan_names, discarded = _base_scan_names(lif_file)
     images: dict[str, list[_ImageInfo]] = {}
     for base in base_scan_names:
         _images, _disc = _simple_parse_lif_infos(lif_file, base)
@@ -134,21 +145,27 @@ def _pixel_size_um(lif_image: Any, dim: str) -> float:
 
 def _make_acquisition_details_factory(
     acquisition_model: LifImageAcquisitionModel,
+    preview: LifPreviewOptions | None = None,
 ):
+    xy_step = preview.xy_step if preview is not None else 1
+    t_step = preview.t_step if preview is not None else 1
+
     def _factory(lif_image: Any) -> AcquisitionDetails:
-        scale_x = _pixel_size_um(lif_image, "X")
-        scale_y = _pixel_size_um(lif_image, "Y")
+        scale_x = _pixel_size_um(lif_image, "X") * xy_step
+        scale_y = _pixel_size_um(lif_image, "Y") * xy_step
         scale_z = _pixel_size_um(lif_image, "Z")
         if abs(scale_x - scale_y) > 1e-9:
             logger.warning(
                 f"Pixel size x ({scale_x}) and y ({scale_y}) are not equal. "
                 "Using x size for pixelsize."
             )
-        shape_t = lif_image.sizes.get("T", 1)
+        sizes = dict(lif_image.sizes)
+        selection = acquisition_model.advanced.read_selection(sizes, preview)
+        shape_t = selection.shape_5d(sizes)[0]
         details = AcquisitionDetails(
             pixelsize=scale_x,
             z_spacing=scale_z,
-            t_spacing=1.0,
+            t_spacing=float(t_step),
             channels=None,
             axes=default_axes_builder(is_time_series=shape_t > 1),
             start_x_coo="world",
@@ -167,14 +184,25 @@ def _make_acquisition_details_factory(
     return _factory
 
 
+def _make_read_selection_factory(
+    acquisition_model: LifImageAcquisitionModel,
+    preview: LifPreviewOptions | None = None,
+):
+    def _factory(lif_image: Any) -> LifReadSelection:
+        return acquisition_model.advanced.read_selection(dict(lif_image.sizes), preview)
+
+    return _factory
+
+
 def parse_lif_image_metadata(
     *,
     acquisition_model: LifImageAcquisitionModel,
     converter_options: ConverterOptions,
+    preview: LifPreviewOptions | None = None,
 ) -> list[TiledImage]:
     """Parse LIF image metadata and return ``TiledImage`` objects."""
     lif_path = acquisition_model.path
-    lif_file = liffile.LifFile(lif_path, squeeze=False)
+    lif_file = liffile.LifFile(open_lif_source(lif_path), squeeze=False)
 
     if acquisition_model.tile_scan_name is not None:
         images, discarded = _simple_parse_lif_infos(
@@ -190,7 +218,8 @@ def parse_lif_image_metadata(
         )
 
     lif_stem = Path(lif_path).stem
-    factory = _make_acquisition_details_factory(acquisition_model)
+    factory = _make_acquisition_details_factory(acquisition_model, preview)
+    read_selection_factory = _make_read_selection_factory(acquisition_model, preview)
 
     all_tiles: list[Tile] = []
     for scan_name, image_infos in images.items():
@@ -205,6 +234,12 @@ def parse_lif_image_metadata(
             image_path=image_path,
             acquisition_details_factory=factory,
             scale_m=acquisition_model.advanced.position_scale,
+            read_selection_factory=read_selection_factory,
+            io_profile=acquisition_model.advanced.io_profile,
+            roi=acquisition_model.advanced.roi,
+            grid=acquisition_model.advanced.grid,
+            empty_check=acquisition_model.advanced.skip_empty,
+            file_path=lif_path,
         )
         all_tiles.extend(tiles)
 
@@ -1,11 +1,13 @@
 """Initialize the LIF image to OME-Zarr conversion task."""
 
 import logging
+from functools import partial
 
 from ome_zarr_converters_tools import (
     ConverterOptions,
     OverwriteMode,
-    setup_images_for_conversion,
+    SingleImage,
+    TiledImage,
 )
 from pydantic import Field, model_validator, validate_call
 
@@ -13,7 +15,22 @@ from fractal_lif_converters.common import (
     BaseAcquisitionModel,
     parse_acquisitions,
 )
-from fractal_lif_converters.common._options import LifAcquisitionOptions
+from fractal_lif_converters.common._compute import shard_parallelization_list
+from fractal_lif_converters.common._options import (
+    LifAcquisitionOptions,
+    LifAxisSharding,
+    LifCatalogSelection,
+    LifPreviewOptions,
+    ProjectionMode,
+)
+from fractal_lif_converters.common._plan import plan_conversion
+from fractal_lif_converters.common._projections import (
+    collect_projections,
+    projection_parallelization_list,
+)
+from fractal_lif_converters.common._resume import skip_completed_images
+from fractal_lif_converters.common._sharding import collect_axis_sharding
+from fractal_lif_converters.common._tile_table import setup_lif_images_for_conversion
 from fractal_lif_converters.lif_image._parser import parse_lif_image_metadata
 
 logger = logging.getLogger("convert_lif_image_task")
@@ -54,6 +71,59 @@ class LifImageAcquisitionModel(BaseAcquisitionModel):
         return self
 
 
+def _catalog_acquisitions(
+    catalog: LifCatalogSelection,
+) -> list[LifImageAcquisitionModel]:
+    """One named-mode acquisition per catalog scan matching ``catalog``."""
+    # Imported here so that polars is only loaded when a catalog is used.
+    from fractal_lif_converters.catalog import select_catalog_scans
+
+    return [
+        LifImageAcquisitionModel(
+            path=path, tile_scan_name=scan, advanced=catalog.advanced
+        )
+        for path, scan in select_catalog_scans(catalog, "image")
+    ]
+
+
+def _parse_tiled_images(
+    *,
+    zarr_dir: str,
+    acquisitions: list[LifImageAcquisitionModel],
+    converter_options: ConverterOptions,
+    overwrite: OverwriteMode,
+    preview: LifPreviewOptions | None,
+    catalog: LifCatalogSelection | None,
+) -> tuple[
+    list[TiledImage], dict[str, LifAxisSharding], dict[str, list[ProjectionMode]]
+]:
+    """Parse the acquisitions into the images still to convert.
+
+    Returns:
+        The images, the sharding options of the sharded ones and the Z
+        projections of the projected ones, by path.
+    """
+    if catalog is not None:
+        acquisitions = [*acquisitions, *_catalog_acquisitions(catalog)]
+    shardings: dict[str, LifAxisSharding] = {}
+    projections: dict[str, list[ProjectionMode]] = {}
+    tiled_images = parse_acquisitions(
+        parse_function=collect_projections(
+            collect_axis_sharding(
+                partial(parse_lif_image_metadata, preview=preview), shardings
+            ),
+            projections,
+        ),
+        acquisitions=acquisitions,
+        converter_options=converter_options,
+    )
+    if overwrite == OverwriteMode.EXTEND:
+        tiled_images = skip_completed_images(
+            tiled_images, zarr_dir=zarr_dir, converter_options=converter_options
+        )
+    return tiled_images, shardings, projections
+
+
 @validate_call
 def convert_lif_image_init_task(
     *,
@@ -63,6 +133,9 @@ def convert_lif_image_init_task(
     acquisitions: list[LifImageAcquisitionModel],
     converter_options: ConverterOptions = default_converter_options,
     overwrite: OverwriteMode = OverwriteMode.NO_OVERWRITE,
+    preview: LifPreviewOptions | None = None,
+    catalog: LifCatalogSelection | None = None,
+    dry_run: bool = False,
 ):
     """Initialize the task to convert a LIF image dataset to OME-Zarr.
 
@@ -71,15 +144,42 @@ def convert_lif_image_init_task(
         acquisitions (list[LifImageAcquisitionModel]): List of raw acquisitions
             to convert to OME-Zarr.
         converter_options (ConverterOptions): Advanced converter options.
-        overwrite (OverwriteMode): Overwrite mode for existing data.
+        overwrite (OverwriteMode): Overwrite mode for existing data. In
+            ``EXTEND`` mode, images already fully converted from the same
+            source and options are skipped and interrupted ones are resumed.
+        preview (LifPreviewOptions | None): If set, write a decimated
+            quick-look conversion (subsampled Y/X, single or max-projected Z,
+            subset of T) instead of the full-resolution data.
+        catalog (LifCatalogSelection | None): If set, also convert every
+            (file, tile scan) of a LIF catalog with an image matching its
+            query. Selecting does not open the LIF files.
+        dry_run (bool): Only discover the images and build the tiles, then
+            log the number of compute tasks, the bytes read and written, the
+            peak memory per task and the estimated wall time. Nothing is
+            written and no compute task is started.
     """
-    tiled_images = parse_acquisitions(
-        parse_function=parse_lif_image_metadata,
+    tiled_images, shardings, projections = _parse_tiled_images(
+        zarr_dir=zarr_dir,
         acquisitions=acquisitions,
         converter_options=converter_options,
+        overwrite=overwrite,
+        preview=preview,
+        catalog=catalog,
     )
-
-    parallelization_list = setup_images_for_conversion(
+    if overwrite == OverwriteMode.EXTEND and not tiled_images:
+        logger.info("All images are already converted.")
+        return {"parallelization_list": []}
+    if dry_run:
+        plan = plan_conversion(
+            tiled_images,
+            converter_options,
+            shardings=shardings,
+            projections=projections,
+        )
+        logger.info(f"Dry run, nothing was written. Plan:\n{plan.summary()}")
+        return {"parallelization_list": []}
+
+    parallelization_list = setup_lif_images_for_conversion(
         tiled_images=tiled_images,
         zarr_dir=zarr_dir,
         converter_options=converter_options,
@@ -87,6 +187,21 @@ def convert_lif_image_init_task(
         overwrite_mode=overwrite,
         ngff_version=converter_options.omezarr_options.ngff_version,
     )
+    if projections:
+        parallelization_list = projection_parallelization_list(
+            parallelization_list,
+            zarr_dir=zarr_dir,
+            tiled_images=tiled_images,
+            projections=projections,
+        )
+    if shardings:
+        parallelization_list = shard_parallelization_list(
+            parallelization_list,
+            zarr_dir=zarr_dir,
+            shardings=shardings,
+            collection_type=SingleImage,
+            overwrite_mode=overwrite,
+        )
     logger.info(
         f"Prepared parallelization list with {len(parallelization_list)} items."
     )
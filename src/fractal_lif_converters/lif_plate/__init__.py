@@ -1,6 +1,6 @@
 """LIF plate-conversion module."""
 
-from fractal_lif_converters.lif_plate.api import convert_lif_plate
+from fractal_lif_converters.lif_plate.api import convert_lif_plate, plan_lif_plate
 from fractal_lif_converters.lif_plate.convert_lif_plate_init_task import (
     LifPlateAcquisitionModel,
     convert_lif_plate_init_task,
@@ -10,4 +10,5 @@ __all__ = [
     "LifPlateAcquisitionModel",
     "convert_lif_plate",
     "convert_lif_plate_init_task",
+    "plan_lif_plate",
 ]
@@ -16,6 +16,7 @@ from ome_zarr_converters_tools import (
     tiles_aggregation_pipeline,
 )
 
+from fractal_lif_converters.common._remote import open_lif_source
 from fractal_lif_converters.common._string_validation import (
     validate_position_name_type1,
     validate_well_name_type1,
@@ -28,6 +29,8 @@ from fractal_lif_converters.common._tile_builders import (
 )
 
 if TYPE_CHECKING:
+    from fractal_lif_converters.common._loaders import LifReadSelection
+    from fractal_lif_converters.common._options import LifPreviewOptions
     from fractal_lif_converters.lif_plate.convert_lif_plate_init_task import (
         LifPlateAcquisitionModel,
     )
@@ -160,21 +163,27 @@ def _pixel_size_um(lif_image: Any, dim: str) -> float:
 
 def _make_acquisition_details_factory(
     acquisition_model: LifPlateAcquisitionModel,
+    preview: LifPreviewOptions | None = None,
 ):
+    xy_step = preview.xy_step if preview is not None else 1
+    t_step = preview.t_step if preview is not None else 1
+
     def _factory(lif_image: Any) -> AcquisitionDetails:
-        scale_x = _pixel_size_um(lif_image, "X")
-        scale_y = _pixel_size_um(lif_image, "Y")
+        scale_x = _pixel_size_um(lif_image, "X") * xy_step
+        scale_y = _pixel_size_um(lif_image, "Y") * xy_step
         scale_z = _pixel_size_um(lif_image, "Z")
         if abs(scale_x - scale_y) > 1e-9:
             logger.warning(
                 f"Pixel size x ({scale_x}) and y ({scale_y}) are not equal. "
                 "Using x size for pixelsize."
             )
-        shape_t = lif_image.sizes.get("T", 1)
+        sizes = dict(lif_image.sizes)
+        selection = acquisition_model.advanced.read_selection(sizes, preview)
+        shape_t = selection.shape_5d(sizes)[0]
         details = AcquisitionDetails(
             pixelsize=scale_x,
             z_spacing=scale_z,
-            t_spacing=1.0,
+            t_spacing=float(t_step),
             channels=None,
             axes=default_axes_builder(is_time_series=shape_t > 1),
             start_x_coo="world",
@@ -193,14 +202,25 @@ def _make_acquisition_details_factory(
     return _factory
 
 
+def _make_read_selection_factory(
+    acquisition_model: LifPlateAcquisitionModel,
+    preview: LifPreviewOptions | None = None,
+):
+    def _factory(lif_image: Any) -> LifReadSelection:
+        return acquisition_model.advanced.read_selection(dict(lif_image.sizes), preview)
+
+    return _factory
+
+
 def parse_lif_plate_metadata(
     *,
     acquisition_model: LifPlateAcquisitionModel,
     converter_options: ConverterOptions,
+    preview: LifPreviewOptions | None = None,
 ) -> list[TiledImage]:
     """Parse LIF plate metadata and return a list of ``TiledImage`` objects."""
     lif_path = acquisition_model.path
-    lif_file = liffile.LifFile(lif_path, squeeze=False)
+    lif_file = liffile.LifFile(open_lif_source(lif_path), squeeze=False)
     plates = _parse_lif_plate_infos(
         lif_file,
         scan_name=acquisition_model.tile_scan_name,
@@ -208,7 +228,8 @@ def parse_lif_plate_metadata(
     )
 
     lif_stem = Path(lif_path).stem
-    factory = _make_acquisition_details_factory(acquisition_model)
+    factory = _make_acquisition_details_factory(acquisition_model, preview)
+    read_selection_factory = _make_read_selection_factory(acquisition_model, preview)
 
     all_tiles: list[Tile] = []
     for scan_name, image_infos in plates.items():
@@ -225,6 +246,12 @@ def parse_lif_plate_metadata(
                 acquisition_id=acquisition_model.acquisition_id,
                 acquisition_details_factory=factory,
                 scale_m=acquisition_model.advanced.position_scale,
+                read_selection_factory=read_selection_factory,
+                io_profile=acquisition_model.advanced.io_profile,
+                roi=acquisition_model.advanced.roi,
+                grid=acquisition_model.advanced.grid,
+                empty_check=acquisition_model.advanced.skip_empty,
+                file_path=lif_path,
             )
             all_tiles.extend(tiles)
 
@@ -2,17 +2,27 @@
 
 from ome_zarr_converters_tools import (
     ConverterOptions,
+    ImageInPlate,
     OverwriteMode,
     RunnerType,
-    exec_compound_task,
 )
 from ome_zarr_converters_tools.fractal import ImageListUpdateDict
 
+from fractal_lif_converters.common._options import (
+    LifCatalogSelection,
+    LifPreviewOptions,
+)
+from fractal_lif_converters.common._plan import LifConversionPlan, plan_conversion
+from fractal_lif_converters.common._runner import (
+    LifLocalRunner,
+    exec_lif_compound_task,
+)
 from fractal_lif_converters.common.image_in_plate_compute_task import (
     image_in_plate_compute_task,
 )
 from fractal_lif_converters.lif_plate.convert_lif_plate_init_task import (
     LifPlateAcquisitionModel,
+    _parse_tiled_images,
     convert_lif_plate_init_task,
 )
 
@@ -23,7 +33,9 @@ def convert_lif_plate(
     acquisitions: list[LifPlateAcquisitionModel],
     converter_options: ConverterOptions | None = None,
     overwrite: OverwriteMode = OverwriteMode.NO_OVERWRITE,
-    runner: RunnerType | None = None,
+    runner: RunnerType | LifLocalRunner | None = None,
+    preview: LifPreviewOptions | None = None,
+    catalog: LifCatalogSelection | None = None,
 ) -> list[ImageListUpdateDict]:
     """Convert a LIF plate dataset to OME-Zarr.
 
@@ -33,7 +45,13 @@ def convert_lif_plate(
             convert to OME-Zarr.
         converter_options (ConverterOptions | None): Advanced converter options.
         overwrite (OverwriteMode): Overwrite mode for existing data.
-        runner (RunnerType | None): Execution strategy for compute tasks.
+        runner (RunnerType | LifLocalRunner | None): Execution strategy for
+            compute tasks. ``LifLocalRunner`` sizes a local process pool to the
+            available cores and memory.
+        preview (LifPreviewOptions | None): If set, write a decimated
+            quick-look conversion instead of the full-resolution data.
+        catalog (LifCatalogSelection | None): If set, also convert the
+            acquisitions of a LIF catalog matching its query.
 
     Returns:
         list[ImageListUpdateDict]: List of image list update dicts for the converted
@@ -45,10 +63,61 @@ def convert_lif_plate(
         "acquisitions": acquisitions,
         "converter_options": converter_options,
         "overwrite": overwrite,
+        "preview": preview,
+        "catalog": catalog,
     }
-    return exec_compound_task(
+    return exec_lif_compound_task(
         init_task_fn=convert_lif_plate_init_task,
         compute_task_fn=image_in_plate_compute_task,
         init_task_kwargs=init_task_kwargs,
+        collection_type=ImageInPlate,
         runner=runner,
     )
+
+
+def plan_lif_plate(
+    *,
+    zarr_dir: str,
+    acquisitions: list[LifPlateAcquisitionModel],
+    converter_options: ConverterOptions | None = None,
+    overwrite: OverwriteMode = OverwriteMode.NO_OVERWRITE,
+    preview: LifPreviewOptions | None = None,
+    catalog: LifCatalogSelection | None = None,
+    read_throughput: float | None = None,
+) -> LifConversionPlan:
+    """Estimate the cost of ``convert_lif_plate`` without writing anything.
+
+    Images are discovered and tiles built as for the conversion; the
+    arguments are the same as for ``convert_lif_plate``.
+
+    Args:
+        zarr_dir (str): Directory the Zarr files would be written to.
+        acquisitions (list[LifPlateAcquisitionModel]): List of raw acquisitions.
+        converter_options (ConverterOptions | None): Advanced converter options.
+        overwrite (OverwriteMode): Overwrite mode; in ``EXTEND`` mode, images
+            already converted are left out of the plan.
+        preview (LifPreviewOptions | None): Plan a decimated conversion.
+        catalog (LifCatalogSelection | None): Also plan the acquisitions of a
+            LIF catalog matching its query.
+        read_throughput (float | None): Read throughput in bytes/s for the
+            wall-time estimate; measured on a few tiles when ``None``.
+
+    Returns:
+        LifConversionPlan: Per-task and total cost estimates.
+    """
+    converter_options = converter_options or ConverterOptions()
+    tiled_images, shardings, projections = _parse_tiled_images(
+        zarr_dir=zarr_dir,
+        acquisitions=acquisitions,
+        converter_options=converter_options,
+        overwrite=overwrite,
+        preview=preview,
+        catalog=catalog,
+    )
+    return plan_conversion(
+        tiled_images,
+        converter_options,
+        read_throughput,
+        shardings=shardings,
+        projections=projections,
+    )
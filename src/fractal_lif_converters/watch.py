@@ -0,0 +1,255 @@
+"""Watch a folder and convert LIF files as soon as they are fully written.
+
+Microscopes write LIF files incrementally; a file is only picked up once its
+size and modification time have not changed for ``settle_seconds``. Stable
+files are dispatched to a local worker pool through a bounded queue and
+converted with ``OverwriteMode.EXTEND``, so a restarted watcher skips images
+that are already complete and resumes interrupted ones.
+
+Run it from the command line::
+
+    python -m fractal_lif_converters.watch /data/incoming /data/zarr --mode plate
+"""
+
+import argparse
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from ome_zarr_converters_tools import ConverterOptions, OverwriteMode
+from ome_zarr_converters_tools.fractal import ImageListUpdateDict
+
+from fractal_lif_converters.common._options import LifAcquisitionOptions
+
+logger = logging.getLogger(__name__)
+
+WatchMode = Literal["plate", "image"]
+
+
+def convert_lif_file(
+    path: str,
+    *,
+    zarr_dir: str,
+    mode: WatchMode = "plate",
+    converter_options: ConverterOptions | None = None,
+    advanced: LifAcquisitionOptions | None = None,
+) -> list[ImageListUpdateDict]:
+    """Convert one LIF file into ``zarr_dir`` (``EXTEND`` mode).
+
+    Module-level so it can be pickled into a worker process.
+    """
+    advanced = advanced or LifAcquisitionOptions()
+    if mode == "plate":
+        from fractal_lif_converters.lif_plate import (
+            LifPlateAcquisitionModel,
+            convert_lif_plate,
+        )
+
+        return convert_lif_plate(
+            zarr_dir=zarr_dir,
+            acquisitions=[LifPlateAcquisitionModel(path=path, advanced=advanced)],
+            converter_options=converter_options,
+            overwrite=OverwriteMode.EXTEND,
+        )
+    from fractal_lif_converters.lif_image import (
+        LifImageAcquisitionModel,
+        convert_lif_image,
+    )
+
+    return convert_lif_image(
+        zarr_dir=zarr_dir,
+        acquisitions=[LifImageAcquisitionModel(path=path, advanced=advanced)],
+        converter_options=converter_options,
+        overwrite=OverwriteMode.EXTEND,
+    )
+
+
+@dataclass
+class _FileState:
+    size: int
+    mtime_ns: int
+    unchanged_since: float
+
+
+class LifFolderWatcher:
+    """Poll a folder for settled LIF files and convert them in a worker pool."""
+
+    def __init__(
+        self,
+        folder: str | Path,
+        zarr_dir: str,
+        *,
+        mode: WatchMode = "plate",
+        converter_options: ConverterOptions | None = None,
+        advanced: LifAcquisitionOptions | None = None,
+        settle_seconds: float = 30.0,
+        poll_interval: float = 5.0,
+        recursive: bool = False,
+        max_workers: int = 1,
+        max_queue: int = 4,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a watcher; nothing is scanned until ``poll`` or ``run``.
+
+        Args:
+            folder: Folder the microscope writes LIF files into.
+            zarr_dir: Output directory for the OME-Zarr data.
+            mode: Convert each file as a plate (``"plate"``) or as single images
+                (``"image"``).
+            converter_options: Converter options used for every file.
+            advanced: LIF acquisition options used for every file.
+            settle_seconds: A file is converted once its size and modification
+                time have been unchanged for this long.
+            poll_interval: Seconds between two scans of ``folder``.
+            recursive: Also watch sub-folders.
+            max_workers: Size of the default process pool.
+            max_queue: Maximum number of files queued or converting at once. While
+                the queue is full, settled files wait for the next poll.
+            executor: Executor to submit conversions to; a process pool with
+                ``max_workers`` workers is created when ``None``.
+            clock: Monotonic clock, injectable for tests.
+        """
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1.")
+        self.folder = Path(folder)
+        self.zarr_dir = zarr_dir
+        self.mode: WatchMode = mode
+        self.converter_options = converter_options
+        self.advanced = advanced
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.recursive = recursive
+        self.max_queue = max_queue
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._clock = clock
+        self._pending: dict[Path, _FileState] = {}
+        # (size, mtime_ns) of files already dispatched, so a file is only
+        # converted again if it changes afterwards.
+        self._dispatched: dict[Path, tuple[int, int]] = {}
+        self._in_flight: dict[Path, Future] = {}
+
+    def _scan(self) -> list[Path]:
+        # Leica exports are named ``*.lif`` or ``*.LIF``.
+        paths = self.folder.rglob("*") if self.recursive else self.folder.glob("*")
+        return sorted(p for p in paths if p.suffix.lower() == ".lif" and p.is_file())
+
+    def _settled(self, path: Path, now: float) -> tuple[int, int] | None:
+        """Update the settle state of ``path``; return its stat once settled."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._pending.pop(path, None)
+            return None
+        key = (stat.st_size, stat.st_mtime_ns)
+        state = self._pending.get(path)
+        if state is None or (state.size, state.mtime_ns) != key:
+            self._pending[path] = _FileState(*key, unchanged_since=now)
+            return None
+        if now - state.unchanged_since < self.settle_seconds:
+            return None
+        return key
+
+    def _on_done(self, path: Path, future: Future) -> None:
+        self._in_flight.pop(path, None)
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Conversion of {path} failed: {error!r}")
+            return
+        updates = future.result()
+        logger.info(f"Converted {path}: {len(updates)} image(s).")
+
+    def poll(self) -> list[Path]:
+        """Scan the folder once and dispatch settled files.
+
+        Returns:
+            The files dispatched by this poll.
+        """
+        now = self._clock()
+        dispatched: list[Path] = []
+        for path in self._scan():
+            if path in self._in_flight:
+                continue
+            key = self._settled(path, now)
+            if key is None or self._dispatched.get(path) == key:
+                continue
+            if len(self._in_flight) >= self.max_queue:
+                logger.debug(f"Queue full, {path} waits for the next poll.")
+                break
+            logger.info(f"Dispatching settled LIF file: {path}")
+            future = self._executor.submit(
+                convert_lif_file,
+                str(path),
+                zarr_dir=self.zarr_dir,
+                mode=self.mode,
+                converter_options=self.converter_options,
+                advanced=self.advanced,
+            )
+            self._dispatched[path] = key
+            self._pending.pop(path, None)
+            self._in_flight[path] = future
+            future.add_done_callback(lambda f, p=path: self._on_done(p, f))
+            dispatched.append(path)
+        return dispatched
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Poll until ``stop`` is set (or forever), then wait for workers."""
+        stop = stop or threading.Event()
+        logger.info(f"Watching {self.folder} for LIF files.")
+        try:
+            while not stop.is_set():
+                self.poll()
+                stop.wait(self.poll_interval)
+        finally:
+            self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work; wait for running conversions if ``wait``."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+        elif wait:
+            for future in list(self._in_flight.values()):
+                future.exception()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point of the folder watcher."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", help="Folder the LIF files are written into.")
+    parser.add_argument("zarr_dir", help="Output directory for the OME-Zarr data.")
+    parser.add_argument("--mode", choices=["plate", "image"], default="plate")
+    parser.add_argument("--settle-seconds", type=float, default=30.0)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-queue", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    watcher = LifFolderWatcher(
+        args.folder,
+        args.zarr_dir,
+        mode=args.mode,
+        settle_seconds=args.settle_seconds,
+        poll_interval=args.poll_interval,
+        recursive=args.recursive,
+        max_workers=args.workers,
+        max_queue=args.max_queue,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Stopping watcher.")
+
+
+if __name__ == "__main__":
+    main()
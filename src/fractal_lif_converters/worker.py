@@ -0,0 +1,174 @@
+"""Persistent worker serving LIF compute-task jobs.
+
+A compute-task executable converts one image per interpreter, so for small
+wells most of its runtime is spent importing ngio, zarr, liffile and polars.
+This worker imports them once and then converts a stream of jobs, keeping
+``LifFile`` handles open between jobs that read the same file.
+
+The protocol is JSON lines. Each request is one parallelization-list item
+produced by an init task::
+
+    {"zarr_url": "...", "init_args": {...}}
+
+and each response is either ``{"ok": true, "result": <ImageListUpdateDict>}``
+or ``{"ok": false, "error": "<message>"}``. Jobs are read from stdin (answers
+go to stdout, logs to stderr) or, where the platform has them (not on
+Windows), from a Unix socket::
+
+    python -m fractal_lif_converters.worker --task image_in_plate
+    python -m fractal_lif_converters.worker --task single_image --socket /tmp/lif.sock
+"""
+
+import argparse
+import json
+import logging
+import socket
+import socketserver
+import sys
+from collections.abc import Callable, Iterable
+from typing import IO
+
+from ome_zarr_converters_tools.fractal import ImageListUpdateDict
+
+from fractal_lif_converters.common._loaders import enable_lif_file_cache
+from fractal_lif_converters.common._options import (
+    LifPipelineOptions,
+    enable_pipelined_writes,
+)
+from fractal_lif_converters.common.image_in_plate_compute_task import (
+    image_in_plate_compute_task,
+)
+from fractal_lif_converters.common.single_image_compute_task import (
+    single_image_compute_task,
+)
+
+logger = logging.getLogger(__name__)
+
+_COMPUTE_TASKS: dict[str, Callable[..., ImageListUpdateDict]] = {
+    "image_in_plate": image_in_plate_compute_task,
+    "single_image": single_image_compute_task,
+}
+
+
+def handle_job(line: str, compute_task_fn: Callable[..., ImageListUpdateDict]) -> dict:
+    """Run the job encoded in one request line and build its response."""
+    try:
+        job = json.loads(line)
+        result = compute_task_fn(zarr_url=job["zarr_url"], init_args=job["init_args"])
+    except Exception as e:
+        logger.exception("Job failed.")
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    return {"ok": True, "result": result}
+
+
+def serve_jobs(
+    lines: Iterable[str],
+    send: Callable[[str], None],
+    compute_task_fn: Callable[..., ImageListUpdateDict],
+) -> int:
+    """Answer every request line in ``lines`` through ``send``.
+
+    Returns:
+        The number of jobs handled.
+    """
+    count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        send(json.dumps(handle_job(line, compute_task_fn)) + "\n")
+        count += 1
+    return count
+
+
+def serve_stream(
+    reader: IO[str],
+    writer: IO[str],
+    compute_task_fn: Callable[..., ImageListUpdateDict],
+) -> int:
+    """Answer every request line from ``reader`` on ``writer`` until EOF."""
+
+    def send(response: str) -> None:
+        writer.write(response)
+        writer.flush()
+
+    return serve_jobs(reader, send, compute_task_fn)
+
+
+def make_socket_server(
+    socket_path: str, compute_task_fn: Callable[..., ImageListUpdateDict]
+) -> socketserver.BaseServer:
+    """Create a Unix-socket server answering jobs one connection at a time.
+
+    Raises:
+        OSError: If the platform has no Unix sockets (Windows).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform.")
+
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            # readline, not a text wrapper: it must return as soon as one
+            # request line has arrived.
+            lines = (line.decode() for line in iter(self.rfile.readline, b""))
+            serve_jobs(lines, lambda r: self.wfile.write(r.encode()), compute_task_fn)
+
+    return socketserver.UnixStreamServer(socket_path, _Handler)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point of the persistent worker."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--task", choices=sorted(_COMPUTE_TASKS), required=True)
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Serve on this Unix socket instead of stdin (not on Windows).",
+    )
+    parser.add_argument(
+        "--lif-file-cache-size",
+        type=int,
+        default=4,
+        help="LifFile handles kept open between jobs.",
+    )
+    parser.add_argument(
+        "--pipeline-readers",
+        type=int,
+        default=None,
+        help="Load tiles in this many reader processes (pipelined mode).",
+    )
+    parser.add_argument(
+        "--pipeline-writers",
+        type=int,
+        default=None,
+        help="Write tiles in this many writer processes (pipelined mode).",
+    )
+    args = parser.parse_args(argv)
+    if args.socket is not None and not hasattr(socket, "AF_UNIX"):
+        parser.error("--socket needs Unix sockets, which this platform lacks.")
+
+    # stdout carries the responses; keep logs on stderr.
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    enable_lif_file_cache(args.lif_file_cache_size)
+    if args.pipeline_readers is not None or args.pipeline_writers is not None:
+        defaults = LifPipelineOptions()
+        enable_pipelined_writes(
+            LifPipelineOptions(
+                readers=args.pipeline_readers or defaults.readers,
+                writers=args.pipeline_writers or defaults.writers,
+            )
+        )
+    compute_task_fn = _COMPUTE_TASKS[args.task]
+    if args.socket is None:
+        count = serve_stream(sys.stdin, sys.stdout, compute_task_fn)
+        logger.info(f"Worker handled {count} job(s).")
+        return
+    with make_socket_server(args.socket, compute_task_fn) as server:
+        logger.info(f"Worker listening on {args.socket}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopping worker.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
 import pytest
 from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
 from ome_zarr_converters_tools.models._converter_options import BackendType
 
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
 # Load the shared snapshot-testing plugin: the --update-snapshots / --extended
 # options, the `extended` marker and its skip behaviour, and the
 # `update_snapshots` fixture.
 pytest_plugins = ["ome_zarr_converters_tools.testing.plugin"]
 
+WritePlate = Callable[..., dict[str, np.ndarray]]
+
 
 @pytest.fixture
 def converter_options():
@@ -15,3 +23,38 @@ def converter_options():
             ngff_version="0.5", table_backend=BackendType.CSV
         )
     )
+
+
+@pytest.fixture
+def small_converter_options() -> ConverterOptions:
+    """Two pyramid levels only, which keeps synthetic conversions fast."""
+    return ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        )
+    )
+
+
+@pytest.fixture
+def write_plate() -> WritePlate:
+    """Write a synthetic plate scan with one ``(M, C, Z, Y, X)`` mosaic per well.
+
+    Returns the native-order data of each image, keyed by its LIF path
+    (``Scan/<well>``).
+    """
+
+    def _write(
+        path: Path,
+        sizes: dict[str, int],
+        tiles: list[tuple[float, float]],
+        wells: Sequence[str] = ("A1",),
+    ) -> dict[str, np.ndarray]:
+        images = [
+            SyntheticImage(
+                f"Scan/{well}", ("M", "C", "Z", "Y", "X"), sizes, tiles=tiles
+            )
+            for well in wells
+        ]
+        return write_synthetic_lif(path, images)
+
+    return _write
@@ -0,0 +1,136 @@
+"""Write small synthetic LIF files readable by ``liffile``.
+
+Only the subset of the format used by the converters is produced: a version-2
+XML header, one memory block per image, regular dimensions, channels, and an
+optional ``TileScanInfo`` attachment for mosaics.
+"""
+
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+_DIM_IDS = {"X": 1, "Y": 2, "Z": 3, "T": 4, "M": 10}
+
+
+@dataclass
+class SyntheticImage:
+    """One image in a synthetic LIF file.
+
+    ``layout`` lists the stored dimensions from outermost to innermost (it must
+    end with ``Y``, ``X``); ``C`` marks where channels are interleaved.
+    """
+
+    path: str
+    layout: tuple[str, ...]
+    sizes: dict[str, int]
+    dtype: str = "uint16"
+    pixel_size_m: float = 1e-6
+    z_step_m: float = 2e-6
+    tiles: list[tuple[float, float]] = field(default_factory=list)
+
+    def native_shape(self) -> tuple[int, ...]:
+        return tuple(self.sizes.get(d, 1) for d in self.layout)
+
+    def data(self) -> np.ndarray:
+        """Deterministic native-order data; every voxel is distinct mod dtype."""
+        shape = self.native_shape()
+        arr = np.arange(int(np.prod(shape)), dtype=np.uint64)
+        info = np.iinfo(self.dtype)
+        return (arr % (int(info.max) + 1)).astype(self.dtype).reshape(shape)
+
+
+def _image_xml(image: SyntheticImage, block_id: str) -> str:
+    itemsize = np.dtype(image.dtype).itemsize
+    strides: dict[str, int] = {}
+    stride = itemsize
+    for dim in reversed(image.layout):
+        strides[dim] = stride
+        stride *= image.sizes.get(dim, 1)
+    nbytes = stride
+
+    channels = []
+    for c in range(image.sizes.get("C", 1)):
+        channels.append(
+            '<ChannelDescription DataType="0" ChannelTag="0" '
+            f'Resolution="{itemsize * 8}" NameOfMeasuredQuantity="" Min="0" '
+            f'Max="{np.iinfo(image.dtype).max}" Unit="" LUTName="Gray" '
+            f'IsLUTInverted="0" BytesInc="{c * strides.get("C", 0)}" '
+            'BitInc="0"/>'
+        )
+    dims = []
+    for dim in image.layout:
+        if dim == "C":
+            continue
+        n = image.sizes.get(dim, 1)
+        step = {"X": image.pixel_size_m, "Y": image.pixel_size_m}.get(
+            dim, image.z_step_m if dim == "Z" else 1.0
+        )
+        length = step * (n - 1) if dim in ("X", "Y", "Z") else 0
+        dims.append(
+            f'<DimensionDescription DimID="{_DIM_IDS[dim]}" '
+            f'NumberOfElements="{n}" Origin="0" Length="{length}" Unit="m" '
+            f'BytesInc="{strides[dim]}" BitInc="0"/>'
+        )
+    attachment = ""
+    if image.tiles:
+        tiles = "".join(
+            f'<Tile FieldX="{i}" FieldY="0" PosX="{x}" PosY="{y}"/>'
+            for i, (x, y) in enumerate(image.tiles)
+        )
+        attachment = (
+            '<Attachment Name="TileScanInfo" FlipX="0" FlipY="0" SwapXY="0">'
+            f"{tiles}</Attachment>"
+        )
+    return (
+        "<Data><Image><ImageDescription>"
+        f"<Channels>{''.join(channels)}</Channels>"
+        f"<Dimensions>{''.join(dims)}</Dimensions>"
+        f"</ImageDescription>{attachment}</Image></Data>"
+        f'<Memory Size="{nbytes}" MemoryBlockID="{block_id}"/>'
+    )
+
+
+def _tree_xml(node: dict, images: dict[str, str]) -> str:
+    parts = []
+    for name, child in node.items():
+        body = images.get(child["__path__"], "<Data/>")
+        children = {k: v for k, v in child.items() if k != "__path__"}
+        kids = f"<Children>{_tree_xml(children, images)}</Children>"
+        parts.append(f"<Element Name={quoteattr(name)}>{body}{kids}</Element>")
+    return "".join(parts)
+
+
+def write_synthetic_lif(
+    path: Path, images: list[SyntheticImage], name: str = "project"
+) -> dict[str, np.ndarray]:
+    """Write ``images`` to ``path`` and return their native-order data by path."""
+    tree: dict = {}
+    xml_images: dict[str, str] = {}
+    blocks: list[tuple[str, np.ndarray]] = []
+    for idx, image in enumerate(images):
+        node = tree
+        parts = image.path.split("/")
+        for depth, part in enumerate(parts):
+            node = node.setdefault(part, {"__path__": "/".join(parts[: depth + 1])})
+        block_id = f"MemBlock_{idx + 1}"
+        xml_images[image.path] = _image_xml(image, block_id)
+        blocks.append((block_id, image.data()))
+
+    root = {name: {"__path__": "", **tree}}
+    xml = f'<LMSDataContainerHeader Version="2">{_tree_xml(root, xml_images)}'
+    xml += "</LMSDataContainerHeader>"
+
+    with open(path, "wb") as fh:
+        fh.write(struct.pack("<IIBI", 0x70, 2 * len(xml) + 5, 0x2A, len(xml)))
+        fh.write(xml.encode("utf-16-le"))
+        for block_id, data in blocks:
+            raw = data.tobytes()
+            fh.write(
+                struct.pack("<IIBQBI", 0x70, 0, 0x2A, len(raw), 0x2A, len(block_id))
+            )
+            fh.write(block_id.encode("utf-16-le"))
+            fh.write(raw)
+    return {image.path: data for image, (_, data) in zip(images, blocks, strict=True)}
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import convert_lif_image, convert_lif_plate
+from fractal_lif_converters.catalog import (
+    build_lif_catalog,
+    query_lif_catalog,
+    read_lif_catalog,
+    select_catalog_scans,
+)
+from fractal_lif_converters.common._options import LifCatalogSelection
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"C": 2, "Z": 3, "Y": 16, "X": 12}
+
+
+def _write_archive(folder: Path) -> None:
+    folder.mkdir()
+    tiles = [(0.0, 0.0), (12e-6, 0.0), (0.0, 16e-6)]
+    write_synthetic_lif(
+        folder / "plate.lif",
+        [
+            SyntheticImage(
+                "Scan/A1", ("M", "C", "Z", "Y", "X"), {"M": 3, **_SIZES}, tiles=tiles
+            ),
+            SyntheticImage("Scan/B2", ("C", "Z", "Y", "X"), _SIZES),
+        ],
+    )
+    write_synthetic_lif(
+        folder / "series.lif",
+        [SyntheticImage("Series", ("T", "C", "Z", "Y", "X"), {"T": 4, **_SIZES})],
+    )
+    (folder / "broken.lif").write_bytes(b"not a lif file")
+
+
+def test_build_and_query_catalog(tmp_path: Path):
+    _write_archive(tmp_path / "archive")
+    catalog_dir = build_lif_catalog(
+        [str(tmp_path / "archive")], tmp_path / "catalog", max_workers=1
+    )
+
+    catalog = read_lif_catalog(catalog_dir).collect().sort("path", "image_id")
+    assert catalog.height == 3
+    mosaic = catalog.row(0, named=True)
+    assert mosaic["plate_scan"] == "Scan"
+    assert mosaic["well"] == "A1"
+    assert mosaic["image_type"] == "mosaic"
+    assert mosaic["tile_count"] == 3
+    assert mosaic["size_c"] == 2 and mosaic["size_z"] == 3
+    assert mosaic["nbytes"] == 3 * 2 * 3 * 16 * 12 * np.dtype(mosaic["dtype"]).itemsize
+    series = catalog.row(2, named=True)
+    assert series["plate_scan"] is None
+    assert series["image_scan"] == "Series"
+    assert series["size_t"] == 4
+
+    matches = query_lif_catalog(catalog_dir, "tile_count > 1 AND size_c = 2")
+    assert matches["name"].to_list() == ["Scan/A1"]
+    selection = LifCatalogSelection(catalog_dir=str(catalog_dir), where="size_t > 1")
+    assert select_catalog_scans(selection, "image") == [
+        (str(tmp_path / "archive" / "series.lif"), "Series")
+    ]
+    assert select_catalog_scans(selection, "plate") == []
+
+
+def test_convert_from_catalog(tmp_path: Path):
+    _write_archive(tmp_path / "archive")
+    catalog_dir = build_lif_catalog(
+        [str(tmp_path / "archive")], tmp_path / "catalog", max_workers=1
+    )
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        )
+    )
+
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "plates"),
+        acquisitions=[],
+        converter_options=options,
+        catalog=LifCatalogSelection(
+            catalog_dir=str(catalog_dir), where="image_type = 'mosaic'"
+        ),
+    )
+    # The whole scan is selected, including the well that did not match.
+    assert len(updates) == 2
+    updates = convert_lif_image(
+        zarr_dir=str(tmp_path / "images"),
+        acquisitions=[],
+        converter_options=options,
+        catalog=LifCatalogSelection(catalog_dir=str(catalog_dir), where="size_t = 4"),
+    )
+    assert len(updates) == 1
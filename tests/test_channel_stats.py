@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models import WriterMode
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common._channel_stats import (
+    ChannelStatsAccumulator,
+    format_channel_stats,
+)
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+
+def _reference_window(channel: np.ndarray, q: float) -> float:
+    return float(np.percentile(channel, q, method="inverted_cdf"))
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "uint16", "int16"])
+def test_accumulator_matches_full_pass(dtype: str):
+    rng = np.random.default_rng(0)
+    info = np.iinfo(dtype)
+    tiles = [
+        rng.integers(info.min, info.max, size=(3, 2, 16, 16), dtype=dtype)
+        for _ in range(4)
+    ]
+    stats = ChannelStatsAccumulator(num_channels=3, dtype=dtype)
+    for tile in tiles:
+        stats.update(tile)
+    result = stats.finalize()
+
+    full = np.concatenate([t.reshape(3, -1) for t in tiles], axis=1)
+    for c, channel_stats in enumerate(result):
+        assert channel_stats.min == full[c].min()
+        assert channel_stats.max == full[c].max()
+        assert channel_stats.start == _reference_window(full[c], 0.1)
+        assert channel_stats.end == _reference_window(full[c], 99.9)
+
+
+def test_accumulator_float_and_empty():
+    stats = ChannelStatsAccumulator(num_channels=1, dtype="float32")
+    assert stats.finalize() is None
+    stats.update(np.array([[[[-1.5, 2.0]]]], dtype="float32"))
+    (channel_stats,) = stats.finalize()
+    assert (channel_stats.start, channel_stats.end) == (-1.5, 2.0)
+    with pytest.raises(ValueError, match="channel"):
+        stats.update(np.zeros((2, 1, 1, 1), dtype="float32"))
+
+
+def test_format_channel_stats():
+    stats = ChannelStatsAccumulator(num_channels=1, dtype="float32")
+    assert "no channel statistics" in format_channel_stats(stats.finalize())
+    stats.update(np.array([[[[-1.5, 2.0]]]], dtype="float32"))
+    assert format_channel_stats(stats.finalize()) == (
+        "c0: min=-1.5 max=2 window=[-1.5, 2]"
+    )
+
+
+@pytest.mark.parametrize("writer_mode", [WriterMode.BY_TILE, WriterMode.BY_FOV_DASK])
+def test_channel_windows_from_streamed_stats(tmp_path: Path, writer_mode: WriterMode):
+    sizes = {"M": 2, "C": 2, "Z": 2, "Y": 64, "X": 48}
+    tiles = [(0.0, 0.0), (48e-6, 0.0)]
+    image = SyntheticImage("Scan/A1", ("M", "C", "Z", "Y", "X"), sizes, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "plate.lif", [image])["Scan/A1"]
+
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+        writer_mode=writer_mode,
+    )
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=options,
+    )
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    channels = open_ome_zarr_container(zarr_url).image_meta.channels_meta.channels
+    for c, channel in enumerate(channels):
+        data = native[:, c]
+        window = channel.channel_visualisation
+        assert window.min == data.min()
+        assert window.max == data.max()
+        assert window.start == _reference_window(data, 0.1)
+        assert window.end == _reference_window(data, 99.9)
@@ -0,0 +1,168 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common import _coalesce
+from fractal_lif_converters.common._coalesce import (
+    CoalescedReads,
+    plan_coalesced_reads,
+)
+from fractal_lif_converters.common._loaders import (
+    LifIOProfile,
+    LifMosaicLoader,
+    LifReadSelection,
+)
+from fractal_lif_converters.common._options import LifAcquisitionOptions
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SELECTIONS = [
+    LifReadSelection(),
+    LifReadSelection(channels=[1], z_range=(1, 3)),
+    LifReadSelection(yx_window=(4, 20, 8, 24), xy_step=2),
+    LifReadSelection(z_projection="max"),
+]
+
+
+@pytest.fixture
+def read_runs(monkeypatch: pytest.MonkeyPatch) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    read_run = _coalesce._read_run
+
+    def _recording_read_run(run):
+        runs.append((run.start, run.stop))
+        return read_run(run)
+
+    monkeypatch.setattr(_coalesce, "_read_run", _recording_read_run)
+    return runs
+
+
+def test_plan_coalesced_reads():
+    spans = [(300, 400), (0, 100), (110, 200), (1000, 1100), (150, 250)]
+    assert plan_coalesced_reads(spans, max_gap=50, max_bytes=1024) == [
+        (0, 400, [1, 2, 4, 0]),
+        (1000, 1100, [3]),
+    ]
+    assert plan_coalesced_reads(spans, max_gap=0, max_bytes=1024) == [
+        (0, 100, [1]),
+        (110, 250, [2, 4]),
+        (300, 400, [0]),
+        (1000, 1100, [3]),
+    ]
+    # A span longer than max_bytes is read on its own.
+    assert plan_coalesced_reads(spans, max_gap=1000, max_bytes=250) == [
+        (0, 250, [1, 2, 4]),
+        (300, 400, [0]),
+        (1000, 1100, [3]),
+    ]
+
+
+@pytest.mark.parametrize("gap, num_runs", [(64 * 1024, 1), (0, 4)])
+def test_coalesced_positions_match(
+    tmp_path: Path, read_runs: list, gap: int, num_runs: int
+):
+    # One LifImage per position, stored one after the other.
+    sizes = {"C": 2, "Z": 3, "Y": 32, "X": 40}
+    images = [
+        SyntheticImage(f"Scan/A1/P{i}", ("C", "Z", "Y", "X"), sizes) for i in range(4)
+    ]
+    write_synthetic_lif(tmp_path / "positions.lif", images)
+
+    def _loaders(io_profile: LifIOProfile | None) -> list[LifMosaicLoader]:
+        return [
+            LifMosaicLoader(
+                file_path=str(tmp_path / "positions.lif"),
+                image_id=image_id,
+                m=0,
+                selection=selection,
+                io_profile=io_profile,
+            )
+            for image_id, selection in enumerate(_SELECTIONS)
+        ]
+
+    profile = LifIOProfile(coalesce_gap=gap)
+    loaders = _loaders(profile)
+    reads = CoalescedReads(loaders)
+    for loader in loaders:
+        loader.read_through(reads)
+    for loader, expected in zip(loaders, _loaders(None), strict=True):
+        np.testing.assert_array_equal(loader.load_data(), expected.load_data())
+    assert len(read_runs) == num_runs
+
+
+def test_runs_are_read_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, read_runs: list
+):
+    sizes = {"C": 1, "Z": 1, "Y": 32, "X": 40}
+    images = [
+        SyntheticImage(f"Scan/A1/P{i}", ("C", "Z", "Y", "X"), sizes) for i in range(2)
+    ]
+    write_synthetic_lif(tmp_path / "positions.lif", images)
+    # Two threads per run; each run is one tile read twice.
+    loaders = [
+        LifMosaicLoader(
+            file_path=str(tmp_path / "positions.lif"),
+            image_id=image_id,
+            m=0,
+            io_profile=LifIOProfile(coalesce_gap=0, coalesce_max_bytes=4096),
+        )
+        for image_id in (0, 0, 1, 1)
+    ]
+    reads = CoalescedReads(loaders)
+    for loader in loaders:
+        loader.read_through(reads)
+
+    # Both runs must be in flight at once: a read holding the planner's
+    # lock would never let the other one start.
+    barrier = threading.Barrier(2)
+    read_run = _coalesce._read_run
+
+    def _read_run(run):
+        barrier.wait(timeout=10)
+        return read_run(run)
+
+    monkeypatch.setattr(_coalesce, "_read_run", _read_run)
+    with ThreadPoolExecutor(4) as pool:
+        loaded = list(pool.map(lambda loader: loader.load_data(), loaders))
+    np.testing.assert_array_equal(loaded[0], loaded[1])
+    np.testing.assert_array_equal(loaded[2], loaded[3])
+    assert len(read_runs) == 2
+
+
+def test_coalesced_mosaic_conversion(tmp_path: Path, read_runs: list):
+    tiles = [(x * 40e-6, 0.0) for x in range(4)]
+    sizes = {"M": 4, "C": 2, "Z": 3, "Y": 32, "X": 40}
+    image = SyntheticImage("Scan/A1", ("M", "C", "Z", "Y", "X"), sizes, tiles=tiles)
+    write_synthetic_lif(tmp_path / "plate.lif", [image])
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=1, ngff_version="0.5", table_backend=BackendType.CSV
+        )
+    )
+
+    def _convert(zarr_dir: str, io_profile: LifIOProfile | None) -> np.ndarray:
+        acquisition = LifPlateAcquisitionModel(
+            path=str(tmp_path / "plate.lif"),
+            advanced=LifAcquisitionOptions(io_profile=io_profile),
+        )
+        updates = convert_lif_plate(
+            zarr_dir=str(tmp_path / zarr_dir),
+            acquisitions=[acquisition],
+            converter_options=options,
+        )
+        zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+        return open_ome_zarr_container(zarr_url).get_image().get_array()
+
+    expected = _convert("default", None)
+    assert not read_runs
+    # The positions of a mosaic are contiguous: one read for the whole image.
+    actual = _convert("coalesced", LifIOProfile(coalesce_gap=0))
+    np.testing.assert_array_equal(actual, expected)
+    assert len(read_runs) == 1
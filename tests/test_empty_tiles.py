@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models import WriterMode
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common import _loaders
+from fractal_lif_converters.common._loaders import (
+    LifEmptyTileCheck,
+    LifMosaicLoader,
+    LifReadSelection,
+    find_empty_tiles,
+)
+from fractal_lif_converters.common._options import LifAcquisitionOptions
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"M": 4, "C": 2, "Z": 3, "Y": 64, "X": 48}
+
+
+@dataclass
+class _SparseScan(SyntheticImage):
+    """Tiles 0 and 2 are blank glass; tile 2 has one hot pixel."""
+
+    def data(self) -> np.ndarray:
+        data = super().data() % 1000 + 100
+        data[0] = 5
+        data[2] = 5
+        data[2, 1, 2, 32, 32] = 4000
+        return data
+
+
+@pytest.fixture
+def sparse_lif(tmp_path: Path) -> str:
+    tiles = [(x * 48e-6, y * 64e-6) for y in range(2) for x in range(2)]
+    image = _SparseScan("Scan/A1", ("M", "C", "Z", "Y", "X"), _SIZES, tiles=tiles)
+    write_synthetic_lif(tmp_path / "plate.lif", [image])
+    return str(tmp_path / "plate.lif")
+
+
+@pytest.mark.parametrize("mapped", [True, False])
+def test_find_empty_tiles(
+    sparse_lif: str, monkeypatch: pytest.MonkeyPatch, mapped: bool
+):
+    if not mapped:
+        # As for remote files: frames are read whole.
+        monkeypatch.setattr(_loaders, "_mapped_image", lambda lif_image: None)
+
+    def _loaders_with(check: LifEmptyTileCheck | None, **selection):
+        return [
+            LifMosaicLoader(
+                file_path=sparse_lif,
+                image_id=0,
+                m=m,
+                selection=LifReadSelection(**selection),
+                empty_check=check,
+            )
+            for m in range(4)
+        ]
+
+    strict = LifEmptyTileCheck(threshold=10, sample_step=1)
+    assert find_empty_tiles(_loaders_with(strict)) == [True, False, False, False]
+    tolerant = strict.model_copy(update={"max_fraction": 0.001})
+    assert find_empty_tiles(_loaders_with(tolerant)) == [True, False, True, False]
+    # The hot pixel is off the sampled grid, or outside the selected planes.
+    coarse = strict.model_copy(update={"sample_step": 5})
+    assert find_empty_tiles(_loaders_with(coarse)) == [True, False, True, False]
+    assert find_empty_tiles(_loaders_with(strict, channels=[0])) == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert find_empty_tiles(_loaders_with(None)) == [False] * 4
+
+
+@pytest.mark.parametrize("writer_mode", list(WriterMode))
+def test_empty_tiles_are_not_written(
+    tmp_path: Path,
+    sparse_lif: str,
+    monkeypatch: pytest.MonkeyPatch,
+    writer_mode: WriterMode,
+):
+    options = ConverterOptions(
+        writer_mode=writer_mode,
+        omezarr_options=OmeZarrOptions(
+            num_levels=1, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+    )
+    check = LifEmptyTileCheck(threshold=10, max_fraction=0.01, sample_step=4)
+    acquisition = LifPlateAcquisitionModel(
+        path=sparse_lif, advanced=LifAcquisitionOptions(skip_empty=check)
+    )
+    loaded: list[int] = []
+    load_data = LifMosaicLoader.load_data
+
+    def _load(self, resource=None, out=None):
+        loaded.append(self.m)
+        return load_data(self, resource=resource, out=out)
+
+    monkeypatch.setattr(LifMosaicLoader, "load_data", _load)
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=options,
+    )
+    assert sorted(loaded) == [1, 3]
+
+    container = open_ome_zarr_container(updates[0]["image_list_updates"][0]["zarr_url"])
+    data = container.get_image().get_array()
+    assert data.shape == (2, 3, 128, 96)
+    # Skipped tiles keep the fill value.
+    assert not data[..., :64, :48].any()
+    assert not data[..., 64:, :48].any()
+    assert data[..., :64, 48:].all()
+    assert len(container.get_table("FOV_ROI_table").rois()) == 4
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+
+# Modules only the init tasks and the Python API need.
+_INIT_ONLY_MODULES = {
+    "fractal_lif_converters.common._runner",
+    "fractal_lif_converters.common.acquisitions",
+    "fractal_lif_converters.lif_image",
+    "fractal_lif_converters.lif_plate",
+}
+
+# Feature modules the compute pipeline imports only when their option is set.
+_OPTIONAL_MODULES = {
+    "fractal_lif_converters.common._coalesce",
+    "fractal_lif_converters.common._pipeline",
+    "fractal_lif_converters.common._projections",
+    "fractal_lif_converters.common._sharding",
+}
+
+_COMPUTE_TASKS = {
+    "fractal_lif_converters.common.image_in_plate_compute_task",
+    "fractal_lif_converters.common.single_image_compute_task",
+}
+
+# Summed self time of this package's own modules. The rest of the start-up
+# is ome-zarr-converters-tools and its dependencies (ngio, zarr, polars).
+_OWN_IMPORT_BUDGET_US = 250_000
+
+
+def _import_times(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(_COMPUTE_TASKS))
+def test_compute_task_import_budget(module: str):
+    times = _import_times(module)
+    assert module in times
+    assert not _INIT_ONLY_MODULES & times.keys()
+    assert not _OPTIONAL_MODULES & times.keys()
+    assert not (_COMPUTE_TASKS - {module}) & times.keys()
+    own = sum(t for name, t in times.items() if name.startswith("fractal_lif"))
+    assert own < _OWN_IMPORT_BUDGET_US, f"{own} us spent in own modules"
+
+
+def test_public_api_is_importable_lazily():
+    import fractal_lif_converters
+    import fractal_lif_converters.common
+
+    assert callable(fractal_lif_converters.convert_lif_plate)
+    assert fractal_lif_converters.common.STANDARD_ROWS_NAMES.startswith("ABC")
+    # Still the task functions after their modules have been imported.
+    import fractal_lif_converters.common.single_image_compute_task
+
+    assert callable(fractal_lif_converters.common.single_image_compute_task)
+    assert callable(fractal_lif_converters.common.image_in_plate_compute_task)
+    assert set(fractal_lif_converters.__all__) <= set(dir(fractal_lif_converters))
+    with pytest.raises(AttributeError):
+        _ = fractal_lif_converters.not_an_attribute
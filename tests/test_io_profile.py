@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fractal_lif_converters.common import _loaders
+from fractal_lif_converters.common._loaders import (
+    LifIOProfile,
+    LifMosaicLoader,
+    LifReadSelection,
+)
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"T": 2, "C": 3, "Z": 4, "M": 4, "Y": 64, "X": 48}
+
+_PROFILES = [
+    LifIOProfile(block_size=4096),
+    LifIOProfile(fadvise="sequential", readahead=1024**2),
+    LifIOProfile(block_size=65536, fadvise="willneed"),
+]
+
+
+@pytest.mark.parametrize("profile", _PROFILES)
+@pytest.mark.parametrize(
+    "layout",
+    [
+        ("T", "C", "Z", "Y", "X"),
+        ("M", "T", "Z", "C", "Y", "X"),
+        # M is not outermost: the tile is scattered over the block, so reads
+        # fall back to liffile.
+        ("T", "M", "C", "Z", "Y", "X"),
+    ],
+)
+@pytest.mark.parametrize("full", [True, False])
+def test_profiled_reads_match(
+    tmp_path: Path, layout: tuple[str, ...], profile: LifIOProfile, full: bool
+):
+    sizes = {d: _SIZES[d] for d in layout}
+    tiles = [(i * 1e-4, 0.0) for i in range(sizes.get("M", 0))]
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "io.lif", [image])[image.path]
+
+    m = 1 if "M" in layout else 0
+    dims = list(layout)
+    if "M" in dims:
+        native = np.take(native, m, axis=dims.index("M"))
+        dims.remove("M")
+    canonical = native.transpose([dims.index(d) for d in ("T", "C", "Z", "Y", "X")])
+    selection = LifReadSelection()
+    expected = canonical
+    if not full:
+        selection = LifReadSelection(channels=[2, 0], z_range=(1, 3), t_range=(1, 2))
+        expected = canonical[1:2][:, [2, 0]][:, :, 1:3]
+
+    loader = LifMosaicLoader(
+        file_path=str(tmp_path / "io.lif"),
+        image_id=0,
+        m=m,
+        selection=selection,
+        io_profile=profile,
+    )
+    out = loader.load_data()
+    np.testing.assert_array_equal(out, expected[0] if len(expected) == 1 else expected)
+
+
+@pytest.mark.skipif(not hasattr(os, "preadv"), reason="os.preadv is not available")
+def test_block_reads_are_aligned(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    layout = ("M", "C", "Y", "X")
+    sizes = {"M": 2, "C": 2, "Y": 64, "X": 64}
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=[(0.0, 0.0)] * 2)
+    native = write_synthetic_lif(tmp_path / "io.lif", [image])[image.path]
+
+    reads: list[tuple[int, int]] = []
+    preadv = os.preadv
+
+    def _recording_preadv(fd, buffers, offset):
+        reads.append((offset, len(buffers[0])))
+        return preadv(fd, buffers, offset)
+
+    monkeypatch.setattr(_loaders.os, "preadv", _recording_preadv)
+    block_size = 4096
+    out = _loaders._load_lif_array(
+        str(tmp_path / "io.lif"),
+        0,
+        1,
+        io_profile=LifIOProfile(block_size=block_size),
+    )
+    np.testing.assert_array_equal(out[:, 0], native[1])
+    # One span read in full blocks; only the first one may be shorter.
+    assert sum(size for _, size in reads) == native[1].nbytes
+    assert all((offset + size) % block_size == 0 for offset, size in reads[:-1])
+    assert all(size == block_size for _, size in reads[1:-1])
+
+
+def test_block_reads_without_pread(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # As on Windows: neither os.preadv nor os.pread.
+    monkeypatch.delattr(os, "preadv", raising=False)
+    monkeypatch.delattr(os, "pread", raising=False)
+    layout = ("M", "C", "Y", "X")
+    sizes = {"M": 2, "C": 2, "Y": 64, "X": 64}
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=[(0.0, 0.0)] * 2)
+    native = write_synthetic_lif(tmp_path / "io.lif", [image])[image.path]
+
+    out = _loaders._load_lif_array(
+        str(tmp_path / "io.lif"),
+        0,
+        1,
+        io_profile=LifIOProfile(block_size=4096),
+    )
+    np.testing.assert_array_equal(out[:, 0], native[1])
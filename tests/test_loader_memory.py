@@ -0,0 +1,207 @@
+"""Peak-memory regression harness for the LIF loader.
+
+Bounds are expressed as a multiple of the returned array size, so hidden
+copies (e.g. from transposes or the ``frames(M=m)`` mosaic path) show up as
+a failing factor rather than as an OOM on a cluster node.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import Image, open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models import WriterMode
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common import _compute, _loaders
+from fractal_lif_converters.common._loaders import (
+    LifMosaicLoader,
+    _to_canonical_shape,
+)
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+from .utils import track_peak_memory
+
+# Allowed peak allocation, as a multiple of the output array size.
+CANONICAL_FACTOR = 1.1
+LOAD_FACTOR = 1.5
+
+_CANONICAL = ("T", "C", "Z", "Y", "X")
+_SIZES = {"T": 2, "C": 2, "Z": 4, "M": 3, "Y": 256, "X": 256}
+
+
+def _expected_canonical(data: np.ndarray, layout: tuple[str, ...], m: int):
+    dims = list(layout)
+    if "M" in dims:
+        data = np.take(data, m, axis=dims.index("M"))
+        dims.remove("M")
+    for dim in _CANONICAL:
+        if dim not in dims:
+            data = data[np.newaxis]
+            dims.insert(0, dim)
+    data = np.transpose(data, [dims.index(d) for d in _CANONICAL])
+    return data[0] if data.shape[0] == 1 else data
+
+
+@pytest.mark.parametrize(
+    "dims",
+    [
+        ("Y", "X"),
+        ("C", "Y", "X"),
+        ("C", "Z", "Y", "X"),
+        ("Z", "C", "Y", "X"),
+        ("T", "Z", "C", "Y", "X"),
+        ("Z", "T", "C", "Y", "X"),
+    ],
+)
+def test_to_canonical_shape_peak_memory(dims: tuple[str, ...]):
+    arr = np.ones(tuple(_SIZES[d] for d in dims), dtype=np.uint16)
+    with track_peak_memory() as mem:
+        out = _to_canonical_shape(arr, dims)
+    assert mem.peak <= CANONICAL_FACTOR * out.nbytes
+    assert out.flags.c_contiguous
+    np.testing.assert_array_equal(out, _expected_canonical(arr, dims, m=0))
+
+
+@pytest.mark.parametrize(
+    "layout, m",
+    [
+        (("C", "Z", "Y", "X"), 0),
+        (("Z", "C", "Y", "X"), 0),
+        (("T", "Z", "C", "Y", "X"), 0),
+        (("M", "Z", "C", "Y", "X"), 1),
+        (("M", "T", "C", "Z", "Y", "X"), 2),
+        (("C", "M", "Z", "Y", "X"), 2),
+    ],
+)
+def test_loader_peak_memory(tmp_path: Path, layout: tuple[str, ...], m: int):
+    sizes = {d: _SIZES[d] for d in layout}
+    tiles = [(i * 1e-4, 0.0) for i in range(sizes.get("M", 0))]
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=tiles)
+    lif_path = tmp_path / "memory.lif"
+    native = write_synthetic_lif(lif_path, [image])[image.path]
+    expected = _expected_canonical(native, layout, m)
+    del native
+
+    loader = LifMosaicLoader(file_path=str(lif_path), image_id=0, m=m)
+    with track_peak_memory() as mem:
+        out = loader.load_data()
+    assert mem.peak <= LOAD_FACTOR * out.nbytes
+    assert out.flags.c_contiguous
+    np.testing.assert_array_equal(out, expected)
+
+    # With a preallocated buffer nothing output-sized is allocated at all.
+    buffer = np.zeros_like(expected)
+    with track_peak_memory() as mem:
+        result = loader.load_data(out=buffer)
+    assert np.shares_memory(result, buffer)
+    assert mem.peak <= 0.5 * buffer.nbytes
+    np.testing.assert_array_equal(buffer, expected)
+
+
+@pytest.mark.parametrize("writer_mode", [WriterMode.IN_MEMORY, WriterMode.BY_FOV])
+def test_mosaic_canvas_peak_memory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, writer_mode: WriterMode
+):
+    layout = ("M", "C", "Z", "Y", "X")
+    sizes = {"M": 4, "C": 1, "Z": 8, "Y": 512, "X": 512}
+    tiles = [(0.0, 0.0), (512e-6, 0.0), (0.0, 512e-6), (512e-6, 512e-6)]
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "plate.lif", [image])[image.path]
+
+    peaks: list[tuple[int, int]] = []
+    assemble = _compute._assemble_canvas
+
+    def _tracked(group, resource):
+        with track_peak_memory() as mem:
+            canvas = assemble(group, resource)
+        peaks.append((mem.peak, canvas.nbytes))
+        return canvas
+
+    monkeypatch.setattr(_compute, "_assemble_canvas", _tracked)
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+        writer_mode=writer_mode,
+    )
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=options,
+    )
+    # Tiles are read straight into the canvas: no per-tile array on top of it,
+    # only frame-sized reads and the channel-statistics histogram.
+    tile_nbytes = native[0].nbytes
+    assert peaks
+    assert all(peak < nbytes + tile_nbytes for peak, nbytes in peaks)
+
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    written = open_ome_zarr_container(zarr_url).get_image().get_array()
+    for m, (y, x) in enumerate([(0, 0), (0, 512), (512, 0), (512, 512)]):
+        np.testing.assert_array_equal(written[..., y : y + 512, x : x + 512], native[m])
+
+
+@pytest.mark.parametrize(
+    "writer_mode", [WriterMode.BY_TILE, WriterMode.BY_FOV, WriterMode.IN_MEMORY]
+)
+def test_time_lapse_streams_timepoints(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, writer_mode: WriterMode
+):
+    layout = ("M", "T", "C", "Z", "Y", "X")
+    sizes = {"M": 2, "T": 5, "C": 2, "Z": 3, "Y": 32, "X": 24}
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=[(0.0, 0.0), (24e-6, 0.0)])
+    native = write_synthetic_lif(tmp_path / "plate.lif", [image])[image.path]
+
+    events: list[tuple[str, int, int]] = []
+    load_data = LifMosaicLoader.load_data
+    set_roi = Image.set_roi
+
+    def _load(self, resource=None, out=None):
+        data = load_data(self, resource=resource, out=out)
+        events.append(("read", self.selection.t_range[0], data.nbytes))
+        return data
+
+    def _set_roi(self, roi, patch, **kwargs):
+        events.append(("write", int(roi.get("t").start), patch.nbytes))
+        return set_roi(self, roi=roi, patch=patch, **kwargs)
+
+    monkeypatch.setattr(LifMosaicLoader, "load_data", _load)
+    monkeypatch.setattr(Image, "set_roi", _set_roi)
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+        writer_mode=writer_mode,
+    )
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=options,
+    )
+
+    # Every read and write covers a single timepoint, and each timepoint is
+    # written before the next one is read.
+    volume = native[0, 0].nbytes
+    assert {kind for kind, _, _ in events} == {"read", "write"}
+    assert all(nbytes <= 2 * volume for _, _, nbytes in events)
+    timepoints = [t for _, t, _ in events]
+    assert timepoints == sorted(timepoints)
+    assert timepoints[-1] == 4
+
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    written = open_ome_zarr_container(zarr_url).get_image().get_array()
+    np.testing.assert_array_equal(written[..., :24], native[0])
+    np.testing.assert_array_equal(written[..., 24:], native[1])
+
+
+def test_staging_pool_releases_large_buffers(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_loaders._StagingPool, "max_bytes", 1024)
+    pool = _loaders._StagingPool()
+    small = pool.get((16, 16), np.dtype(np.uint16))
+    assert pool.get((16, 16), np.dtype(np.uint16)) is small
+    large = pool.get((64, 64), np.dtype(np.uint16))
+    assert large.shape == (64, 64)
+    assert pool.buffer is None
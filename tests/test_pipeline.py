@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common._options import (
+    LifPipelineOptions,
+    default_pipeline_options,
+    enable_pipelined_writes,
+)
+from fractal_lif_converters.common._resume import MARKER_DIR
+
+_SIZES = {"M": 4, "C": 2, "Z": 3, "Y": 64, "X": 48}
+# The last tile overlaps the others, so tiles sharing chunks must be written
+# in order.
+_TILES = [(0.0, 0.0), (48e-6, 0.0), (0.0, 64e-6), (40e-6, 60e-6)]
+
+
+def _convert(tmp_path: Path, name: str, options: ConverterOptions) -> str:
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / name),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=options,
+    )
+    return updates[0]["image_list_updates"][0]["zarr_url"]
+
+
+@pytest.fixture
+def pipelined():
+    enable_pipelined_writes(LifPipelineOptions(readers=2, writers=2, slots=2))
+    yield
+    enable_pipelined_writes(None)
+
+
+def test_pipelined_conversion_matches_sequential(
+    tmp_path: Path, pipelined, write_plate, small_converter_options
+):
+    write_plate(tmp_path / "plate.lif", _SIZES, _TILES)
+
+    pipelined_url = _convert(tmp_path, "pipelined", small_converter_options)
+    enable_pipelined_writes(None)
+    sequential_url = _convert(tmp_path, "sequential", small_converter_options)
+
+    expected = open_ome_zarr_container(sequential_url)
+    actual = open_ome_zarr_container(pipelined_url)
+    for path in ("0", "1"):
+        np.testing.assert_array_equal(
+            actual.get_image(path=path).get_array(),
+            expected.get_image(path=path).get_array(),
+        )
+    assert actual.meta.channels_meta == expected.meta.channels_meta
+    assert (Path(pipelined_url) / MARKER_DIR / "complete.json").exists()
+
+
+def test_pipeline_options_from_environment(monkeypatch: pytest.MonkeyPatch):
+    assert default_pipeline_options() is None
+    monkeypatch.setenv("FRACTAL_LIF_PIPELINE_WRITERS", "3")
+    assert default_pipeline_options() == LifPipelineOptions(writers=3)
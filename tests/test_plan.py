@@ -0,0 +1,126 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models import FovBasedChunking
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel, plan_lif_plate
+from fractal_lif_converters.common._options import (
+    LifAcquisitionOptions,
+    LifAxisSharding,
+    LifPreviewOptions,
+)
+from fractal_lif_converters.lif_plate import convert_lif_plate_init_task
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"M": 2, "C": 2, "Z": 3, "Y": 64, "X": 48}
+
+
+@pytest.fixture
+def plate_lif(tmp_path: Path) -> str:
+    tiles = [(0.0, 0.0), (48e-6, 0.0)]
+    images = [
+        SyntheticImage("Scan/A1", ("M", "C", "Z", "Y", "X"), _SIZES, tiles=tiles),
+        SyntheticImage("Scan/B2", ("M", "C", "Z", "Y", "X"), _SIZES, tiles=tiles),
+    ]
+    write_synthetic_lif(tmp_path / "plate.lif", images)
+    return str(tmp_path / "plate.lif")
+
+
+def test_plan_lif_plate(tmp_path: Path, plate_lif: str):
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        )
+    )
+    plan = plan_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=plate_lif)],
+        converter_options=options,
+        read_throughput=1024**2,
+    )
+    itemsize = np.dtype(plan.images[0].dtype).itemsize
+    tile_bytes = 2 * 3 * 64 * 48 * itemsize
+    assert plan.num_tasks == 2
+    assert [image.num_tiles for image in plan.images] == [2, 2]
+    assert plan.bytes_read == 4 * tile_bytes
+    # Two pyramid levels: the full image plus a quarter of it.
+    assert plan.images[0].bytes_written == int(2 * tile_bytes * 1.25)
+    assert plan.seconds == pytest.approx(plan.bytes_read / 1024**2)
+    assert "2 compute task(s)" in plan.summary()
+    assert not (tmp_path / "zarr").exists()
+
+    preview = plan_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=plate_lif)],
+        converter_options=options,
+        preview=LifPreviewOptions(xy_step=4),
+    )
+    # One Z plane, every 4th row read at full width.
+    assert preview.bytes_read == 4 * 2 * 16 * 48 * itemsize
+    assert preview.read_throughput > 0
+
+
+def test_plan_shards_and_projections(tmp_path: Path, plate_lif: str):
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=1,
+            ngff_version="0.5",
+            table_backend=BackendType.CSV,
+            chunks=FovBasedChunking(z_chunk=1),
+        )
+    )
+    sharded = plan_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[
+            LifPlateAcquisitionModel(
+                path=plate_lif,
+                advanced=LifAcquisitionOptions(
+                    sharding=LifAxisSharding(axis="z", size=1)
+                ),
+            )
+        ],
+        converter_options=options,
+        read_throughput=1024**2,
+    )
+    itemsize = np.dtype(sharded.images[0].dtype).itemsize
+    plane_bytes = 2 * 64 * 48 * itemsize
+    # One task per Z plane of each well, each reading its own planes only.
+    assert sharded.num_tasks == 6
+    assert [image.shard.index for image in sharded.images] == [0, 1, 2] * 2
+    assert {image.bytes_read for image in sharded.images} == {2 * plane_bytes}
+    assert {image.bytes_written for image in sharded.images} == {2 * plane_bytes}
+    assert sharded.bytes_read == 2 * 2 * 3 * plane_bytes
+
+    projected = plan_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[
+            LifPlateAcquisitionModel(
+                path=plate_lif,
+                advanced=LifAcquisitionOptions(projections=["max", "sum"]),
+            )
+        ],
+        converter_options=options,
+        read_throughput=1024**2,
+    )
+    assert projected.num_tasks == 2
+    # The image, its max projection and its sum projection widened to 32 bits.
+    image_plane = 2 * plane_bytes
+    sum_plane = image_plane * max(4, itemsize) // itemsize
+    assert projected.images[0].bytes_written == 3 * image_plane + (
+        image_plane + sum_plane
+    )
+    assert not (tmp_path / "zarr").exists()
+
+
+def test_dry_run_init_task(tmp_path: Path, plate_lif: str):
+    output = convert_lif_plate_init_task(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=plate_lif)],
+        dry_run=True,
+    )
+    assert output == {"parallelization_list": []}
+    assert not (tmp_path / "zarr").exists()
@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ngio.hcs import open_ome_zarr_plate
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models import InplaceTiling, WriterMode
+from ome_zarr_converters_tools.models._converter_options import BackendType
+from pydantic import ValidationError
+
+from fractal_lif_converters import (
+    LifImageAcquisitionModel,
+    LifPlateAcquisitionModel,
+    convert_lif_image,
+    convert_lif_plate,
+)
+from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._options import LifAcquisitionOptions
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_MODES = ["max", "mean", "sum"]
+
+
+def _expected(data: np.ndarray, mode: str) -> np.ndarray:
+    if mode == "max":
+        return data.max(axis=1, keepdims=True)
+    if mode == "sum":
+        return data.sum(axis=1, keepdims=True, dtype=np.uint32)
+    return data.mean(axis=1, keepdims=True).round().astype(data.dtype)
+
+
+@pytest.mark.parametrize(
+    "writer_mode",
+    [
+        WriterMode.BY_TILE,
+        WriterMode.BY_FOV,
+        WriterMode.IN_MEMORY,
+        # Not streamed: projected from the written image.
+        WriterMode.BY_TILE_DASK,
+    ],
+)
+def test_plate_projections(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, writer_mode: WriterMode
+):
+    # Overlapping tiles: the last one wins in the projections too.
+    tiles = [(x * 40e-6, y * 56e-6) for y in range(2) for x in range(3)]
+    sizes = {"M": 6, "C": 2, "Z": 3, "Y": 64, "X": 48}
+    image = SyntheticImage("Scan/A1", ("M", "C", "Z", "Y", "X"), sizes, tiles=tiles)
+    write_synthetic_lif(tmp_path / "plate.lif", [image])
+    options = ConverterOptions(
+        writer_mode=writer_mode,
+        tiling_strategy=InplaceTiling(),
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+    )
+    loaded: list[int] = []
+    load_data = LifMosaicLoader.load_data
+
+    def _load(self, resource=None, out=None):
+        loaded.append(self.m)
+        return load_data(self, resource=resource, out=out)
+
+    monkeypatch.setattr(LifMosaicLoader, "load_data", _load)
+    acquisition = LifPlateAcquisitionModel(
+        path=str(tmp_path / "plate.lif"),
+        advanced=LifAcquisitionOptions(projections=_MODES),
+    )
+    (update,) = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=options,
+    )
+    # Each tile is read once, for the image and its projections.
+    assert sorted(loaded) == list(range(6))
+
+    image_entry, *projection_entries = update["image_list_updates"]
+    data = open_ome_zarr_container(image_entry["zarr_url"]).get_image().get_array()
+    assert data.shape == (2, 3, 120, 128)
+    assert [e["attributes"]["projection"] for e in projection_entries] == _MODES
+    for mode, entry in zip(_MODES, projection_entries, strict=True):
+        assert entry["zarr_url"] == f"{image_entry['zarr_url']}{mode}"
+        assert entry["attributes"]["well"] == "A01"
+        assert entry["types"] == {"is_3D": False}
+        container = open_ome_zarr_container(entry["zarr_url"])
+        np.testing.assert_array_equal(
+            container.get_image().get_array(), _expected(data, mode)
+        )
+        assert container.get_image(path="1").shape == (2, 1, 60, 64)
+        assert len(container.get_table("FOV_ROI_table").rois()) == 6
+
+    plate = open_ome_zarr_plate(image_entry["zarr_url"].rsplit("/", 3)[0])
+    assert sorted(plate.images_paths()) == [
+        "A/01/0",
+        "A/01/0max",
+        "A/01/0mean",
+        "A/01/0sum",
+    ]
+
+
+def test_image_projections(tmp_path: Path):
+    sizes = {"C": 2, "Z": 3, "Y": 64, "X": 48}
+    image = SyntheticImage("Series", ("Z", "C", "Y", "X"), sizes)
+    native = write_synthetic_lif(tmp_path / "image.lif", [image])
+
+    (update,) = convert_lif_image(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[
+            LifImageAcquisitionModel(
+                path=str(tmp_path / "image.lif"),
+                advanced=LifAcquisitionOptions(projections=["max"]),
+            )
+        ],
+        converter_options=ConverterOptions(
+            omezarr_options=OmeZarrOptions(
+                num_levels=1, ngff_version="0.5", table_backend=BackendType.CSV
+            )
+        ),
+    )
+    image_entry, projection_entry = update["image_list_updates"]
+    assert image_entry["zarr_url"].endswith(".zarr")
+    assert projection_entry["zarr_url"] == image_entry["zarr_url"][:-5] + "_max.zarr"
+    projection = open_ome_zarr_container(projection_entry["zarr_url"]).get_image()
+    np.testing.assert_array_equal(
+        projection.get_array(),
+        native["Series"].transpose(1, 0, 2, 3).max(axis=1, keepdims=True),
+    )
+
+
+def test_projections_exclude_sharding():
+    with pytest.raises(ValidationError, match="sharding"):
+        LifAcquisitionOptions(projections=["max"], sharding={"axis": "t", "size": 2})
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import zarr
+from ngio import Image, open_ome_zarr_container
+from ngio.common._pyramid import consolidate_pyramid
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models import InplaceTiling, WriterMode
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common import _compute
+from fractal_lif_converters.common._pyramid import StreamingPyramid, level_factors
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+
+def test_level_factors():
+    shapes = [(2, 3, 101, 64), (2, 3, 50, 32), (2, 1, 25, 16)]
+    assert level_factors(shapes) == [(1, 1, 2, 2), (1, 3, 2, 2)]
+    assert level_factors([(2, 100), (2, 40)]) is None
+
+
+def test_streaming_pyramid_matches_consolidate():
+    rng = np.random.default_rng(0)
+    shapes = [(2, 96, 128), (2, 48, 64), (2, 24, 32), (2, 12, 16)]
+    chunks = (1, 32, 32)
+
+    def _levels() -> list[zarr.Array]:
+        return [
+            zarr.create_array({}, shape=shape, chunks=chunks, dtype="uint16")
+            for shape in shapes
+        ]
+
+    # Overlapping tiles at odd offsets, written in no particular order, and
+    # one covering a whole plane.
+    boxes = [
+        ((c, c + 1), (y, y + 40), (x, x + 50))
+        for c in range(2)
+        for y in (0, 33, 56)
+        for x in (0, 37, 78)
+    ]
+    boxes = [boxes[i] for i in rng.permutation(len(boxes))]
+    boxes.insert(5, ((1, 2), (0, 96), (0, 128)))
+    patches = [
+        rng.integers(0, 4000, [hi - lo for lo, hi in box], dtype="uint16")
+        for box in boxes
+    ]
+
+    streamed = _levels()
+    pyramid = StreamingPyramid(streamed, level_factors(shapes), boxes)
+    for index, (box, patch) in enumerate(zip(boxes, patches, strict=True)):
+        streamed[0][tuple(slice(lo, hi) for lo, hi in box)] = patch
+        pyramid.write(index, patch)
+
+    consolidated = _levels()
+    consolidated[0][...] = streamed[0][...]
+    consolidate_pyramid(consolidated[0], consolidated[1:])
+    for actual, expected in zip(streamed, consolidated, strict=True):
+        np.testing.assert_array_equal(actual[...], expected[...])
+
+
+@pytest.mark.parametrize(
+    "writer_mode", [WriterMode.BY_TILE, WriterMode.BY_FOV, WriterMode.IN_MEMORY]
+)
+def test_single_pass_conversion(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, writer_mode: WriterMode
+):
+    # Overlapping tiles: 48x64 tiles every 40x56 pixels.
+    tiles = [(x * 40e-6, y * 56e-6) for y in range(2) for x in range(3)]
+    sizes = {"M": 6, "C": 2, "Z": 3, "Y": 64, "X": 48}
+    image = SyntheticImage("Scan/A1", ("M", "C", "Z", "Y", "X"), sizes, tiles=tiles)
+    write_synthetic_lif(tmp_path / "plate.lif", [image])
+    options = ConverterOptions(
+        writer_mode=writer_mode,
+        tiling_strategy=InplaceTiling(),
+        omezarr_options=OmeZarrOptions(
+            num_levels=3, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+    )
+
+    def _convert(zarr_dir: str) -> list[np.ndarray]:
+        updates = convert_lif_plate(
+            zarr_dir=str(tmp_path / zarr_dir),
+            acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+            converter_options=options,
+        )
+        container = open_ome_zarr_container(
+            updates[0]["image_list_updates"][0]["zarr_url"]
+        )
+        return [
+            container.get_image(path=path).get_array() for path in container.level_paths
+        ]
+
+    consolidate = Image.consolidate
+    consolidated_images = []
+
+    def _consolidate(self, *args, **kwargs):
+        consolidated_images.append(self)
+        return consolidate(self, *args, **kwargs)
+
+    monkeypatch.setattr(Image, "consolidate", _consolidate)
+    streamed = _convert("streamed")
+    # Level 0 is never read back.
+    assert not consolidated_images
+    monkeypatch.setattr(_compute, "streaming_pyramid", lambda *args, **kwargs: None)
+    consolidated = _convert("consolidated")
+    assert len(consolidated_images) == 1
+
+    assert streamed[0].shape == (2, 3, 120, 128)
+    for actual, expected in zip(streamed, consolidated, strict=True):
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fractal_lif_converters.common import _loaders
+from fractal_lif_converters.common._loaders import LifMosaicLoader, LifReadSelection
+from fractal_lif_converters.common._options import (
+    IndexRange,
+    LifAcquisitionOptions,
+    LifPreviewOptions,
+)
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+from .utils import track_peak_memory
+
+_SIZES = {"T": 3, "C": 3, "Z": 5, "M": 2, "Y": 128, "X": 128}
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        ("T", "C", "Z", "Y", "X"),
+        ("Z", "T", "C", "Y", "X"),
+        ("M", "T", "Z", "C", "Y", "X"),
+    ],
+)
+def test_loader_reads_only_selected_planes(tmp_path: Path, layout: tuple[str, ...]):
+    sizes = {d: _SIZES[d] for d in layout}
+    tiles = [(i * 1e-4, 0.0) for i in range(sizes.get("M", 0))]
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "sel.lif", [image])[image.path]
+
+    m = 1 if "M" in layout else 0
+    full = native[m] if "M" in layout else native
+    dims = [d for d in layout if d != "M"]
+    full = full.transpose([dims.index(d) for d in ("T", "C", "Z", "Y", "X")])
+    expected = full[1:3][:, [2, 0]][:, :, 1:4]
+
+    selection = LifReadSelection(channels=[2, 0], z_range=(1, 4), t_range=(1, 3))
+    loader = LifMosaicLoader(
+        file_path=str(tmp_path / "sel.lif"), image_id=0, m=m, selection=selection
+    )
+    with track_peak_memory() as mem:
+        out = loader.load_data()
+    # Nothing close to the full (T, C, Z) stack is ever materialised.
+    assert mem.peak <= 1.5 * out.nbytes < full.nbytes
+    np.testing.assert_array_equal(out, expected)
+
+
+def _canonical(native: np.ndarray, layout: tuple[str, ...], m: int) -> np.ndarray:
+    full = native[m] if "M" in layout else native
+    dims = [d for d in layout if d != "M"]
+    return full.transpose([dims.index(d) for d in ("T", "C", "Z", "Y", "X")])
+
+
+@pytest.mark.parametrize("mapped", [True, False])
+@pytest.mark.parametrize(
+    "layout", [("T", "C", "Z", "Y", "X"), ("M", "T", "Z", "C", "Y", "X")]
+)
+def test_loader_decimated_preview(
+    tmp_path: Path, layout: tuple[str, ...], mapped: bool, monkeypatch
+):
+    if not mapped:
+        monkeypatch.setattr(_loaders, "_mapped_image", lambda lif_image: None)
+    sizes = {d: _SIZES[d] for d in layout}
+    tiles = [(i * 1e-4, 0.0) for i in range(sizes.get("M", 0))]
+    image = SyntheticImage("Scan/A1", layout, sizes, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "prev.lif", [image])[image.path]
+    m = 1 if "M" in layout else 0
+    full = _canonical(native, layout, m)
+    file_path = str(tmp_path / "prev.lif")
+
+    selection = LifReadSelection(xy_step=3, z_range=(2, 3), t_range=(0, 3), t_step=2)
+    out = LifMosaicLoader(
+        file_path=file_path, image_id=0, m=m, selection=selection
+    ).load_data()
+    np.testing.assert_array_equal(out, full[::2, :, 2:3, ::3, ::3])
+    assert out.shape == selection.shape_5d(sizes)
+
+    selection = LifReadSelection(xy_step=4, channels=[1], z_projection="max")
+    out = LifMosaicLoader(
+        file_path=file_path, image_id=0, m=m, selection=selection
+    ).load_data()
+    expected = full[:, [1], :, ::4, ::4].max(axis=2, keepdims=True)
+    np.testing.assert_array_equal(out, expected)
+
+    selection = LifReadSelection(xy_step=2, yx_window=(3, 9, 4, 12))
+    out = LifMosaicLoader(
+        file_path=file_path, image_id=0, m=m, selection=selection
+    ).load_data()
+    np.testing.assert_array_equal(out, full[:, :, :, 3:9:2, 4:12:2])
+    assert out.shape == selection.shape_5d(sizes)
+
+
+def test_preview_selection_resolution():
+    sizes = {"T": 6, "C": 2, "Z": 9, "Y": 10, "X": 10}
+    options = LifAcquisitionOptions(z_range=IndexRange(start=2, stop=6))
+    middle = options.read_selection(sizes, LifPreviewOptions(t_step=4))
+    assert middle.z_range == (4, 5)
+    assert middle.shape_5d(sizes) == (2, 2, 1, 3, 3)
+    projected = options.read_selection(sizes, LifPreviewOptions(z_mode="max"))
+    assert projected.z_projection == "max"
+    assert projected.z_range == (2, 6)
+    assert projected.shape_5d(sizes) == (6, 2, 1, 3, 3)
+
+
+def test_read_selection_resolution():
+    sizes = {"T": 4, "C": 3, "Z": 10, "Y": 8, "X": 8}
+    options = LifAcquisitionOptions(
+        channel_indices=[1],
+        z_range=IndexRange(start=2, stop=50),
+        t_range=IndexRange(start=0),
+    )
+    selection = options.read_selection(sizes)
+    assert selection == LifReadSelection(channels=[1], z_range=(2, 10))
+    assert selection.shape_5d(sizes) == (4, 1, 8, 8, 8)
+
+    full = LifAcquisitionOptions(channel_indices=[0, 1, 2]).read_selection(sizes)
+    assert full.is_full()
+
+    with pytest.raises(ValueError, match="channel indices"):
+        LifAcquisitionOptions(channel_indices=[3]).read_selection(sizes)
+    with pytest.raises(ValueError, match="Duplicate channel indices"):
+        LifAcquisitionOptions(channel_indices=[1, 1])
+    with pytest.raises(ValueError, match="Z range"):
+        LifAcquisitionOptions(z_range=IndexRange(start=10)).read_selection(sizes)
@@ -0,0 +1,156 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common import _remote
+from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._remote import BlockCache, RemoteLifFile
+
+pytest.importorskip("aiohttp")
+
+_SIZES = {"M": 4, "C": 2, "Z": 2, "Y": 64, "X": 48}
+_TILES = [(i * 48e-6, 0.0) for i in range(4)]
+_BLOCK = 4096
+
+
+class _RangeHandler(SimpleHTTPRequestHandler):
+    """Static file handler with single-range ``Range`` support."""
+
+    served: list[tuple[int, int]]
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404)
+            return None
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        header = self.headers.get("Range")
+        if header:
+            first, _, last = header.removeprefix("bytes=").partition("-")
+            start, end = int(first), min(int(last or size - 1), size - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        fh = open(path, "rb")
+        fh.seek(start)
+        if self.command == "GET":
+            self.served.append((start, end + 1))
+        return _Limited(fh, end - start + 1)
+
+
+class _Limited:
+    def __init__(self, fh, remaining: int) -> None:
+        self.fh, self.remaining = fh, remaining
+
+    def read(self, n: int = -1) -> bytes:
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        data = self.fh.read(n)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+@pytest.fixture
+def http_root(tmp_path: Path):
+    root = tmp_path / "served"
+    root.mkdir()
+    served: list[tuple[int, int]] = []
+    handler = type("Handler", (_RangeHandler,), {"served": served})
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(handler, directory=str(root))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_port}", served
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def block_cache_env(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("FRACTAL_LIF_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("FRACTAL_LIF_CACHE_BLOCK_BYTES", str(_BLOCK))
+    _remote.default_block_cache.cache_clear()
+    yield tmp_path / "cache"
+    _remote.default_block_cache.cache_clear()
+
+
+def test_remote_tile_reads_only_needed_blocks(http_root, block_cache_env, write_plate):
+    root, url, served = http_root
+    native = write_plate(root / "plate.lif", _SIZES, _TILES)["Scan/A1"]
+    file_size = (root / "plate.lif").stat().st_size
+
+    loader = LifMosaicLoader(file_path=f"{url}/plate.lif", image_id=0, m=3)
+    np.testing.assert_array_equal(loader.load_data(), native[3])
+    fetched = sum(end - start for start, end in served)
+    tile_bytes = native[3].nbytes
+    # Header plus one tile (rounded to blocks), not the whole file.
+    assert fetched < tile_bytes + 4 * _BLOCK < file_size
+
+    # A second read is served from the disk cache.
+    served.clear()
+    np.testing.assert_array_equal(loader.load_data(), native[3])
+    assert served == []
+
+
+def test_remote_plate_conversion(
+    http_root, block_cache_env, tmp_path: Path, write_plate, small_converter_options
+):
+    root, url, _ = http_root
+    native = write_plate(root / "plate.lif", _SIZES, _TILES)["Scan/A1"]
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=f"{url}/plate.lif")],
+        converter_options=small_converter_options,
+    )
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    assert "/plate_Scan.zarr/" in zarr_url
+    data = open_ome_zarr_container(zarr_url).get_image().get_array()
+    for m in range(4):
+        np.testing.assert_array_equal(data[..., 48 * m : 48 * (m + 1)], native[m])
+
+
+def test_remote_file_seek_and_read(tmp_path: Path):
+    path = tmp_path / "blob.bin"
+    payload = np.random.default_rng(0).bytes(10_000)
+    path.write_bytes(payload)
+    cache = BlockCache(tmp_path / "cache", max_bytes=1 << 20)
+    with RemoteLifFile(f"file://{path}", cache=cache, block_size=1000) as fh:
+        fh.seek(2_500)
+        assert fh.read(3_000) == payload[2_500:5_500]
+        # Blocks 2-5, in one range request.
+        assert fh.bytes_fetched == 4_000
+        fh.seek(-10, 2)
+        assert fh.read() == payload[-10:]
+        assert fh.bytes_fetched == 5_000
+        fh.seek(2_000)
+        assert fh.read(1_000) == payload[2_000:3_000]
+        assert fh.bytes_fetched == 5_000
+
+
+def test_block_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = BlockCache(tmp_path / "cache", max_bytes=1000)
+    for index in range(4):
+        cache.put("key", index, bytes([index]) * 300)
+    assert cache.get("key", 0) is None
+    assert cache.get("key", 3) == bytes([3]) * 300
+    total = sum(
+        p.stat().st_size for p in (tmp_path / "cache").rglob("*") if p.is_file()
+    )
+    assert total <= 1000
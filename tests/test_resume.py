@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions, OverwriteMode
+from ome_zarr_converters_tools.models import WriterMode
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._resume import MARKER_DIR
+
+_SIZES = {"M": 4, "C": 2, "Z": 2, "Y": 64, "X": 48}
+_TILES = [(i * 48e-6, 0.0) for i in range(4)]
+
+
+def _convert(tmp_path: Path, options: ConverterOptions, overwrite: OverwriteMode):
+    return convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=options,
+        overwrite=overwrite,
+    )
+
+
+class _Interrupted(RuntimeError):
+    pass
+
+
+def _count_loads(monkeypatch, fail_after: int | None = None) -> list[int]:
+    loaded: list[int] = []
+    original = LifMosaicLoader.load_data
+
+    def load_data(self, resource=None, out=None):
+        if fail_after is not None and len(loaded) == fail_after:
+            raise _Interrupted
+        loaded.append(self.m)
+        return original(self, resource=resource, out=out)
+
+    monkeypatch.setattr(LifMosaicLoader, "load_data", load_data)
+    return loaded
+
+
+@pytest.mark.parametrize("writer_mode", [WriterMode.BY_FOV, WriterMode.BY_TILE])
+def test_interrupted_conversion_resumes_per_tile(
+    tmp_path: Path,
+    monkeypatch,
+    writer_mode: WriterMode,
+    write_plate,
+    small_converter_options,
+):
+    native = write_plate(tmp_path / "plate.lif", _SIZES, _TILES)["Scan/A1"]
+    options = small_converter_options
+    options.writer_mode = writer_mode
+
+    with monkeypatch.context() as m:
+        _count_loads(m, fail_after=2)
+        with pytest.raises(_Interrupted):
+            _convert(tmp_path, options, OverwriteMode.NO_OVERWRITE)
+
+    loaded = _count_loads(monkeypatch)
+    updates = _convert(tmp_path, options, OverwriteMode.EXTEND)
+    # Only the tiles missing after the interruption are read again.
+    assert loaded == [2, 3]
+
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    data = open_ome_zarr_container(zarr_url).get_image().get_array()
+    for m in range(4):
+        np.testing.assert_array_equal(data[..., 48 * m : 48 * (m + 1)], native[m])
+    assert (Path(zarr_url) / MARKER_DIR / "complete.json").exists()
+
+    # A completed image is left out of the next run entirely.
+    loaded.clear()
+    assert _convert(tmp_path, options, OverwriteMode.EXTEND) == []
+    assert loaded == []
+
+
+def test_changed_source_is_reconverted(
+    tmp_path: Path, monkeypatch, write_plate, small_converter_options
+):
+    write_plate(tmp_path / "plate.lif", _SIZES, _TILES)
+    options = small_converter_options
+    _convert(tmp_path, options, OverwriteMode.NO_OVERWRITE)
+
+    # Same layout, different pixels at the end of the last tile.
+    with open(tmp_path / "plate.lif", "r+b") as fh:
+        fh.seek(-2, 2)
+        fh.write(b"\x07\x00")
+
+    loaded = _count_loads(monkeypatch)
+    updates = _convert(tmp_path, options, OverwriteMode.EXTEND)
+    assert loaded == [0, 1, 2, 3]
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    data = open_ome_zarr_container(zarr_url).get_image().get_array()
+    assert data[-1, -1, -1, -1] == 7
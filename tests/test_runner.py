@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import numpy as np
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools.models import WriterMode
+
+from fractal_lif_converters import (
+    LifLocalRunner,
+    LifPlateAcquisitionModel,
+    convert_lif_plate,
+)
+from fractal_lif_converters.common import _loaders
+from fractal_lif_converters.common._runner import estimate_task_memory
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"M": 2, "C": 2, "Z": 1, "Y": 32, "X": 32}
+_TILES = [(i * 32e-6, 0.0) for i in range(2)]
+
+
+_WELLS = ("A1", "A2", "B1")
+
+
+def test_local_runner_matches_sequential(
+    tmp_path: Path, write_plate, small_converter_options
+):
+    native = write_plate(tmp_path / "plate.lif", _SIZES, _TILES, _WELLS)
+    acquisitions = [LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))]
+    sequential = convert_lif_plate(
+        zarr_dir=str(tmp_path / "seq"),
+        acquisitions=acquisitions,
+        converter_options=small_converter_options,
+    )
+    local = convert_lif_plate(
+        zarr_dir=str(tmp_path / "local"),
+        acquisitions=acquisitions,
+        converter_options=small_converter_options,
+        runner=LifLocalRunner(max_processes=2),
+    )
+    assert len(local) == len(sequential) == 3
+    for seq, loc in zip(sequential, local, strict=True):
+        seq_url = seq["image_list_updates"][0]["zarr_url"]
+        loc_url = loc["image_list_updates"][0]["zarr_url"]
+        # Results keep the order of the parallelization list.
+        assert Path(loc_url).relative_to(tmp_path / "local") == Path(
+            seq_url
+        ).relative_to(tmp_path / "seq")
+        np.testing.assert_array_equal(
+            open_ome_zarr_container(loc_url).get_image().get_array(),
+            open_ome_zarr_container(seq_url).get_image().get_array(),
+        )
+    a1 = open_ome_zarr_container(local[0]["image_list_updates"][0]["zarr_url"])
+    np.testing.assert_array_equal(
+        a1.get_image().get_array()[..., :32], native["Scan/A1"][0]
+    )
+
+
+def test_estimate_task_memory_scales_with_writer_mode():
+    class _Image:
+        axes = ("c", "z", "y", "x")
+        data_type = "uint16"
+        regions = [None] * 4
+
+        def shape(self):
+            return (2, 1, 64, 256)
+
+        def group_by_fov(self):
+            return [None] * 2
+
+    image_bytes = 2 * 64 * 256 * 2
+    by_tile, total = estimate_task_memory(_Image(), WriterMode.BY_TILE)
+    by_fov, _ = estimate_task_memory(_Image(), WriterMode.BY_FOV)
+    in_memory, _ = estimate_task_memory(_Image(), WriterMode.IN_MEMORY)
+    assert total == image_bytes
+    assert by_tile < by_fov < in_memory
+    assert in_memory - by_tile == 2 * (image_bytes - image_bytes // 4)
+
+    # Time-lapse images are written one timepoint at a time.
+    time_lapse = _Image()
+    time_lapse.axes = ("t", "z", "y", "x")
+    streamed, _ = estimate_task_memory(time_lapse, WriterMode.IN_MEMORY)
+    assert streamed == by_fov
+
+
+def test_lif_file_cache_reopens_changed_files(tmp_path: Path, monkeypatch, write_plate):
+    monkeypatch.setattr(_loaders._LifFileCache, "max_size", 1)
+    monkeypatch.setattr(_loaders, "_lif_file_cache", _loaders._LifFileCache())
+    path = tmp_path / "plate.lif"
+    write_plate(path, _SIZES, _TILES, _WELLS)
+    with _loaders._open_lif_file(str(path)) as first:
+        pass
+    with _loaders._open_lif_file(str(path)) as second:
+        assert second is first
+
+    # Rewriting the file (new size) invalidates the cached handle.
+    write_synthetic_lif(
+        path, [SyntheticImage("Scan/A1", ("C", "Y", "X"), {"C": 1, "Y": 8, "X": 8})]
+    )
+    with _loaders._open_lif_file(str(path)) as third:
+        assert third is not first
+        assert len(third.images) == 1
+    assert first.filehandle.closed
+
+
+def test_lif_file_cache_accepts_file_urls(tmp_path: Path, monkeypatch, write_plate):
+    monkeypatch.setattr(_loaders._LifFileCache, "max_size", 1)
+    monkeypatch.setattr(_loaders, "_lif_file_cache", _loaders._LifFileCache())
+    path = tmp_path / "plate.lif"
+    native = write_plate(path, _SIZES, _TILES, _WELLS)
+    loader = _loaders.LifMosaicLoader(file_path=path.as_uri(), image_id=0, m=1)
+    np.testing.assert_array_equal(loader.load_data(), native["Scan/A1"][1])
+    with _loaders._open_lif_file(str(path)) as lif_file:
+        assert lif_file is _loaders._lif_file_cache.get(str(path))
@@ -0,0 +1,204 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import (
+    ConverterOptions,
+    ImageInPlate,
+    OverwriteMode,
+)
+from ome_zarr_converters_tools.models import FovBasedChunking
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common import _compute
+from fractal_lif_converters.common._loaders import LifMosaicLoader
+from fractal_lif_converters.common._options import (
+    LifAcquisitionOptions,
+    LifAxisSharding,
+)
+from fractal_lif_converters.common._resume import MARKER_DIR, ConversionMarkers
+from fractal_lif_converters.common._sharding import shard_ranges
+from fractal_lif_converters.lif_plate import convert_lif_plate_init_task
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_LAYOUT = ("M", "T", "C", "Z", "Y", "X")
+_SIZES = {"M": 2, "T": 5, "C": 2, "Z": 4, "Y": 32, "X": 24}
+
+
+@pytest.fixture
+def time_lapse_lif(tmp_path: Path) -> str:
+    tiles = [(0.0, 0.0), (24e-6, 0.0)]
+    write_synthetic_lif(
+        tmp_path / "plate.lif",
+        [SyntheticImage("Scan/A1", _LAYOUT, _SIZES, tiles=tiles)],
+    )
+    return str(tmp_path / "plate.lif")
+
+
+@pytest.fixture
+def options(small_converter_options: ConverterOptions) -> ConverterOptions:
+    small_converter_options.omezarr_options.chunks = FovBasedChunking(z_chunk=2)
+    return small_converter_options
+
+
+def _convert(
+    zarr_dir: Path,
+    lif: str,
+    sharding: LifAxisSharding | None,
+    options: ConverterOptions,
+) -> str:
+    acquisition = LifPlateAcquisitionModel(
+        path=lif, advanced=LifAcquisitionOptions(sharding=sharding)
+    )
+    updates = convert_lif_plate(
+        zarr_dir=str(zarr_dir), acquisitions=[acquisition], converter_options=options
+    )
+    assert len({u["image_list_updates"][0]["zarr_url"] for u in updates}) == 1
+    return updates[0]["image_list_updates"][0]["zarr_url"]
+
+
+def test_shard_ranges():
+    assert shard_ranges(5, 1, 2) == [(0, 2), (2, 4), (4, 5)]
+    # Rounded up to whole chunks.
+    assert shard_ranges(25, 10, 3) == [(0, 10), (10, 20), (20, 25)]
+    assert shard_ranges(4, 10, 3) == [(0, 4)]
+
+
+@pytest.mark.parametrize(
+    "sharding, num_tasks",
+    [(LifAxisSharding(axis="t", size=2), 3), (LifAxisSharding(axis="z", size=1), 2)],
+)
+def test_sharded_conversion_matches_single_task(
+    tmp_path: Path,
+    time_lapse_lif: str,
+    monkeypatch: pytest.MonkeyPatch,
+    sharding: LifAxisSharding,
+    num_tasks: int,
+    options: ConverterOptions,
+):
+    acquisition = LifPlateAcquisitionModel(
+        path=time_lapse_lif, advanced=LifAcquisitionOptions(sharding=sharding)
+    )
+    items = convert_lif_plate_init_task(
+        zarr_dir=str(tmp_path / "init"),
+        acquisitions=[acquisition],
+        converter_options=options,
+    )["parallelization_list"]
+    shards = [item["init_args"]["shard"] for item in items]
+    assert [shard["index"] for shard in shards] == list(range(num_tasks))
+    assert {shard["count"] for shard in shards} == {num_tasks}
+
+    single_url = _convert(tmp_path / "single", time_lapse_lif, None, options)
+
+    # Each load reads frames of a single shard only.
+    loaded: list[tuple] = []
+    load_data = LifMosaicLoader.load_data
+
+    def _load(self, resource=None, out=None):
+        loaded.append((self.selection.t_range, self.selection.z_range))
+        return load_data(self, resource=resource, out=out)
+
+    monkeypatch.setattr(LifMosaicLoader, "load_data", _load)
+    sharded_url = _convert(tmp_path / "sharded", time_lapse_lif, sharding, options)
+    if sharding.axis == "z":
+        assert {z_range for _, z_range in loaded} == {(0, 2), (2, 4)}
+    else:
+        assert all(t_stop - t_start == 1 for (t_start, t_stop), _ in loaded)
+
+    expected = open_ome_zarr_container(single_url)
+    actual = open_ome_zarr_container(sharded_url)
+    for path in ("0", "1"):
+        np.testing.assert_array_equal(
+            actual.get_image(path=path).get_array(),
+            expected.get_image(path=path).get_array(),
+        )
+    for got, want in zip(
+        actual.meta.channels_meta.channels,
+        expected.meta.channels_meta.channels,
+        strict=True,
+    ):
+        assert got.channel_visualisation.min == want.channel_visualisation.min
+        assert got.channel_visualisation.max == want.channel_visualisation.max
+    assert "FOV_ROI_table" in actual.list_tables()
+    assert (Path(sharded_url) / MARKER_DIR / "complete.json").exists()
+    assert not (Path(sharded_url) / MARKER_DIR / "shards").exists()
+
+
+def test_sharded_conversion_resumes_missing_shards(
+    tmp_path: Path, time_lapse_lif: str, options: ConverterOptions
+):
+    sharding = LifAxisSharding(axis="t", size=2)
+    zarr_url = _convert(tmp_path / "zarr", time_lapse_lif, sharding, options)
+    markers = Path(zarr_url) / MARKER_DIR
+    # Simulate a run interrupted after the first shard.
+    (markers / "complete.json").rename(markers / "started.json")
+    (markers / "shards").mkdir()
+    (markers / "shards" / "0").write_text("null")
+
+    acquisition = LifPlateAcquisitionModel(
+        path=time_lapse_lif, advanced=LifAcquisitionOptions(sharding=sharding)
+    )
+    items = convert_lif_plate_init_task(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=options,
+        overwrite=OverwriteMode.EXTEND,
+    )["parallelization_list"]
+    assert [item["init_args"]["shard"]["index"] for item in items] == [1, 2]
+
+
+def test_concurrent_last_shards_finalize_once(
+    tmp_path: Path,
+    time_lapse_lif: str,
+    monkeypatch: pytest.MonkeyPatch,
+    options: ConverterOptions,
+):
+    acquisition = LifPlateAcquisitionModel(
+        path=time_lapse_lif,
+        advanced=LifAcquisitionOptions(sharding=LifAxisSharding(axis="t", size=2)),
+    )
+    items = convert_lif_plate_init_task(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=options,
+    )["parallelization_list"]
+    first, *last = items
+
+    def _compute_item(item: dict):
+        return _compute.lif_compute_task(
+            zarr_url=item["zarr_url"],
+            init_args=item["init_args"],
+            collection_type=ImageInPlate,
+        )
+
+    _compute_item(first)
+
+    # Both remaining shards are marked before either lists the markers.
+    barrier = threading.Barrier(len(last))
+    mark_shard = ConversionMarkers.mark_shard
+
+    def _mark_shard(self, index, stats):
+        mark_shard(self, index, stats)
+        barrier.wait(timeout=30)
+
+    finalized: list[str] = []
+    finalize_image = _compute._finalize_image
+
+    def _finalize_image(ome_zarr, *args, **kwargs):
+        finalized.append(threading.current_thread().name)
+        return finalize_image(ome_zarr, *args, **kwargs)
+
+    monkeypatch.setattr(ConversionMarkers, "mark_shard", _mark_shard)
+    monkeypatch.setattr(_compute, "_finalize_image", _finalize_image)
+    with ThreadPoolExecutor(len(last)) as pool:
+        list(pool.map(_compute_item, last))
+
+    assert len(finalized) == 1
+    zarr_url = first["zarr_url"]
+    assert (Path(zarr_url) / MARKER_DIR / "complete.json").exists()
+    assert not (Path(zarr_url) / MARKER_DIR / "shards").exists()
+    assert "FOV_ROI_table" in open_ome_zarr_container(zarr_url).list_tables()
@@ -0,0 +1,205 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+
+from fractal_lif_converters import (
+    LifImageAcquisitionModel,
+    LifPlateAcquisitionModel,
+    convert_lif_image,
+    convert_lif_plate,
+)
+from fractal_lif_converters.common._options import (
+    IndexRange,
+    LifAcquisitionOptions,
+    LifGridSnapping,
+    LifPreviewOptions,
+    LifSpatialRoi,
+)
+from fractal_lif_converters.common._tile_builders import _fit_grid, _TileGrid
+from fractal_lif_converters.lif_plate._parser import parse_lif_plate_metadata
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"C": 2, "Z": 3, "Y": 64, "X": 48}
+
+
+def _read(update: dict) -> np.ndarray:
+    zarr_url = update["image_list_updates"][0]["zarr_url"]
+    return open_ome_zarr_container(zarr_url).get_image().get_array()
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [("C", "Z", "Y", "X"), ("Z", "C", "Y", "X")],
+)
+def test_synthetic_plate_roundtrip(
+    tmp_path: Path, layout: tuple[str, ...], small_converter_options
+):
+    mosaic_layout = ("M", *layout)
+    tiles = [(0.0, 0.0), (48e-6, 0.0)]
+    images = [
+        SyntheticImage("Scan/A1", layout, _SIZES),
+        SyntheticImage("Scan/B2", mosaic_layout, {"M": 2, **_SIZES}, tiles=tiles),
+    ]
+    native = write_synthetic_lif(tmp_path / "plate.lif", images)
+
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=small_converter_options,
+    )
+    assert len(updates) == 2
+
+    perm = [layout.index(d) for d in ("C", "Z", "Y", "X")]
+    single = _read(updates[0])
+    np.testing.assert_array_equal(single, native["Scan/A1"].transpose(perm))
+
+    mosaic = _read(updates[1])
+    assert mosaic.shape == (2, 3, 64, 96)
+    for m in range(2):
+        tile = native["Scan/B2"][m].transpose(perm)
+        np.testing.assert_array_equal(mosaic[..., 48 * m : 48 * (m + 1)], tile)
+
+
+def test_synthetic_image_time_series(tmp_path: Path, small_converter_options):
+    layout = ("T", "Z", "C", "Y", "X")
+    image = SyntheticImage("Series", layout, {"T": 2, **_SIZES})
+    native = write_synthetic_lif(tmp_path / "image.lif", [image])
+
+    updates = convert_lif_image(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifImageAcquisitionModel(path=str(tmp_path / "image.lif"))],
+        converter_options=small_converter_options,
+    )
+    data = _read(updates[0])
+    np.testing.assert_array_equal(data, native["Series"].transpose(0, 2, 1, 3, 4))
+
+
+def test_synthetic_image_read_selection(tmp_path: Path, small_converter_options):
+    layout = ("T", "Z", "C", "Y", "X")
+    image = SyntheticImage("Series", layout, {"T": 3, **_SIZES})
+    native = write_synthetic_lif(tmp_path / "image.lif", [image])
+
+    acquisition = LifImageAcquisitionModel(
+        path=str(tmp_path / "image.lif"),
+        advanced=LifAcquisitionOptions(
+            channel_indices=[1],
+            z_range=IndexRange(start=1),
+            t_range=IndexRange(start=2, stop=3),
+        ),
+    )
+    updates = convert_lif_image(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=small_converter_options,
+    )
+    data = _read(updates[0])
+    # A single selected timepoint drops the T axis.
+    assert data.shape == (1, 2, 64, 48)
+    expected = native["Series"].transpose(0, 2, 1, 3, 4)[2, [1], 1:]
+    np.testing.assert_array_equal(data, expected)
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    image_meta = open_ome_zarr_container(zarr_url).get_image()
+    assert image_meta.channel_labels == ["channel_1"]
+
+
+def test_synthetic_plate_preview(tmp_path: Path, small_converter_options):
+    layout = ("M", "C", "Z", "Y", "X")
+    tiles = [(0.0, 0.0), (48e-6, 0.0)]
+    image = SyntheticImage("Scan/A1", layout, {"M": 2, **_SIZES}, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "plate.lif", [image])
+
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=small_converter_options,
+        preview=LifPreviewOptions(xy_step=2, z_mode="max"),
+    )
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    zarr_image = open_ome_zarr_container(zarr_url).get_image()
+    assert zarr_image.pixel_size.x == pytest.approx(2.0)
+    data = zarr_image.get_array()
+    assert data.shape == (2, 1, 32, 48)
+    for m in range(2):
+        tile = native["Scan/A1"][m][:, :, ::2, ::2].max(axis=1, keepdims=True)
+        np.testing.assert_array_equal(data[..., 24 * m : 24 * (m + 1)], tile)
+
+
+def test_synthetic_plate_roi(tmp_path: Path, small_converter_options):
+    layout = ("M", "C", "Z", "Y", "X")
+    tiles = [(0.0, 0.0), (48e-6, 0.0), (0.0, 64e-6), (48e-6, 64e-6)]
+    image = SyntheticImage("Scan/A1", layout, {"M": 4, **_SIZES}, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "plate.lif", [image])["Scan/A1"]
+
+    # The ROI straddles the two top tiles; the bottom row is never read.
+    acquisition = LifPlateAcquisitionModel(
+        path=str(tmp_path / "plate.lif"),
+        advanced=LifAcquisitionOptions(
+            roi=LifSpatialRoi(x=40, y=10, width=20, height=30)
+        ),
+    )
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=small_converter_options,
+    )
+    data = _read(updates[0])
+    assert data.shape == (2, 3, 30, 20)
+    np.testing.assert_array_equal(data[..., :8], native[0][..., 10:40, 40:48])
+    np.testing.assert_array_equal(data[..., 8:], native[1][..., 10:40, 0:12])
+
+
+def test_tile_grid_query():
+    origins = [(x * 10.0, y * 8.0) for y in range(5) for x in range(5)]
+    grid = _TileGrid(origins, width=10.0, height=8.0)
+    assert grid.query(15, 4, 25, 12) == [1, 2, 6, 7]
+    assert grid.query(-100, -100, 0, 0) == []
+    assert grid.query(-1, -1, 100, 100) == list(range(25))
+
+
+def test_fit_grid():
+    rng = np.random.default_rng(0)
+    nodes = [(x, y) for y in range(4) for x in range(5)]
+    jitter = rng.uniform(-1.5, 1.5, size=(len(nodes), 2))
+    # 0.5 um pixels, 90 x 120 px step, origin (7, 3) px.
+    origins = [
+        ((7 + 90 * x + dx) * 0.5, (3 + 120 * y + dy) * 0.5)
+        for (x, y), (dx, dy) in zip(nodes, jitter, strict=True)
+    ]
+    fit = _fit_grid(origins, 0.5, (100, 128))
+    assert fit.step == (90, 120)
+    assert fit.shape == (5, 4)
+    assert fit.origins == [((7 + 90 * x) * 0.5, (3 + 120 * y) * 0.5) for x, y in nodes]
+    assert fit.max_residual <= np.hypot(1.5, 1.5)
+    # Two tiles on the same node: not a regular grid.
+    assert _fit_grid([(0.0, 0.0), (1.0, 0.0), (50.0, 0.0)], 1.0, (48, 64)) is None
+
+
+def test_synthetic_plate_grid_snapping(tmp_path: Path, small_converter_options):
+    layout = ("M", "C", "Z", "Y", "X")
+    # A 2 x 2 grid with a 48 x 64 px step, off by up to 0.4 px.
+    tiles = [(0.3e-6, -0.2e-6), (48.4e-6, 0.1e-6), (-0.1e-6, 63.7e-6), (47.8e-6, 64e-6)]
+    image = SyntheticImage("Scan/A1", layout, {"M": 4, **_SIZES}, tiles=tiles)
+    native = write_synthetic_lif(tmp_path / "plate.lif", [image])["Scan/A1"]
+
+    acquisition = LifPlateAcquisitionModel(
+        path=str(tmp_path / "plate.lif"),
+        advanced=LifAcquisitionOptions(grid=LifGridSnapping()),
+    )
+    (tiled_image,) = parse_lif_plate_metadata(
+        acquisition_model=acquisition, converter_options=small_converter_options
+    )
+    starts = [(r.roi.get("x").start, r.roi.get("y").start) for r in tiled_image.regions]
+    assert starts == [(0.0, 0.0), (48.0, 0.0), (0.0, 64.0), (48.0, 64.0)]
+
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[acquisition],
+        converter_options=small_converter_options,
+    )
+    data = _read(updates[0])
+    assert data.shape == (2, 3, 128, 96)
+    for m, (x, y) in enumerate([(0, 0), (48, 0), (0, 64), (48, 64)]):
+        np.testing.assert_array_equal(data[..., y : y + 64, x : x + 48], native[m])
@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import (
+    ConverterOptions,
+    ImageInPlate,
+    OmeZarrOptions,
+    TiledImage,
+)
+from ome_zarr_converters_tools.models._converter_options import BackendType
+from ome_zarr_converters_tools.models._runtime_settings import (
+    RuntimeSettings,
+    TempJsonOptions,
+)
+
+from fractal_lif_converters import LifPlateAcquisitionModel, convert_lif_plate
+from fractal_lif_converters.common._options import LifAcquisitionOptions
+from fractal_lif_converters.common._tile_table import (
+    decode_tiled_image,
+    encode_tiled_image,
+    is_tile_table,
+)
+from fractal_lif_converters.lif_plate import convert_lif_plate_init_task
+from fractal_lif_converters.lif_plate._parser import parse_lif_plate_metadata
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"M": 6, "C": 2, "Z": 3, "Y": 64, "X": 48}
+
+
+@pytest.fixture
+def mosaic_lif(tmp_path: Path) -> str:
+    tiles = [(x * 48e-6, y * 64e-6) for y in range(2) for x in range(3)]
+    image = SyntheticImage("Scan/A1", ("M", "C", "Z", "Y", "X"), _SIZES, tiles=tiles)
+    write_synthetic_lif(tmp_path / "plate.lif", [image])
+    return str(tmp_path / "plate.lif")
+
+
+@pytest.mark.parametrize(
+    "advanced",
+    [
+        LifAcquisitionOptions(),
+        # Cropped boundary tiles have distinct read selections.
+        LifAcquisitionOptions(
+            roi={"x": 30.0, "y": 20.0, "width": 60.0, "height": 80.0},
+            io_profile={"block_size": 1024**2},
+        ),
+    ],
+)
+def test_tile_table_round_trip(mosaic_lif: str, advanced: LifAcquisitionOptions):
+    (tiled_image,) = parse_lif_plate_metadata(
+        acquisition_model=LifPlateAcquisitionModel(path=mosaic_lif, advanced=advanced),
+        converter_options=ConverterOptions(),
+    )
+    table = encode_tiled_image(tiled_image)
+    assert is_tile_table(table)
+    assert len(table) < len(tiled_image.model_dump_json())
+
+    decoded = decode_tiled_image(table, ImageInPlate)
+    assert decoded.model_dump_json() == tiled_image.model_dump_json()
+    # The default serialization is still accepted.
+    legacy = decode_tiled_image(tiled_image.model_dump_json(), ImageInPlate)
+    assert legacy.model_dump_json() == tiled_image.model_dump_json()
+
+
+@pytest.mark.parametrize("serialization", ["Memory", "JSON"])
+def test_conversion_with_tile_tables(
+    tmp_path: Path, monkeypatch, mosaic_lif: str, serialization: str
+):
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=1, ngff_version="0.5", table_backend=BackendType.CSV
+        ),
+        runtime_settings=RuntimeSettings(
+            temp_json_options=TempJsonOptions(serialization=serialization)
+        ),
+    )
+    acquisitions = [LifPlateAcquisitionModel(path=mosaic_lif)]
+
+    def _default_json(self, **kwargs):
+        raise AssertionError("The default JSON of an image was built.")
+
+    with monkeypatch.context() as m:
+        # Only the tile table of each image is serialized.
+        m.setattr(TiledImage, "model_dump_json", _default_json)
+        (item,) = convert_lif_plate_init_task(
+            zarr_dir=str(tmp_path / "init"),
+            acquisitions=acquisitions,
+            converter_options=options,
+        )["parallelization_list"]
+    init_args = item["init_args"]
+    if serialization == "Memory":
+        table = json.loads(init_args["tiled_image_json_str"])
+    else:
+        table = json.loads(Path(init_args["tiled_image_json_dump_url"]).read_text())
+    assert table["num_tiles"] == 6
+    assert "value" in table["columns"]["loader.file_path"]
+
+    updates = convert_lif_plate(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=acquisitions,
+        converter_options=options,
+    )
+    zarr_url = updates[0]["image_list_updates"][0]["zarr_url"]
+    written = open_ome_zarr_container(zarr_url).get_image().get_array()
+    assert written.shape == (2, 3, 128, 144)
+    assert np.count_nonzero(written) > 0
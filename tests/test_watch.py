@@ -0,0 +1,115 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from ome_zarr_converters_tools import ConverterOptions
+
+from fractal_lif_converters.common._resume import MARKER_DIR
+from fractal_lif_converters.watch import LifFolderWatcher
+
+_SIZES = {"M": 2, "C": 1, "Z": 1, "Y": 32, "X": 32}
+_TILES = [(i * 32e-6, 0.0) for i in range(2)]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _watcher(
+    tmp_path: Path, options: ConverterOptions, executor, clock, **kwargs
+) -> LifFolderWatcher:
+    return LifFolderWatcher(
+        tmp_path / "incoming",
+        str(tmp_path / "zarr"),
+        converter_options=options,
+        settle_seconds=10.0,
+        executor=executor,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_watcher_converts_settled_files(
+    tmp_path: Path, write_plate, small_converter_options
+):
+    (tmp_path / "incoming").mkdir()
+    clock = _Clock()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        watcher = _watcher(tmp_path, small_converter_options, executor, clock)
+        lif_path = tmp_path / "incoming" / "plate.lif"
+        write_plate(lif_path, _SIZES, _TILES)
+
+        # First sighting, then not yet settled.
+        assert watcher.poll() == []
+        clock.now = 5.0
+        assert watcher.poll() == []
+
+        clock.now = 11.0
+        assert watcher.poll() == [lif_path]
+        watcher.shutdown()
+        markers = list((tmp_path / "zarr").glob(f"**/{MARKER_DIR}/complete.json"))
+        assert len(markers) == 1
+
+        # Unchanged files are not dispatched again.
+        clock.now = 30.0
+        assert watcher.poll() == []
+
+
+def test_watcher_waits_for_growing_file(tmp_path: Path, small_converter_options):
+    (tmp_path / "incoming").mkdir()
+    clock = _Clock()
+    submitted: list[str] = []
+
+    class _Recorder:
+        def submit(self, fn, path, **kwargs):
+            submitted.append(path)
+            return Future()
+
+    watcher = _watcher(
+        tmp_path, small_converter_options, _Recorder(), clock, max_queue=1
+    )
+    lif_path = tmp_path / "incoming" / "a.lif"
+    lif_path.write_bytes(b"x")
+    watcher.poll()
+    clock.now = 8.0
+    with open(lif_path, "ab") as fh:
+        fh.write(b"y")
+    # The file grew, so the settle timer restarts at this poll.
+    clock.now = 12.0
+    assert watcher.poll() == []
+    clock.now = 22.5
+    assert watcher.poll() == [lif_path]
+
+    # The queue is full: a second settled file waits until a slot frees up.
+    (tmp_path / "incoming" / "b.lif").write_bytes(b"z")
+    watcher.poll()
+    clock.now = 40.0
+    assert watcher.poll() == []
+    assert submitted == [str(lif_path)]
+
+
+def test_watcher_matches_suffix_case_insensitively(
+    tmp_path: Path, small_converter_options
+):
+    (tmp_path / "incoming").mkdir()
+    clock = _Clock()
+    submitted: list[str] = []
+
+    class _Recorder:
+        def submit(self, fn, path, **kwargs):
+            submitted.append(path)
+            return Future()
+
+    watcher = _watcher(tmp_path, small_converter_options, _Recorder(), clock)
+    for name in ("upper.LIF", "lower.lif", "notes.txt"):
+        (tmp_path / "incoming" / name).write_bytes(b"x")
+    watcher.poll()
+    clock.now = 11.0
+    assert watcher.poll() == [
+        tmp_path / "incoming" / "lower.lif",
+        tmp_path / "incoming" / "upper.LIF",
+    ]
+    assert len(submitted) == 2
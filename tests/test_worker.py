@@ -0,0 +1,91 @@
+import io
+import json
+import socket
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ngio import open_ome_zarr_container
+from ome_zarr_converters_tools import ConverterOptions, OmeZarrOptions
+from ome_zarr_converters_tools.models._converter_options import BackendType
+
+from fractal_lif_converters import LifPlateAcquisitionModel
+from fractal_lif_converters.common import image_in_plate_compute_task
+from fractal_lif_converters.lif_plate import convert_lif_plate_init_task
+from fractal_lif_converters.worker import main, make_socket_server, serve_stream
+
+from .synthetic_lif import SyntheticImage, write_synthetic_lif
+
+_SIZES = {"M": 2, "C": 1, "Z": 1, "Y": 32, "X": 32}
+_TILES = [(i * 32e-6, 0.0) for i in range(2)]
+
+
+def _jobs(tmp_path: Path) -> tuple[list[dict], dict[str, np.ndarray]]:
+    images = [
+        SyntheticImage(f"Scan/{well}", ("M", "C", "Z", "Y", "X"), _SIZES, tiles=_TILES)
+        for well in ("A1", "B2")
+    ]
+    native = write_synthetic_lif(tmp_path / "plate.lif", images)
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            num_levels=2, ngff_version="0.5", table_backend=BackendType.CSV
+        )
+    )
+    init_output = convert_lif_plate_init_task(
+        zarr_dir=str(tmp_path / "zarr"),
+        acquisitions=[LifPlateAcquisitionModel(path=str(tmp_path / "plate.lif"))],
+        converter_options=options,
+    )
+    return init_output["parallelization_list"], native
+
+
+def test_worker_serves_job_stream(tmp_path: Path):
+    jobs, native = _jobs(tmp_path)
+    requests = "".join(json.dumps(job) + "\n" for job in jobs)
+    requests += "\n" + json.dumps({"zarr_url": "x", "init_args": {}}) + "\n"
+    out = io.StringIO()
+    count = serve_stream(io.StringIO(requests), out, image_in_plate_compute_task)
+    assert count == 3
+
+    responses = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["ok"] for r in responses] == [True, True, False]
+    assert "ValidationError" in responses[2]["error"]
+    zarr_url = responses[0]["result"]["image_list_updates"][0]["zarr_url"]
+    data = open_ome_zarr_container(zarr_url).get_image().get_array()
+    np.testing.assert_array_equal(data[..., :32], native["Scan/A1"][0])
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="No Unix sockets")
+def test_worker_socket(tmp_path: Path):
+    jobs, _ = _jobs(tmp_path)
+    socket_path = str(tmp_path / "worker.sock")
+    server = make_socket_server(socket_path, image_in_plate_compute_task)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        # Both the socket and its file must be closed for the server to see EOF.
+        with (
+            socket.socket(socket.AF_UNIX) as client,
+            client.makefile("rw", encoding="utf-8") as stream,
+        ):
+            client.connect(socket_path)
+            for job in jobs:
+                stream.write(json.dumps(job) + "\n")
+                stream.flush()
+                response = json.loads(stream.readline())
+                assert response["ok"], response
+                result = response["result"]["image_list_updates"][0]
+                assert result["zarr_url"] == job["zarr_url"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_worker_socket_unavailable(monkeypatch: pytest.MonkeyPatch):
+    # As on Windows.
+    monkeypatch.delattr(socket, "AF_UNIX", raising=False)
+    with pytest.raises(OSError, match="Unix sockets"):
+        make_socket_server("worker.sock", image_in_plate_compute_task)
+    with pytest.raises(SystemExit):
+        main(["--task", "image_in_plate", "--socket", "worker.sock"])
@@ -1,3 +1,36 @@
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
 DATA_DIR = Path(__file__).parent / "data"
+
+
+@dataclass
+class PeakMemory:
+    """Peak traced allocation (bytes) above the level at context entry."""
+
+    peak: int = 0
+
+
+@contextmanager
+def track_peak_memory() -> Iterator[PeakMemory]:
+    """Measure the peak of Python + NumPy allocations made inside the block.
+
+    NumPy reports its data buffers to ``tracemalloc``, so this catches hidden
+    array copies as well as large ``bytes`` reads.
+    """
+    result = PeakMemory()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        yield result
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        result.peak = peak - baseline
+        if not was_tracing:
+            tracemalloc.stop()